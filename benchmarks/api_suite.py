@@ -0,0 +1,252 @@
+"""
+Benchmarks of the api layer swept across collection sizes. Every size gets a
+freshly generated collection (see collection.py) in a temporary directory, and
+the results of all of them are written out as JSON, so that the scaling curves
+and the regressions between versions can be compared with a script.
+
+Usage: PYTHONPATH=src python benchmarks/api_suite.py [--sizes 1000,10000]
+    [--repeat N] [--output results.json]
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from knards import api, config, util
+from knards.card import Card
+
+import collection
+
+SIZES = [1000, 10000, 100000, 1000000]
+# the number of single cards created, looked up etc. per run of the
+# benchmarks that work with one card at a time
+SINGLE_OPS = 100
+
+# the markers filters are picked by the rank of the marker: a common one and a
+# rare one
+COMMON_MARKER = collection.marker_names()[0]
+RARE_MARKER = collection.marker_names()[50]
+
+
+def measure(fn, repeat, setup=None):
+    """Runs fn repeat times and returns the timings in seconds; setup is run
+    before every run, untimed"""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def card_set_filters():
+    """Yields every combination of the filters of get_card_set() as kwargs"""
+    for revisable_only, include, exclude, today in itertools.product(
+        (False, True),
+        ([], [COMMON_MARKER]),
+        ([], [RARE_MARKER]),
+        (False, True)
+    ):
+        yield {
+            'revisable_only': revisable_only,
+            'include_markers': include,
+            'exclude_markers': exclude,
+            'today': today,
+            'due_by': collection.NOW if revisable_only else None,
+        }
+
+
+def benchmarks(db_path, size, work_dir):
+    """Yields (name, params, fn, setup, ops) tuples: fn is timed, ops is the
+    number of operations a run of it does"""
+
+    rng = random.Random(size)
+    connection = sqlite3.connect(db_path)
+    card_ids = [row[0] for row in connection.execute('SELECT id FROM cards')]
+    series = [row[0] for row in connection.execute("""
+        SELECT DISTINCT series FROM cards WHERE series IS NOT NULL
+    """)]
+    connection.close()
+
+    for filters in card_set_filters():
+        params = dict(filters, due_by=filters['due_by'] is not None)
+        yield 'get_card_set', params, lambda filters=filters: \
+            api.get_card_set(db_path=db_path, **filters), None, 1
+
+    yield 'get_card_by_id', {}, lambda: [
+        api.get_card_by_id(card_id, db_path)
+        for card_id in rng.sample(card_ids, min(SINGLE_OPS, len(card_ids)))
+    ], None, min(SINGLE_OPS, len(card_ids))
+
+    series_sample = rng.sample(series, min(SINGLE_OPS, len(series)))
+    yield 'get_series_set', {}, lambda: [
+        api.get_series_set(series_name, db_path)
+        for series_name in series_sample
+    ], None, len(series_sample)
+
+    yield 'get_last_card', {}, \
+        lambda: api.get_last_card(db_path=db_path), None, 1
+    yield 'get_last_card', {'markers': [RARE_MARKER]}, \
+        lambda: api.get_last_card([RARE_MARKER], db_path), None, 1
+
+    yield 'status_summary', {}, \
+        lambda: api.status_summary(db_path=db_path), None, 1
+    yield 'status_summary', {'include_markers': [COMMON_MARKER]}, \
+        lambda: api.status_summary([COMMON_MARKER], db_path=db_path), None, 1
+
+    tags_list = {
+        'group{}'.format(group): collection.marker_names()[group::4]
+        for group in range(4)
+    }
+    yield 'get_recommendations', {}, lambda: api.get_recommendations(
+        tags_list, collection.marker_names()[:10], db_path
+    ), None, 1
+
+    # the cards created by one run are deleted before the next one, and the
+    # other way round, so that the size of the collection stays the same
+    created = []
+
+    def create_single():
+        for _ in range(SINGLE_OPS):
+            created.append(api.create_card(
+                Card(markers=COMMON_MARKER + ' benchmark'),
+                db_path
+            ))
+
+    def delete_single():
+        while created:
+            api.delete_card(created.pop(), db_path=db_path)
+
+    def create_batch():
+        if not created:
+            created.extend(api.create_cards(
+                [Card(markers='benchmark')] * SINGLE_OPS,
+                db_path
+            ))
+
+    yield 'create_card', {}, create_single, delete_single, SINGLE_OPS
+    yield 'delete_card', {}, delete_single, create_batch, SINGLE_OPS
+
+    # the cards of the DB to merge are ten times fewer and created over the
+    # same period, none of them at the same moments as the existing ones
+    merge_size = max(size // 10, 1)
+    merge_source = os.path.join(work_dir, 'merge_source.db')
+    collection.populate(
+        merge_source,
+        merge_size,
+        seed=1,
+        created_since=collection.NOW - timedelta(
+            days=collection.HISTORY_DAYS, seconds=1
+        )
+    )
+    merge_target = os.path.join(work_dir, 'merge_target.db')
+
+    def copy_files():
+        # merging changes both of the files
+        util.db_disconnect()
+        shutil.copyfile(db_path, merge_target)
+        shutil.copyfile(merge_source, merge_target + '.merge')
+
+    yield 'merge_db', {'merged_cards': merge_size}, lambda: api.merge_db(
+        merge_target + '.merge', merge_target
+    ), copy_files, 1
+
+
+def run(sizes, repeat, log):
+    results = []
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as work_dir:
+            db_path = os.path.join(work_dir, 'knards.db')
+
+            log('generating {} cards'.format(size))
+            start = time.perf_counter()
+            collection.populate(db_path, size)
+            results.append({
+                'size': size,
+                'benchmark': 'populate',
+                'params': {'batch_size': collection.BATCH_SIZE},
+                'ops': size,
+                'timings': [time.perf_counter() - start],
+            })
+
+            for name, params, fn, setup, ops in benchmarks(
+                db_path, size, work_dir
+            ):
+                log('{} {} {}'.format(size, name, params))
+                timings = measure(fn, repeat, setup)
+                results.append({
+                    'size': size,
+                    'benchmark': name,
+                    'params': params,
+                    'ops': ops,
+                    'timings': timings,
+                })
+
+            util.db_disconnect()
+
+    for result in results:
+        timings = result['timings']
+        result['min'] = min(timings)
+        result['median'] = statistics.median(timings)
+        result['per_op'] = result['min'] / max(result['ops'], 1)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--sizes',
+        default=','.join(str(size) for size in SIZES),
+        help='comma separated collection sizes'
+    )
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument(
+        '--output',
+        help='the file to write the results to (defaults to stdout)'
+    )
+    args = parser.parse_args()
+
+    def log(line):
+        print(line, file=sys.stderr, flush=True)
+
+    results = run(
+        [int(size) for size in args.sizes.split(',')],
+        args.repeat,
+        log
+    )
+    report = {
+        'meta': {
+            'date': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'db_pragmas': config.get_DB_pragmas(),
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Generator of synthetic card collections for the benchmarks. The collections are
+shaped like the ones knards is used with: a long tail of markers where a few of
+them are on most of the cards, a minority of cards that form series, a share of
+cards that were never revised, and texts of varied length. The same seed and
+size always give the same collection.
+"""
+
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+import io
+import random
+
+from knards import api, util
+from knards.card import Card
+
+# the moment every generated collection is "created at", so that the dates
+# and the due cards don't depend on the day the benchmark runs
+NOW = datetime(2020, 1, 1)
+# cards are created over this many days before NOW
+HISTORY_DAYS = 3 * 365
+
+# the number of cards stored within a single transaction
+BATCH_SIZE = 10000
+
+WORDS = (
+    'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod '
+    'tempor incididunt ut labore et dolore magna aliqua enim ad minim veniam '
+    'quis nostrud exercitation ullamco laboris nisi aliquip ex ea commodo '
+    'consequat duis aute irure in reprehenderit voluptate velit esse cillum '
+    'eu fugiat nulla pariatur excepteur sint occaecat cupidatat non proident'
+).split()
+
+
+def marker_names(count=200):
+    """Returns the names of the markers, the most used ones first"""
+    return ['marker{}'.format(rank) for rank in range(count)]
+
+
+def _texts(rng, mean_words):
+    # lengths are log-normal: most texts are short, a few are very long
+    words = max(1, int(rng.lognormvariate(0, 0.8) * mean_words))
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def generate(size, seed=0, created_since=None):
+    """Yields objects of type knards.Card that make up a collection
+
+    Args:
+        size (int): The number of cards in the collection
+        seed (int): The seed of the random choices
+        created_since (datetime): Cards are created from this moment until NOW
+    (optional, defaults to HISTORY_DAYS before NOW)
+
+    Returns:
+        A generator of size objects of type knards.Card, ordered by the date of
+    creation
+    """
+
+    rng = random.Random(seed)
+    names = marker_names()
+    # Zipf-like: the marker of rank r is on a card ~1/(r+1) as often as the
+    # most used one
+    weights = [1 / (rank + 1) for rank in range(len(names))]
+    if created_since is None:
+        created_since = NOW - timedelta(days=HISTORY_DAYS)
+    step = (NOW - created_since) / size
+
+    # one card out of 10 is a part of a series of 2 to 20 cards, which are
+    # created one after another
+    series_name = None
+    series_left = 0
+    series_markers = None
+    series_count = 0
+
+    for i in range(size):
+        if not series_left and rng.random() < 0.1 / 11:
+            series_count += 1
+            series_name = 'series{}_{}'.format(seed, series_count)
+            series_left = rng.randint(2, 20)
+            series_pos = 0
+            series_markers = None
+
+        if series_left and series_markers is not None:
+            markers = series_markers
+        else:
+            markers = ' '.join(sorted(set(
+                rng.choices(names, weights, k=rng.randint(1, 4))
+            )))
+
+        date_created = created_since + step * i
+        # 30% of the cards were never revised, the rest were revised at some
+        # moment up to NOW and got a score that mostly grows with the number
+        # of successful revisions
+        date_updated = None
+        score = 0
+        if rng.random() >= 0.3:
+            date_updated = date_created + (NOW - date_created) * rng.random()
+            score = min(int(rng.expovariate(1 / 8)), 90)
+
+        card_obj = Card(
+            question=_texts(rng, 12),
+            answer=_texts(rng, 30),
+            markers=markers,
+            date_created=date_created,
+            date_updated=date_updated,
+            score=score
+        )
+
+        if series_left:
+            series_pos += 1
+            series_left -= 1
+            series_markers = markers
+            card_obj = card_obj._replace(
+                series=series_name,
+                pos_in_series=series_pos
+            )
+            if not series_left:
+                series_name = None
+
+        yield card_obj
+
+
+def populate(db_path, size, seed=0, created_since=None):
+    """Creates a DB file with a generated collection in it (see generate())
+
+    Args:
+        db_path (str): The path to the DB file, it mustn't exist yet
+        size, seed, created_since: Same as in generate()
+    """
+
+    # bootstrap_db() reports its success to stdout, where the results go
+    with redirect_stdout(io.StringIO()):
+        api.bootstrap_db(db_path)
+
+    batch = []
+    for card_obj in generate(size, seed, created_since):
+        batch.append(card_obj)
+        if len(batch) == BATCH_SIZE:
+            api.create_cards(batch, db_path)
+            batch = []
+    if batch:
+        api.create_cards(batch, db_path)
+
+    util.db_disconnect(db_path)
@@ -0,0 +1,48 @@
+"""
+Compares two result files of api_suite.py, e.g. the ones of two versions of
+knards, benchmark by benchmark.
+
+Usage: python benchmarks/compare.py BEFORE.json AFTER.json
+"""
+
+import json
+import sys
+
+
+def key(result):
+    return (
+        result['size'],
+        result['benchmark'],
+        json.dumps(result['params'], sort_keys=True)
+    )
+
+
+def main():
+    if len(sys.argv) != 3:
+        sys.exit(__doc__.strip())
+
+    with open(sys.argv[1]) as f:
+        before = {key(result): result for result in json.load(f)['results']}
+    with open(sys.argv[2]) as f:
+        after = [result for result in json.load(f)['results']]
+
+    print('{:>8}  {:<20}{:>12}{:>12}{:>8}  {}'.format(
+        'size', 'benchmark', 'before', 'after', 'ratio', 'params'
+    ))
+    for result in after:
+        if key(result) not in before:
+            continue
+        old = before[key(result)]['min']
+        new = result['min']
+        print('{:>8}  {:<20}{:>10.2f}ms{:>10.2f}ms{:>8.2f}  {}'.format(
+            result['size'],
+            result['benchmark'],
+            old * 1000,
+            new * 1000,
+            new / old if old else float('inf'),
+            json.dumps(result['params'], sort_keys=True)
+        ))
+
+
+if __name__ == '__main__':
+    main()
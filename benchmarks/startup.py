@@ -0,0 +1,87 @@
+"""
+Cold start benchmark of the "kn" entry point. Every run is a fresh interpreter,
+so what's measured is the time it takes to import knards and everything it
+pulls in, plus the work of the subcommand itself.
+
+Usage: PYTHONPATH=src python benchmarks/startup.py [--runs N]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# "kn ARGS" as the console script runs it
+KN = 'import sys; from knards.knards import main; sys.exit(main())'
+
+
+def import_time(module):
+    """Returns the cumulative import time of the module in microseconds, as
+    reported by python -X importtime"""
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        stderr=subprocess.PIPE,
+        check=True
+    ).stderr.decode()
+    for line in output.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)$', line)
+        if match and match.group(3) == module:
+            return int(match.group(1))
+
+
+def run_time(code, args, env, runs):
+    """Returns the (min, median) wall time of "python -c CODE ARGS" in
+    seconds"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, '-c', code] + args,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=20)
+    runs = parser.parse_args().runs
+
+    with tempfile.TemporaryDirectory() as home:
+        # kn status reads the DB at the default location under $HOME
+        env = dict(os.environ, HOME=home)
+        os.makedirs(os.path.join(home, '.local', 'bin'))
+        subprocess.run(
+            [sys.executable, '-c', KN, 'bootstrap-db'],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            check=True
+        )
+
+        print('{:<24}{:>12}'.format('import', 'cumulative'))
+        for module in ('knards.knards', 'knards.api', 'knards.util'):
+            print('{:<24}{:>10.1f}ms'.format(module, import_time(module) / 1000))
+
+        print()
+        print('{:<24}{:>12}{:>12}'.format('command', 'min', 'median'))
+        # the bare interpreter start is what no change to knards can go below
+        for name, code, args in (
+            ('python -c pass', 'pass', []),
+            ('kn --help', KN, ['--help']),
+            ('kn status', KN, ['status']),
+        ):
+            print('{:<24}{:>12}{:>12}'.format(name, *(
+                '{:.1f}ms'.format(timing * 1000)
+                for timing in run_time(code, args, env, runs)
+            )))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,20 @@
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta
 from collections import abc
+import os
+import re
 import sqlite3
 
-from knards import knards, config, msg, util, exceptions
+from knards import config, msg, util, exceptions, migrations
+from knards.card import Card, LazyCard, CardSet, from_timestamp
+
+# the columns of the "cards" table in the order knards.Card expects them
+CARD_COLUMNS = 'id, pos_in_series, question, answer, markers, series, \
+date_created, date_updated, score'
+
+# a card is due for revision .score days after the date of its last revision;
+# format in the SQL expressions for date_updated and score (dates are integer
+# numbers of microseconds, see knards.card.to_timestamp)
+DUE_DATE_SQL = '({} + {} * 86400000000)'
 
 
 def bootstrap_db(db_path=config.DB):
@@ -14,6 +26,10 @@ def bootstrap_db(db_path=config.DB):
         print(msg.DB_PATH_MUST_BE_STR)
         return False
 
+    # a connection to a file that used to exist under the same name can't be
+    # reused
+    util.db_disconnect(db_path)
+
     # connection might fail here if the script has no permission to write to
     # db_path
     try:
@@ -24,7 +40,8 @@ def bootstrap_db(db_path=config.DB):
 
     cursor = connection.cursor()
 
-    # create the main "cards" table
+    # create the main "cards" table the way the very first version of knards
+    # did, the migrations bring it up to date
     with connection:
         try:
             cursor.execute("""
@@ -44,11 +61,267 @@ def bootstrap_db(db_path=config.DB):
             print(msg.DB_ALREADY_EXISTS.format(db_path))
             return False
 
+    migrations.migrate(connection)
+
     print(msg.BOOTSTRAP_DB_SUCCESS.format(db_path))
     connection.close()
     return True
 
 
+def upgrade_db(db_path=config.get_DB_name()):
+    """Brings a DB created by an older version of knards up to date. Connecting
+    to a DB does this as well, so this is only needed to learn what was done.
+
+    Args:
+        db_path (str): The path to the DB (optional, defaults to what's defined in
+    config module)
+
+    Raises:
+        exceptions.DBFileNotFound: The DB file doesn't exist
+
+    Returns:
+        A list of descriptions of the applied migrations ([] if the DB was up
+    to date)
+    """
+
+    if not os.path.exists(db_path):
+        raise exceptions.DBFileNotFound(
+            'DB file ({}) does not exist.'.format(db_path)
+        )
+
+    # the connection that's kept open is already migrated
+    util.db_disconnect(db_path)
+
+    connection = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+    try:
+        return migrations.migrate(connection)
+    finally:
+        connection.close()
+
+
+def _as_datetime(date):
+    """Returns the datetime object for a date that may be passed in as text"""
+    if isinstance(date, str):
+        return from_timestamp(date)
+    return date
+
+
+def _allocate_ids(cursor, count):
+    """Picks ids for new cards, freed up ids go first, lowest first
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor of an open connection, must be within
+    the same transaction as the insertion of the new cards
+        count (int): The number of ids needed
+
+    Returns:
+        A list of ids
+    """
+    cursor.execute("""
+        SELECT id FROM free_ids ORDER BY id LIMIT ?
+    """, (count,))
+    ids = [row[0] for row in cursor.fetchall()]
+    cursor.executemany("""
+        DELETE FROM free_ids WHERE id = ?
+    """, [(free_id,) for free_id in ids])
+
+    if len(ids) < count:
+        # freed up ids may as well be the ones past the max id in use
+        cursor.execute("""
+            SELECT MAX(id) FROM cards
+        """)
+        next_id = max([cursor.fetchone()[0] or 0] + ids) + 1
+        ids.extend(range(next_id, next_id + count - len(ids)))
+
+    return ids
+
+
+def _free_ids(cursor, card_ids):
+    """Makes the ids of the deleted cards available for reuse
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor of an open connection
+        card_ids (int[]): A list of ids of the cards that are being deleted
+    """
+    cursor.executemany("""
+        INSERT OR IGNORE INTO free_ids (id) VALUES (?)
+    """, [(card_id,) for card_id in card_ids])
+
+
+def _store_markers(cursor, card_markers):
+    """Syncs the card_markers table with the markers of the passed in cards
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor of an open connection
+        card_markers (tuple[]): A list of (card id, markers text) pairs
+    """
+    card_markers = [
+        (card_id, set((markers or '').split()))
+        for card_id, markers in card_markers
+    ]
+
+    cursor.executemany("""
+        DELETE FROM card_markers WHERE card_id = ?
+    """, [(card_id,) for card_id, names in card_markers])
+    cursor.executemany("""
+        INSERT OR IGNORE INTO markers (name) VALUES (?)
+    """, [(name,) for card_id, names in card_markers for name in names])
+    cursor.executemany("""
+        INSERT INTO card_markers (marker_id, card_id)
+        SELECT id, ? FROM markers WHERE name = ?
+    """, [
+        (card_id, name) for card_id, names in card_markers for name in names
+    ])
+
+
+def _delete_markers(cursor, card_ids):
+    """Removes the passed in cards from the card_markers table
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor of an open connection
+        card_ids (int[]): A list of ids of the cards that are being deleted
+    """
+    cursor.executemany("""
+        DELETE FROM card_markers WHERE card_id = ?
+    """, [(card_id,) for card_id in card_ids])
+
+
+def _card_set_conditions(
+    revisable_only=False,
+    include_markers=[],
+    exclude_markers=[],
+    today=False,
+    due_by=None
+):
+    """Translates the constraints get_card_set() takes in into a single
+    parameterized WHERE clause
+
+    Args:
+        revisable_only (bool): Only cards that are ready to be revised
+        include_markers (str[]): A list of markers all of which each card must
+    have
+        exclude_markers (str[]): A list of markers none of which each card must
+    have
+        today (bool): Only cards that were already revised today
+        due_by (datetime): The moment revisable cards must be due by (optional,
+    defaults to now)
+
+    Returns:
+        A tuple of the WHERE clause (an empty string if there are no
+    constraints) and the list of parameters to execute it with
+    """
+
+    conditions = []
+    params = []
+
+    if revisable_only:
+        condition, condition_params = _revisable_condition(due_by)
+        conditions.append(condition)
+        params.extend(condition_params)
+
+    # markers are looked up in the card_markers index as whole words; a marker
+    # that isn't a single word can never be matched
+    included = [
+        marker for marker in include_markers
+        if isinstance(marker, str) and marker.split() == [marker]
+    ]
+    if len(included) != len(include_markers):
+        conditions.append('0')
+    elif included:
+        conditions.append('id IN ({})'.format(' INTERSECT '.join(["""
+            SELECT card_id FROM card_markers WHERE marker_id = (
+                SELECT id FROM markers WHERE name = ?
+            )"""] * len(included))))
+        params.extend(included)
+
+    excluded = [
+        marker for marker in exclude_markers
+        if isinstance(marker, str) and marker.split() == [marker]
+    ]
+    if excluded:
+        conditions.append("""id NOT IN (
+            SELECT card_id FROM card_markers WHERE marker_id IN (
+                SELECT id FROM markers WHERE name IN ({})
+            )
+        )""".format(', '.join('?' * len(excluded))))
+        params.extend(excluded)
+
+    if today:
+        condition, condition_params = _today_condition()
+        conditions.append(condition)
+        params.extend(condition_params)
+
+    if not conditions:
+        return ('', params)
+
+    return ('WHERE ' + ' AND '.join(conditions), params)
+
+
+def _revisable_condition(due_by=None):
+    """A card is ready to be revised if it was never revised (has no due date)
+    or if its due date has come. Returns the (condition, parameters) tuple.
+    """
+    return ('(due_date IS NULL OR due_date <= ?)', [due_by or datetime.now()])
+
+
+def _today_condition():
+    """Cards that have date_updated equal to today's date (were revised today).
+    Returns the (condition, parameters) tuple; it's a range so that the index
+    on date_updated is used.
+    """
+    today = datetime.combine(datetime.now().date(), time.min)
+    return (
+        '(date_updated >= ? AND date_updated < ?)',
+        [today, today + timedelta(days=1)]
+    )
+
+
+def _card_select_list(fields=None, show_question=True, show_answer=True):
+    """Builds the list of columns to SELECT for knards.Card objects; columns
+    that aren't needed are never read, a placeholder is selected in their
+    place instead ('' for question/answer texts, NULL for the rest)
+
+    Args:
+        fields (str[]): Names of knards.Card fields to read (optional, defaults
+    to all of them)
+        show_question (bool): Read the question text
+        show_answer (bool): Read the answer text
+
+    Raises:
+        TypeError: fields is not a list
+        ValueError: fields contains something that's not a knards.Card field
+
+    Returns:
+        A comma separated list of columns/placeholders in the order
+    knards.Card expects them
+    """
+    columns = [column.strip() for column in CARD_COLUMNS.split(',')]
+
+    if fields is None:
+        fields = columns
+    if isinstance(fields, str) or not isinstance(fields, abc.Sequence):
+        raise TypeError('fields must be a list.')
+    for field in fields:
+        if field not in columns:
+            raise ValueError('{} is not a field of knards.Card.'.format(field))
+
+    if not show_question:
+        fields = [field for field in fields if field != 'question']
+    if not show_answer:
+        fields = [field for field in fields if field != 'answer']
+
+    select_list = []
+    for column in columns:
+        if column in fields:
+            select_list.append(column)
+        elif column in ('question', 'answer'):
+            select_list.append("'' AS {}".format(column))
+        else:
+            select_list.append('NULL AS {}'.format(column))
+
+    return ', '.join(select_list)
+
+
 def get_card_set(
     revisable_only=False,
     show_question=True,
@@ -56,6 +329,10 @@ def get_card_set(
     include_markers=[],
     exclude_markers=[],
     today=False,
+    due_by=None,
+    fields=None,
+    lazy=False,
+    columnar=False,
     db_path=config.get_DB_name()
 ):
     """Outputs a set of objects of type knards.Card constrained by the passed in
@@ -71,6 +348,15 @@ def get_card_set(
         exclude_markers (str[]): A list of markers none of which each card that is
     to be revised must have
         today (bool): Returns only card objects that were already revised today
+        due_by (datetime): If revisable_only is True, returns card objects that
+    are due by this moment (optional, defaults to now)
+        fields (str[]): Names of knards.Card fields to read from the DB, the
+    rest are left empty ('' for question/answer, None for the rest) and are
+    never read (optional, defaults to all of the fields)
+        lazy (bool): Return objects of type knards.LazyCard that read their
+    question and answer texts only when those are accessed (see load_texts())
+        columnar (bool): Return the set as a knards.CardSet instead of a list,
+    so that its cards take far less memory
         db_path (str): The path to the DB (optional, defaults to what's defined in
     config module)
 
@@ -81,6 +367,137 @@ def get_card_set(
         TODO
     """
 
+    if not isinstance(columnar, bool):
+        raise TypeError('columnar must be a boolean.')
+
+    if columnar:
+        cursor, texts_loader = _card_set_cursor(
+            revisable_only=revisable_only,
+            show_question=show_question,
+            show_answer=show_answer,
+            include_markers=include_markers,
+            exclude_markers=exclude_markers,
+            today=today,
+            due_by=due_by,
+            fields=fields,
+            lazy=lazy,
+            db_path=db_path,
+            raw_dates=True
+        )
+        card_set = CardSet.from_rows(cursor, texts_loader)
+        cursor.close()
+    else:
+        card_set = list(iter_card_set(
+            revisable_only=revisable_only,
+            show_question=show_question,
+            show_answer=show_answer,
+            include_markers=include_markers,
+            exclude_markers=exclude_markers,
+            today=today,
+            due_by=due_by,
+            fields=fields,
+            lazy=lazy,
+            db_path=db_path
+        ))
+
+    # an empty DB is reported as such, while no cards adhering to the
+    # constraints is just an empty set
+    if not card_set:
+        with util.db_connect(db_path) as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT 1 FROM cards LIMIT 1
+            """)
+            if cursor.fetchone() is None:
+                raise exceptions.EmptyDB(
+                    'No cards adhere to the specified constraints.'
+                )
+
+    return card_set
+
+
+def iter_card_set(
+    revisable_only=False,
+    show_question=True,
+    show_answer=True,
+    include_markers=[],
+    exclude_markers=[],
+    today=False,
+    due_by=None,
+    fields=None,
+    chunk_size=config.get_fetch_chunk_size(),
+    lazy=False,
+    db_path=config.get_DB_name()
+):
+    """The streaming counterpart of get_card_set(): yields objects of type
+    knards.Card constrained by the passed in options one by one, reading them
+    from the DB in chunks, so that the whole set is never held in memory.
+
+    Args:
+        revisable_only, show_question, show_answer, include_markers,
+    exclude_markers, today, due_by, fields, lazy, db_path: Same as in
+    get_card_set()
+        chunk_size (int): The number of rows read from the DB at a time
+    (optional, defaults to what's defined in config module)
+
+    Raises:
+        TypeError: One of the options is of a wrong type
+        ValueError: fields contains something that's not a knards.Card field
+        exceptions.DBFileNotFound: The DB file doesn't exist
+
+    Returns:
+        A generator of objects of type knards.Card; unlike get_card_set(), an
+    empty DB is not an error, the generator just yields nothing
+    """
+
+    if not isinstance(chunk_size, int) or chunk_size < 1:
+        raise TypeError('chunk_size must be a positive integer.')
+
+    cursor, texts_loader = _card_set_cursor(
+        revisable_only=revisable_only,
+        show_question=show_question,
+        show_answer=show_answer,
+        include_markers=include_markers,
+        exclude_markers=exclude_markers,
+        today=today,
+        due_by=due_by,
+        fields=fields,
+        lazy=lazy,
+        db_path=db_path
+    )
+
+    return _iter_cursor(cursor, chunk_size, texts_loader)
+
+
+def _card_set_cursor(
+    revisable_only,
+    show_question,
+    show_answer,
+    include_markers,
+    exclude_markers,
+    today,
+    due_by,
+    fields,
+    lazy,
+    db_path,
+    raw_dates=False
+):
+    """Checks the options of get_card_set()/iter_card_set() and runs the query
+    for them right away, so that errors are raised upon the call rather than
+    upon the first iteration
+
+    Args:
+        revisable_only, show_question, show_answer, include_markers,
+    exclude_markers, today, due_by, fields, lazy, db_path: Same as in
+    get_card_set()
+        raw_dates (bool): Read the dates as they're stored, without converting
+    them to datetime objects
+
+    Returns:
+        A tuple of the executed cursor and the texts loader function (None if
+    not lazy)
+    """
+
     if not isinstance(revisable_only, bool):
         raise TypeError('revisable_only must be a boolean.')
     if not isinstance(today, bool):
@@ -93,93 +510,520 @@ def get_card_set(
         raise TypeError('include_markers must be a list.')
     if not isinstance(exclude_markers, abc.Sequence):
         raise TypeError('exclude_markers must be a list.')
+    if due_by is not None and not isinstance(due_by, datetime):
+        raise TypeError('due_by must be a datetime.')
+    if not isinstance(lazy, bool):
+        raise TypeError('lazy must be a boolean.')
+
+    select_list = _card_select_list(fields, show_question, show_answer)
+    texts_loader = None
+    if lazy:
+        # the texts are left out of the query and read later on by the cards
+        texts_loader = _texts_loader(select_list.split(', ')[2:4], db_path)
+        select_list = _card_select_list(fields, False, False)
+    if raw_dates:
+        # an expression has no declared type, so it's never converted
+        for column in ('date_created', 'date_updated'):
+            select_list = select_list.replace(
+                ', {}, '.format(column),
+                ', +{0} AS {0}, '.format(column)
+            )
+    where_clause, params = _card_set_conditions(
+        revisable_only=revisable_only,
+        include_markers=include_markers,
+        exclude_markers=exclude_markers,
+        today=today,
+        due_by=due_by
+    )
+
+    cursor = util.db_connect(db_path).cursor()
+    cursor.execute("""
+        SELECT {} FROM cards {} ORDER BY id
+    """.format(select_list, where_clause), params)
+
+    return cursor, texts_loader
+
+
+def _iter_cursor(cursor, chunk_size, texts_loader=None):
+    """Yields knards.Card objects out of the rows of an executed query, or
+    knards.LazyCard ones if texts_loader is passed in"""
+    while True:
+        card_set = cursor.fetchmany(chunk_size)
+        if not card_set:
+            break
+
+        for card in card_set:
+            if texts_loader is None:
+                yield Card(*card)
+            else:
+                yield LazyCard(*card, texts_loader=texts_loader)
+
+    cursor.close()
+
+
+def _texts_loader(select_list, db_path):
+    """Returns the function knards.LazyCard objects read their texts with: it
+    takes in a list of card ids and returns a dict of (question, answer) tuples
+    by id
+
+    Args:
+        select_list (str[]): The columns/placeholders to read for the question
+    and answer texts (see _card_select_list())
+        db_path (str): The path to the DB
+    """
+
+    def load(card_ids):
+        texts = {card_id: ('', '') for card_id in card_ids}
+        with util.db_connect(db_path) as connection:
+            cursor = connection.cursor()
+
+            # in chunks, to stay within the limit of the number of parameters
+            # in a single query
+            for start in range(0, len(card_ids), 500):
+                chunk = card_ids[start:start + 500]
+                cursor.execute("""
+                    SELECT id, {} FROM cards WHERE id IN ({})
+                """.format(', '.join(select_list), ','.join('?' * len(chunk))),
+                    chunk
+                )
+                for card_id, question, answer in cursor.fetchall():
+                    texts[card_id] = (question, answer)
+
+        return texts
+
+    return load
+
+
+def load_texts(card_objs):
+    """Reads the question and answer texts of a batch of knards.LazyCard
+    objects at once (instead of one query per card upon access)
+
+    Args:
+        card_objs (knards.Card[]): An iterable of card objects, the ones that
+    aren't lazy or have their texts read already are skipped
+
+    Returns:
+        The list of the passed in card objects
+    """
+
+    card_objs = [card_obj for card_obj in card_objs]
+
+    # cards of different queries have different loaders
+    by_loader = {}
+    for card_obj in card_objs:
+        if isinstance(card_obj, LazyCard) and not card_obj.texts_loaded:
+            by_loader.setdefault(card_obj._texts_loader, []).append(card_obj)
+
+    for texts_loader, lazy_card_objs in by_loader.items():
+        texts = texts_loader([card_obj.id for card_obj in lazy_card_objs])
+        for card_obj in lazy_card_objs:
+            card_obj._fill_texts(*texts[card_obj.id])
+
+    return card_objs
+
+
+def count_cards(
+    revisable_only=False,
+    include_markers=[],
+    exclude_markers=[],
+    today=False,
+    due_by=None,
+    db_path=config.get_DB_name()
+):
+    """Counts the cards constrained by the passed in options, without reading
+    any of them
+
+    Args:
+        revisable_only, include_markers, exclude_markers, today, due_by,
+    db_path: Same as in get_card_set()
+
+    Raises:
+        TypeError: One of the options is of a wrong type
+        exceptions.DBFileNotFound: The DB file doesn't exist
+
+    Returns:
+        The number of cards
+    """
+
+    if not isinstance(revisable_only, bool):
+        raise TypeError('revisable_only must be a boolean.')
+    if not isinstance(today, bool):
+        raise TypeError('today must be a boolean.')
+    if not isinstance(include_markers, abc.Sequence):
+        raise TypeError('include_markers must be a list.')
+    if not isinstance(exclude_markers, abc.Sequence):
+        raise TypeError('exclude_markers must be a list.')
+    if due_by is not None and not isinstance(due_by, datetime):
+        raise TypeError('due_by must be a datetime.')
+
+    where_clause, params = _card_set_conditions(
+        revisable_only=revisable_only,
+        include_markers=include_markers,
+        exclude_markers=exclude_markers,
+        today=today,
+        due_by=due_by
+    )
 
     with util.db_connect(db_path) as connection:
         cursor = connection.cursor()
         cursor.execute("""
-            SELECT * FROM cards
-        """)
-        card_set = cursor.fetchall()
+            SELECT COUNT(*) FROM cards {}
+        """.format(where_clause), params)
+        return cursor.fetchone()[0]
 
-    if not card_set:
-        raise exceptions.EmptyDB('No cards adhere to the specified constraints.')
 
-    card_set_as_objects = []
-    for card in card_set:
-        card_set_as_objects.append(knards.Card(*list(card)))
-
-    card_set_revisable = []
-    for card in card_set_as_objects:
-        # if revisable_only is True -> only return cards that has their score
-        # equal to or more than the difference between today and the date of the
-        # last card update (revision) and cards that weren't yet revised
-        if revisable_only:
-            if card.date_updated is None:
-                card_set_revisable.append(card)
-            elif card.score <= (
-                datetime.now() - card.date_updated
-            ).days:
-                card_set_revisable.append(card)
-        else:
-            card_set_revisable = card_set_as_objects
-            break
+def status_summary(
+    include_markers=[],
+    exclude_markers=[],
+    db_path=config.get_DB_name()
+):
+    """Counts the cards in total, the ones revised today and the ones ready to
+    be revised, all in a single pass over the DB
 
-    card_set_included_markers = []
-    for card in card_set_revisable:
-        # if include_markers is not '' -> filter cards that must have all of the
-        # specified markers (as whole words)
-        if include_markers:
-            compare_list = card.markers.split()
-            for marker in include_markers:
-                if not marker in compare_list:
-                    break
-            else:
-                card_set_included_markers.append(card)
-        else:
-            card_set_included_markers = card_set_revisable
-            break
+    Args:
+        include_markers, exclude_markers, db_path: Same as in get_card_set()
 
-    card_set_excluded_markers = []
-    for card in card_set_included_markers:
-        # if exclude_markers is not '' -> filter cards that must have none of the
-        # specified markers (as whole words)
-        if exclude_markers:
-            compare_list = card.markers.split()
-            for marker in exclude_markers:
-                if marker in compare_list:
-                    break
-            else:
-                card_set_excluded_markers.append(card)
-        else:
-            card_set_excluded_markers = card_set_included_markers
-            break
+    Raises:
+        TypeError: One of the options is of a wrong type
+        exceptions.DBFileNotFound: The DB file doesn't exist
+
+    Returns:
+        A dict with 'total', 'revised_today' and 'revisable' counts
+    """
+
+    if not isinstance(include_markers, abc.Sequence):
+        raise TypeError('include_markers must be a list.')
+    if not isinstance(exclude_markers, abc.Sequence):
+        raise TypeError('exclude_markers must be a list.')
+
+    today_condition, today_params = _today_condition()
+    revisable_condition, revisable_params = _revisable_condition()
+    where_clause, params = _card_set_conditions(
+        include_markers=include_markers,
+        exclude_markers=exclude_markers
+    )
+
+    with util.db_connect(db_path) as connection:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(CASE WHEN {} THEN 1 ELSE 0 END), 0),
+                COALESCE(SUM(CASE WHEN {} THEN 1 ELSE 0 END), 0)
+            FROM cards {}
+        """.format(today_condition, revisable_condition, where_clause),
+            today_params + revisable_params + params
+        )
+        total, revised_today, revisable = cursor.fetchone()
+
+    return {
+        'total': total,
+        'revised_today': revised_today,
+        'revisable': revisable,
+    }
+
+
+def get_marker_stats(markers, db_path=config.get_DB_name()):
+    """Collects per marker statistics of the cards, all in a single pass over
+    the markers index
+
+    Args:
+        markers (str[]): A list of markers to collect the statistics of
+        db_path (str): The path to the DB (optional, defaults to what's defined in
+    config module)
+
+    Raises:
+        TypeError: markers is not a list
+        exceptions.DBFileNotFound: The DB file doesn't exist
+
+    Returns:
+        A dict with a dict of 'total' (the number of cards with the marker),
+    'revisable' (the number of those ready to be revised) and 'overdue_days'
+    (the sum of full days passed since the last revision, or creation, of each
+    of the revisable ones) for every marker; markers no cards have are omitted
+    """
+
+    if isinstance(markers, str) or not isinstance(markers, abc.Sequence):
+        raise TypeError('markers must be a list.')
+
+    markers = [marker for marker in markers if isinstance(marker, str)]
+    if not markers:
+        return {}
+
+    now = datetime.now()
+    revisable_condition, revisable_params = _revisable_condition(now)
+
+    # days are floored the way timedelta.days are
+    with util.db_connect(db_path) as connection:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT
+                name,
+                COUNT(*),
+                COALESCE(SUM(revisable), 0),
+                COALESCE(SUM(CASE WHEN revisable THEN
+                    CAST(days AS INTEGER) - (days < CAST(days AS INTEGER))
+                ELSE 0 END), 0)
+            FROM (
+                SELECT
+                    markers.name AS name,
+                    {} AS revisable,
+                    (? - COALESCE(cards.date_updated, cards.date_created))
+                    / 86400000000.0 AS days
+                FROM markers
+                JOIN card_markers ON card_markers.marker_id = markers.id
+                JOIN cards ON cards.id = card_markers.card_id
+                WHERE markers.name IN ({})
+            )
+            GROUP BY name
+        """.format(revisable_condition, ', '.join('?' * len(markers))),
+            revisable_params + [now] + markers
+        )
+        marker_stats = cursor.fetchall()
 
-    card_set_today = []
-    for card in card_set_excluded_markers:
-        # return cards that have date_updated equal to today's date (were revised
-        # today)
-        if today:
-            if card.date_updated and card.date_updated.date() == datetime.now().date():
-                card_set_today.append(card)
+    return {
+        name: {
+            'total': total,
+            'revisable': revisable,
+            'overdue_days': overdue_days,
+        } for name, total, revisable, overdue_days in marker_stats
+    }
+
+
+def get_recommendations(
+    tags_list=config.get_tags_list(),
+    tags_only_revise=config.get_tags_only_revise_list(),
+    db_path=config.get_DB_name()
+):
+    """Decides what's better to learn and what's better to revise next. Groups
+    of tags that have too few cards ready to be revised compared to their total
+    are recommended to learn: the tags with the fewest cards in each of them.
+    The rest are recommended to revise: the tags that are overdue the most on
+    average.
+
+    Args:
+        tags_list (dict): Groups of tags, the names of the groups are markers as
+    well (optional, defaults to what's defined in config module)
+        tags_only_revise (str[]): Tags that are never recommended to learn
+    (optional, defaults to what's defined in config module)
+        db_path (str): The path to the DB (optional, defaults to what's defined in
+    config module)
+
+    Returns:
+        A dict with 'learn' and 'revise' lists of dicts, each with a 'group'
+    name and a list of 'tags' (empty if there's nothing to revise in the group)
+    """
+
+    tags_groups_names = [group_name for group_name in tags_list]
+    stats = get_marker_stats(
+        tags_groups_names + [
+            tag for group_name in tags_groups_names
+            for tag in tags_list[group_name]
+        ],
+        db_path
+    )
+    no_stats = {'total': 0, 'revisable': 0, 'overdue_days': 0}
+
+    recommendations = {'learn': [], 'revise': []}
+
+    for group_name in tags_groups_names:
+        group_stats = stats.get(group_name, no_stats)
+
+        if ((group_stats['total'] / (group_stats['revisable'] + 1)) > 2
+                or group_stats['total'] == 0):
+            sorted_by_priority = {}
+            for tag in tags_list[group_name]:
+                if tag in tags_only_revise:
+                    continue
+
+                total = stats.get(tag, no_stats)['total']
+                if total not in sorted_by_priority:
+                    sorted_by_priority[total] = []
+                sorted_by_priority[total].append(tag)
+
+            if sorted_by_priority:
+                recommendations['learn'].append({
+                    'group': group_name,
+                    'tags': sorted_by_priority[min(sorted_by_priority)],
+                })
         else:
-            card_set_today = card_set_excluded_markers
-            break
+            sorted_by_priority = {}
+            for tag in tags_list[group_name]:
+                tag_stats = stats.get(tag, no_stats)
+                priority = tag_stats['overdue_days']
+                if tag_stats['total'] != 0:
+                    priority = round(priority / tag_stats['total'])
+                if priority not in sorted_by_priority:
+                    sorted_by_priority[priority] = []
+                sorted_by_priority[priority].append(tag)
+
+            recommendations['revise'].append({
+                'group': group_name,
+                'tags': sorted_by_priority[max(sorted_by_priority)]
+                if sorted_by_priority else [],
+            })
+
+    return recommendations
+
+
+def search_cards(
+    query,
+    include_markers=[],
+    exclude_markers=[],
+    limit=20,
+    db_path=config.get_DB_name()
+):
+    """Looks the cards up by the words in their question and answer texts,
+    using the full-text search index (if the sqlite the DB was created with
+    had no FTS5, the texts are scanned instead and the cards aren't ranked)
 
-    if not show_question:
-        card_set_without_questions = []
-        for card in card_set_today:
-            card_set_without_questions.append(card._replace(question=''))
-    else:
-        card_set_without_questions = card_set_today
+    Args:
+        query (str): Words all of which each card must contain, in any order;
+    a word ending with * matches any word starting with it
+        include_markers (str[]): A list of markers all of which each card must
+    have
+        exclude_markers (str[]): A list of markers none of which each card must
+    have
+        limit (int): The max number of cards to return (optional, defaults to
+    20, None means no limit)
+        db_path (str): The path to the DB (optional, defaults to what's defined in
+    config module)
 
-    if not show_answer:
-        card_set_without_answers = []
-        for card in card_set_without_questions:
-            card_set_without_answers.append(card._replace(answer=''))
+    Raises:
+        TypeError: One of the options is of a wrong type
+        exceptions.DBFileNotFound: The DB file doesn't exist
+
+    Returns:
+        A list of (knards.Card, snippet) tuples, the best matches first; the
+    snippet is the most relevant piece of the text with the matched words
+    wrapped in [ and ]
+    """
+
+    if not isinstance(query, str):
+        raise TypeError('query must be a string.')
+    if not isinstance(include_markers, abc.Sequence):
+        raise TypeError('include_markers must be a list.')
+    if not isinstance(exclude_markers, abc.Sequence):
+        raise TypeError('exclude_markers must be a list.')
+    if limit is not None and not isinstance(limit, int):
+        raise TypeError('limit must be an integer.')
+
+    # (word, is prefix) pairs
+    terms = []
+    for word in query.split():
+        if word.rstrip('*'):
+            terms.append((word.rstrip('*'), word.endswith('*')))
+    if not terms:
+        return []
+
+    where_clause, params = _card_set_conditions(
+        include_markers=include_markers,
+        exclude_markers=exclude_markers
+    )
+    where_clause = where_clause.replace('WHERE', 'AND', 1)
+    card_columns = ', '.join(
+        'cards.' + column.strip() for column in CARD_COLUMNS.split(',')
+    )
+
+    with util.db_connect(db_path) as connection:
+        cursor = connection.cursor()
+
+        # every word is quoted so that the query is never parsed as FTS5
+        # syntax
+        words = [
+            '"{}"{}'.format(word.replace('"', '""'), '*' if prefix else '')
+            for word, prefix in terms
+        ]
+        try:
+            cursor.execute("""
+                SELECT {}, snippet(cards_fts, -1, '[', ']', '...', 16)
+                FROM cards_fts
+                JOIN cards ON cards.id = cards_fts.rowid
+                WHERE cards_fts MATCH ? {}
+                ORDER BY rank
+                LIMIT ?
+            """.format(card_columns, where_clause),
+                [' '.join(words)] + params + [-1 if limit is None else limit]
+            )
+        except sqlite3.OperationalError as e:
+            # the DB has no index if the sqlite it was created with had no
+            # FTS5 (see migrations._create_fts_index()), and the index can't
+            # be read by a sqlite without FTS5; the texts are scanned then
+            if 'cards_fts' not in str(e) and 'fts5' not in str(e):
+                raise
+            return _search_cards_without_index(
+                cursor, terms, card_columns, where_clause, params, limit
+            )
+
+        return [
+            (Card(*row[:-1]), row[-1]) for row in cursor.fetchall()
+        ]
+
+
+def _search_cards_without_index(
+    cursor,
+    terms,
+    card_columns,
+    where_clause,
+    params,
+    limit
+):
+    # every word is looked up anywhere in either text, case-insensitively,
+    # so a word matches the words it's a part of too; there's no ranking, the
+    # earliest created cards go first
+    conditions = []
+    like_params = []
+    for word, prefix in terms:
+        pattern = '%{}%'.format(
+            word.replace('\\', '\\\\').replace('%', '\\%').replace(
+                '_', '\\_'
+            )
+        )
+        conditions.append("""
+            (cards.question LIKE ? ESCAPE '\\'
+            OR cards.answer LIKE ? ESCAPE '\\')
+        """)
+        like_params.extend([pattern, pattern])
+
+    cursor.execute("""
+        SELECT {} FROM cards
+        WHERE {} {}
+        ORDER BY cards.date_created, cards.id
+        LIMIT ?
+    """.format(card_columns, ' AND '.join(conditions), where_clause),
+        like_params + params + [-1 if limit is None else limit]
+    )
+
+    # the whole words the matches are parts of are highlighted
+    words = re.compile(r'\w*(?:{})\w*'.format(
+        '|'.join(re.escape(word) for word, prefix in terms)
+    ), re.IGNORECASE)
+    found = []
+    for row in cursor.fetchall():
+        card_obj = Card(*row)
+        found.append((card_obj, _snippet(card_obj, words)))
+    return found
+
+
+def _snippet(card_obj, words, length=16):
+    # the piece of the first text with a match in it, the same as the one FTS5
+    # picks in search_cards(): up to length words with the matches wrapped in
+    # [ and ]
+    for text in (card_obj.question, card_obj.answer):
+        tokens = (text or '').split()
+        matched = [i for i, token in enumerate(tokens) if words.search(token)]
+        if matched:
+            break
     else:
-        card_set_without_answers = card_set_without_questions
+        return ''
 
-    return card_set_without_answers
+    start = max(0, min(matched[0], len(tokens) - length))
+    piece = ' '.join(tokens[start:start + length])
+    return '{}{}{}'.format(
+        '...' if start > 0 else '',
+        words.sub(lambda match: '[{}]'.format(match.group(0)), piece),
+        '...' if start + length < len(tokens) else ''
+    )
 
 
 def get_series_set(series_name, db_path=config.get_DB_name()):
@@ -200,21 +1044,58 @@ def get_series_set(series_name, db_path=config.get_DB_name()):
     if not isinstance(series_name, str):
         raise TypeError('\'series_name\' argument must be a list.')
 
+    series_sets = get_series_sets([series_name], db_path)
+    if series_name not in series_sets:
+        raise exceptions.EmptyDB('No cards adhere to the specified constraints.')
+
+    return series_sets[series_name]
+
+
+def get_series_sets(series_names, db_path=config.get_DB_name()):
+    """Returns all cards of each of the specified series, reading them all in
+    one go
+
+    Args:
+        series_names (str[]): A list of series names
+        db_path (str): The path to the DB (optional, defaults to what's defined in
+    config module)
+
+    Raises:
+        TypeError: series_names is not a list of strings
+        exceptions.DBFileNotFound: The DB file doesn't exist
+
+    Returns:
+        A dict with a dict of the cards of every series, keyed by their
+    positions in the series; series that no cards belong to are omitted
+    """
+
+    if isinstance(series_names, str) \
+            or not isinstance(series_names, abc.Iterable):
+        raise TypeError('series_names must be a list.')
+    series_names = [series_name for series_name in dict.fromkeys(series_names)]
+    for series_name in series_names:
+        if not isinstance(series_name, str):
+            raise TypeError('Series names must be strings.')
+
+    series_sets = {}
     with util.db_connect(db_path) as connection:
         cursor = connection.cursor()
-        cursor.execute("""
-            SELECT * FROM cards WHERE series = '{}'
-        """.format(series_name))
-        card_set = cursor.fetchall()
-
-    if not card_set:
-        raise exceptions.EmptyDB('No cards adhere to the specified constraints.')
 
-    sorted_card_set = {}
-    for card in card_set:
-        sorted_card_set[knards.Card(*card).pos_in_series] = knards.Card(*card)
+        # in chunks, to stay within the limit of the number of parameters in a
+        # single query
+        for start in range(0, len(series_names), 500):
+            chunk = series_names[start:start + 500]
+            cursor.execute("""
+                SELECT {} FROM cards WHERE series IN ({})
+                ORDER BY series, pos_in_series, id
+            """.format(CARD_COLUMNS, ','.join('?' * len(chunk))), chunk)
+            for row in cursor.fetchall():
+                card_obj = Card(*row)
+                series_sets.setdefault(card_obj.series, {})[
+                    card_obj.pos_in_series
+                ] = card_obj
 
-    return sorted_card_set
+    return series_sets
 
 
 def get_card_by_id(card_id, db_path=config.get_DB_name()):
@@ -235,8 +1116,8 @@ def get_card_by_id(card_id, db_path=config.get_DB_name()):
     with util.db_connect(db_path) as connection:
         cursor = connection.cursor()
         cursor.execute("""
-            SELECT * FROM cards WHERE id = {}
-        """.format(card_id))
+            SELECT {} FROM cards WHERE id = ?
+        """.format(CARD_COLUMNS), (card_id,))
         card = cursor.fetchone()
 
     if not card:
@@ -244,7 +1125,7 @@ def get_card_by_id(card_id, db_path=config.get_DB_name()):
             'Card #{} was not found in the DB.'.format(card_id)
         )
 
-    card_obj = knards.Card(*card)
+    card_obj = Card(*card)
     return card_obj
 
 
@@ -274,55 +1155,23 @@ def get_last_card(markers=None, db_path=config.DB):
                     print(msg.MARKERS_MUST_BE_LIST)
                     return None
 
-    connection = util.db_connect(db_path)
-    if not connection:
-        return None
+    where_clause, params = _card_set_conditions(include_markers=markers or [])
 
-    cursor = connection.cursor()
+    # the most recent date of addition wins, the max card id breaks the tie
+    with util.db_connect(db_path) as connection:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT {} FROM cards {}
+            ORDER BY date_created DESC, id DESC LIMIT 1
+        """.format(CARD_COLUMNS, where_clause), params)
+        card = cursor.fetchone()
 
-    with connection:
-        if not markers:
-            cursor.execute("""
-                SELECT * FROM cards WHERE id = (SELECT MAX(id) FROM cards WHERE \
-date_created = (SELECT MAX(date_created) FROM cards))
-            """)
-            card = cursor.fetchone()
-            if card:
-                card_obj = knards.Card(*list(card))
-        else:
-            card_set = get_card_set()
-            cards_to_pick_from = []
-
-            # sift in only cards that contain all of the specified markers
-            for card in card_set:
-                has_markers = card.markers.split()
-                for marker in markers:
-                    if marker not in has_markers:
-                        break
-                else:
-                    cards_to_pick_from.append(card)
-
-            if not cards_to_pick_from:
-                print(msg.CARDS_BY_MARKERS_NOT_FOUND.format(', '.join(markers)))
-                return None
-
-            # find out the most recent date of addition of a card with specified markers
-            max_date = datetime(1970, 1, 1)
-            for card in cards_to_pick_from:
-                if card.date_created > max_date:
-                    max_date = card.date_created
-
-            # find out the max card id among the sifted in cards
-            card_with_max_id = knards.Card(id=0)
-            for card in cards_to_pick_from:
-                if card.date_created == max_date and card.id > card_with_max_id.id:
-                    card_with_max_id = card
-
-            card_obj = card_with_max_id
-            card = 'This is a shitty algorithm, rewrite it!'
-
-    assert card
-    return card_obj
+    if not card:
+        if markers:
+            print(msg.CARDS_BY_MARKERS_NOT_FOUND.format(', '.join(markers)))
+        return None
+
+    return Card(*card)
 
 
 def create_card(card_obj, db_path=config.get_DB_name()):
@@ -334,35 +1183,167 @@ def create_card(card_obj, db_path=config.get_DB_name()):
     Returns an id of the card in the DB created based on the passed in object.
     """
 
-    if type(card_obj) is not knards.Card:
+    if not isinstance(card_obj, Card):
         raise ValueError('Input card object must be of type knards.Card')
 
-    # find a free id
-    # this allows to reuse ids that were used and then freed up by deleting the
-    # object
-    free_id = 1
-    with util.db_connect(db_path) as connection:
-        cursor = connection.cursor()
-        cursor.execute("""
-            SELECT (id) FROM cards
-        """)
+    return create_cards([card_obj], db_path)[0]
 
-        for id in cursor.fetchall():
-            if free_id != id[0]:
-                break
 
-            free_id += 1
+def create_cards(card_objs, db_path=config.get_DB_name()):
+    """Stores a batch of cards in the DB within a single transaction
 
-        card_obj = card_obj._replace(id=free_id)
+    Args:
+        card_objs (knards.Card[]): An iterable of objects of type knards.Card,
+    their ids are ignored
+        db_path (str): The path to the DB (optional, defaults to what's defined in
+    config module)
+
+    Raises:
+        ValueError: One of the objects is not of type knards.Card
+
+    Returns:
+        A list of ids the cards were created with, in the order of card_objs
+    """
+
+    card_objs = [card_obj for card_obj in card_objs]
+    for card_obj in card_objs:
+        if not isinstance(card_obj, Card):
+            raise ValueError('Input card object must be of type knards.Card')
 
     with util.db_connect(db_path) as connection:
         cursor = connection.cursor()
+        # the ids have to stay free until the cards are inserted
+        cursor.execute('BEGIN IMMEDIATE')
+
+        # this allows to reuse ids that were used and then freed up by deleting
+        # the object
+        created_with_ids = _allocate_ids(cursor, len(card_objs))
+        # dates that come in as text are stored as the datetime objects they
+        # stand for, so that they compare with the rest
+        card_objs = [
+            card_obj._replace(
+                id=card_id,
+                date_created=_as_datetime(card_obj.date_created),
+                date_updated=_as_datetime(card_obj.date_updated)
+            ) for card_obj, card_id in zip(card_objs, created_with_ids)
+        ]
+
+        cursor.executemany("""
+            INSERT INTO cards ({}, due_date) VALUES ({}, {})
+        """.format(
+            CARD_COLUMNS,
+            ','.join(list('?' * len(Card._fields))),
+            DUE_DATE_SQL.format('?', '?')
+        ), [
+            tuple(card_obj) + (card_obj.date_updated, card_obj.score)
+            for card_obj in card_objs
+        ])
+        _store_markers(cursor, [
+            (card_obj.id, card_obj.markers) for card_obj in card_objs
+        ])
+
+    return created_with_ids
+
+
+def merge_db(merge_db_path, db_path=config.get_DB_name()):
+    """Copies the cards of another DB into this one within a single
+    transaction. Cards created at the same moment as any card in this DB are
+    considered to be already merged and are skipped.
+
+    Args:
+        merge_db_path (str): The path to the DB to merge
+        db_path (str): The path to the DB (optional, defaults to what's defined in
+    config module)
+
+    Raises:
+        exceptions.DBFileNotFound: One of the DB files doesn't exist
+        sqlite3.DatabaseError: The DB to merge is not a proper DB file
+
+    Returns:
+        A tuple of the number of merged cards and the number of skipped ones
+    """
+
+    # the DB to merge is only read, so it's attached as it is rather than
+    # brought up to date by connecting to it; the dates older versions of
+    # knards stored as text are converted as they're read
+    if not os.path.exists(merge_db_path):
+        raise exceptions.DBFileNotFound(
+            'DB file ({}) does not exist.'.format(merge_db_path)
+        )
+    merged_date_created = migrations.TIMESTAMP_FROM_TEXT_SQL.format(
+        'merged.cards.date_created'
+    )
+    merged_date_updated = migrations.TIMESTAMP_FROM_TEXT_SQL.format(
+        'merged.cards.date_updated'
+    )
+
+    connection = util.db_connect(db_path)
+    cursor = connection.cursor()
+    cursor.execute("""
+        ATTACH DATABASE ? AS merged
+    """, (merge_db_path,))
+
+    try:
+        with connection:
+            cursor.execute('BEGIN IMMEDIATE')
+
+            cursor.execute("""
+                SELECT id FROM merged.cards
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM main.cards
+                    WHERE main.cards.date_created = {}
+                )
+                ORDER BY id
+            """.format(merged_date_created))
+            merge_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute("""
+                SELECT COUNT(*) FROM merged.cards
+            """)
+            skipped = cursor.fetchone()[0] - len(merge_ids)
+
+            # maps the ids of the cards to merge to the ones they get here
+            cursor.execute("""
+                CREATE TEMP TABLE merge_ids (
+                    merged_id integer primary key,
+                    id integer not null
+                )
+            """)
+            cursor.executemany("""
+                INSERT INTO temp.merge_ids (merged_id, id) VALUES (?, ?)
+            """, zip(merge_ids, _allocate_ids(cursor, len(merge_ids))))
+
+            cursor.execute("""
+                INSERT INTO main.cards ({}, due_date)
+                SELECT merge_ids.id, {}, {}
+                FROM temp.merge_ids
+                JOIN merged.cards ON merged.cards.id = merge_ids.merged_id
+            """.format(
+                CARD_COLUMNS,
+                ', '.join(
+                    {
+                        'date_created': merged_date_created,
+                        'date_updated': merged_date_updated,
+                    }.get(column, 'merged.cards.' + column)
+                    for column in Card._fields[1:]
+                ),
+                DUE_DATE_SQL.format(merged_date_updated, 'merged.cards.score')
+            ))
+            cursor.execute("""
+                SELECT merge_ids.id, merged.cards.markers
+                FROM temp.merge_ids
+                JOIN merged.cards ON merged.cards.id = merge_ids.merged_id
+            """)
+            _store_markers(cursor, cursor.fetchall())
+
+            cursor.execute("""
+                DROP TABLE temp.merge_ids
+            """)
+    finally:
         cursor.execute("""
-            INSERT INTO cards VALUES ({})
-        """.format(','.join(list('?' * len(card_obj)))), (card_obj))
-        created_with_id = cursor.lastrowid
+            DETACH DATABASE merged
+        """)
 
-    return created_with_id
+    return len(merge_ids), skipped
 
 
 def update_card(card_obj, update_now=True, db_path=config.get_DB_name()):
@@ -374,51 +1355,85 @@ def update_card(card_obj, update_now=True, db_path=config.get_DB_name()):
     Returns the id of the card that is updated.
     """
 
-    if type(card_obj) is not knards.Card:
+    if not isinstance(card_obj, Card):
         raise ValueError('Input card object must be of type knards.Card')
 
+    return update_cards([card_obj], update_now, db_path)[0]
+
+
+def update_cards(card_objs, update_now=True, db_path=config.get_DB_name()):
+    """Updates a batch of cards in the DB within a single transaction
+
+    Args:
+        card_objs (knards.Card[]): An iterable of objects of type knards.Card
+        update_now (bool): Set the date of the last update (revision) of the
+    cards to now (optional, defaults to True)
+        db_path (str): The path to the DB (optional, defaults to what's defined in
+    config module)
+
+    Raises:
+        ValueError: One of the objects is not of type knards.Card
+
+    Returns:
+        A list of ids of the updated cards
+    """
+
+    card_objs = [card_obj for card_obj in card_objs]
+    for card_obj in card_objs:
+        if not isinstance(card_obj, Card):
+            raise ValueError('Input card object must be of type knards.Card')
+
+    now = datetime.now()
     with util.db_connect(db_path) as connection:
         cursor = connection.cursor()
         if update_now:
-            cursor.execute("""
+            cursor.executemany("""
                 UPDATE cards SET question = ?,
                                 answer = ?,
                                 markers = ?,
                                 series = ?,
                                 pos_in_series = ?,
                                 date_updated = ?,
-                                score = ?
+                                score = ?,
+                                due_date = {}
                             WHERE id = ?
-            """, (
+            """.format(DUE_DATE_SQL.format('?', '?')), [(
                 card_obj.question,
                 card_obj.answer,
                 card_obj.markers,
                 card_obj.series,
                 card_obj.pos_in_series,
-                datetime.now(),
+                now,
+                card_obj.score,
+                now,
                 card_obj.score,
                 card_obj.id
-            ))
+            ) for card_obj in card_objs])
         else:
-            cursor.execute("""
+            cursor.executemany("""
                 UPDATE cards SET question = ?,
                                 answer = ?,
                                 markers = ?,
                                 series = ?,
                                 pos_in_series = ?,
-                                score = ?
+                                score = ?,
+                                due_date = {}
                             WHERE id = ?
-            """, (
+            """.format(DUE_DATE_SQL.format('date_updated', '?')), [(
                 card_obj.question,
                 card_obj.answer,
                 card_obj.markers,
                 card_obj.series,
                 card_obj.pos_in_series,
                 card_obj.score,
+                card_obj.score,
                 card_obj.id
-            ))
+            ) for card_obj in card_objs])
+        _store_markers(cursor, [
+            (card_obj.id, card_obj.markers) for card_obj in card_objs
+        ])
 
-    return card_obj.id
+    return [card_obj.id for card_obj in card_objs]
 
 
 def delete_card(
@@ -449,16 +1464,12 @@ def delete_card(
     assert isinstance(db_path, str) and len(db_path) > 0
 
     if card_id:
-        if not isinstance(get_card_by_id(card_id), knards.Card):
+        if not isinstance(get_card_by_id(card_id, db_path), Card):
             raise exceptions.CardNotFound(
                 'Card #{} does not exist in the DB.'.format(card_id)
             )
 
-        with util.db_connect(db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute("""
-                DELETE FROM cards WHERE id = {}
-            """.format(card_id))
+        delete_cards([int(card_id)], db_path)
 
         return card_id
 
@@ -466,17 +1477,22 @@ def delete_card(
         if not isinstance(markers, list):
             raise TypeError('\'markers\' argument must be a list.')
 
-        card_set = get_card_set(include_markers=markers)
-        assert len(card_set) != len(get_card_set())
+        where_clause, params = _card_set_conditions(include_markers=markers)
 
         with util.db_connect(db_path) as connection:
             cursor = connection.cursor()
-            for card in card_set:
-                cursor.execute("""
-                    DELETE FROM cards WHERE id = {}
-                """.format(card.id))
+            cursor.execute("""
+                SELECT id FROM cards {}
+            """.format(where_clause), params)
+            deleted_ids = [row[0] for row in cursor.fetchall()]
+
+            # never wipe out the whole DB by markers
+            cursor.execute("""
+                SELECT COUNT(*) FROM cards
+            """)
+            assert len(deleted_ids) != cursor.fetchone()[0]
 
-        return [card.id for card in card_set]
+        return delete_cards(deleted_ids, db_path)
 
     elif series:
         if not isinstance(series, str):
@@ -485,16 +1501,55 @@ def delete_card(
         with util.db_connect(db_path) as connection:
             cursor = connection.cursor()
             cursor.execute("""
-                SELECT * FROM cards WHERE series = '{}'
-            """.format(series))
-            card_set = cursor.fetchall()
+                SELECT id FROM cards WHERE series = ?
+            """, (series,))
+            deleted_ids = [row[0] for row in cursor.fetchall()]
 
-            card_set_as_objects = []
-            for card in card_set:
-                card_set_as_objects.append(knards.Card(*list(card)))
+        return delete_cards(deleted_ids, db_path)
 
-            cursor.execute("""
-                DELETE FROM cards WHERE series = '{}'
-            """.format(series))
 
-        return [card.id for card in card_set_as_objects]
+def delete_cards(card_ids, db_path=config.get_DB_name()):
+    """Deletes a batch of cards from the DB within a single transaction
+
+    Args:
+        card_ids (int[]): An iterable of ids of the cards that are to be deleted
+        db_path (str): The path to the DB (optional, defaults to what's defined in
+    config module)
+
+    Raises:
+        TypeError: One of the ids is not an integer number
+
+    Returns:
+        A list of ids of the deleted cards, ones that didn't exist in the DB are
+    left out
+    """
+
+    card_ids = [card_id for card_id in card_ids]
+    for card_id in card_ids:
+        if not isinstance(card_id, int):
+            raise TypeError('Card ids must be integer numbers.')
+
+    with util.db_connect(db_path) as connection:
+        cursor = connection.cursor()
+
+        # sift out the ids that aren't in the DB (in chunks, to stay within the
+        # limit of the number of parameters in a single query)
+        existing_ids = set()
+        for start in range(0, len(card_ids), 500):
+            chunk = card_ids[start:start + 500]
+            cursor.execute("""
+                SELECT id FROM cards WHERE id IN ({})
+            """.format(','.join('?' * len(chunk))), chunk)
+            existing_ids.update(row[0] for row in cursor.fetchall())
+        deleted_ids = [
+            card_id for card_id in dict.fromkeys(card_ids)
+            if card_id in existing_ids
+        ]
+
+        cursor.executemany("""
+            DELETE FROM cards WHERE id = ?
+        """, [(card_id,) for card_id in deleted_ids])
+        _delete_markers(cursor, deleted_ids)
+        _free_ids(cursor, deleted_ids)
+
+    return deleted_ids
@@ -0,0 +1,288 @@
+"""
+The card objects and the containers of them. Kept apart from the commands and
+the api so that importing them stays cheap: nothing but the standard library is
+loaded along.
+"""
+
+from array import array
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+# timestamps are stored as integer numbers of microseconds since the epoch
+# (naive, just like the datetime objects of the cards)
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_timestamp(date):
+    """Returns the integer timestamp of the datetime object, None for None"""
+    if date is None:
+        return None
+    return (date - EPOCH) // timedelta(microseconds=1)
+
+
+def from_timestamp(timestamp):
+    """Returns the datetime object of the integer timestamp, None for None. Text
+    timestamps stored by older versions of knards are parsed as such."""
+    if timestamp is None:
+        return None
+    try:
+        return EPOCH + timedelta(microseconds=int(timestamp))
+    except ValueError:
+        if isinstance(timestamp, bytes):
+            timestamp = timestamp.decode()
+        # str() of a datetime object (the microseconds are left out when
+        # there are none) or of a date object, which is how sqlite3 stored them
+        for date_format in (
+            '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d'
+        ):
+            try:
+                return datetime.strptime(timestamp, date_format)
+            except ValueError:
+                pass
+        raise ValueError('Bad timestamp: {}'.format(timestamp))
+
+
+# card object blueprint
+Card = namedtuple(
+    'Card',
+    [
+      'id',
+      'pos_in_series',
+      'question',
+      'answer',
+      'markers',
+      'series',
+      'date_created',
+      'date_updated',
+      'score'
+    ]
+)
+
+# card object defaults
+Card.__new__.__defaults__ = (
+    None,
+    0,
+    'Here, type in the question text for the new card.',
+    'Here, type in the answer text for the new card.',
+    '',
+    None,
+    datetime.now(),
+    None,
+    0
+)
+
+
+class LazyCard(Card):
+    """
+    A card object that holds everything but the question and answer texts,
+    those are read on first access by the texts_loader function it's created
+    with (see api.iter_card_set). Compares, iterates and unpacks just like the
+    Card object with the same data; _replace() returns an actual Card object.
+    """
+
+    def __new__(cls, *args, texts_loader=None, **kwargs):
+        card_obj = super().__new__(cls, *args, **kwargs)
+        card_obj._texts_loader = texts_loader
+        return card_obj
+
+    @property
+    def texts_loaded(self):
+        return '_texts' in self.__dict__ \
+            or self.__dict__.get('_texts_loader') is None
+
+    def _fill_texts(self, question, answer):
+        self.__dict__['_texts'] = (question, answer)
+
+    def _get_texts(self):
+        if not self.texts_loaded:
+            self._fill_texts(*self._texts_loader([self.id])[self.id])
+        return self.__dict__.get(
+            '_texts',
+            (tuple.__getitem__(self, 2), tuple.__getitem__(self, 3))
+        )
+
+    @property
+    def question(self):
+        return self._get_texts()[0]
+
+    @property
+    def answer(self):
+        return self._get_texts()[1]
+
+    def __iter__(self):
+        question, answer = self._get_texts()
+        yield from tuple.__getitem__(self, slice(0, 2))
+        yield question
+        yield answer
+        yield from tuple.__getitem__(self, slice(4, None))
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    def __eq__(self, other):
+        return tuple(self) == other
+
+    def __ne__(self, other):
+        return tuple(self) != other
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return 'Lazy' + repr(Card._make(self))
+
+    def _replace(self, **kwargs):
+        return Card._make(self)._replace(**kwargs)
+
+
+class CardSet:
+    """
+    A columnar container of card objects. Ids, positions in series, scores and
+    dates are stored in arrays of 64-bit integers (dates as microseconds since
+    the epoch), markers, series and texts in lists; Card objects are only
+    created upon iteration or indexing, so a large set takes a fraction of the
+    memory of a list of them. LazyCard objects put in with their texts not read
+    yet come out as LazyCard objects as well.
+    """
+
+    # None is stored as this value in the integer columns
+    NONE = -2 ** 63
+
+    def __init__(self, card_objs=[]):
+        self.ids = array('q')
+        self.positions = array('q')
+        self.scores = array('q')
+        self.dates_created = array('q')
+        self.dates_updated = array('q')
+        self.markers = []
+        self.series = []
+        # None stands for texts that are yet to be read by the texts loader
+        self.questions = []
+        self.answers = []
+        self._texts_loader = None
+
+        self.extend(card_objs)
+
+    @classmethod
+    def from_rows(cls, rows, texts_loader=None):
+        """
+        Builds the set out of DB rows of the fields of Card objects, with the
+        dates read as they're stored (see to_timestamp), so that no
+        datetime objects are created until the cards are. With texts_loader,
+        the texts of the rows are to be read by it.
+        """
+        card_set = cls()
+        card_set._texts_loader = texts_loader
+        for row in rows:
+            card_set._append_row(
+                *row[:2],
+                *(row[2:4] if texts_loader is None else (None, None)),
+                *row[4:]
+            )
+        return card_set
+
+    @classmethod
+    def to_int(cls, value):
+        if value is None:
+            return cls.NONE
+        return int(value)
+
+    @classmethod
+    def from_int(cls, value):
+        if value == cls.NONE:
+            return None
+        return value
+
+    @classmethod
+    def to_timestamp(cls, date):
+        if isinstance(date, datetime):
+            date = to_timestamp(date)
+        elif isinstance(date, str):
+            date = to_timestamp(from_timestamp(date))
+        return cls.to_int(date)
+
+    @classmethod
+    def from_timestamp(cls, timestamp):
+        if timestamp == cls.NONE:
+            return None
+        return from_timestamp(timestamp)
+
+    def _append_row(
+        self,
+        id,
+        pos_in_series,
+        question,
+        answer,
+        markers,
+        series,
+        date_created,
+        date_updated,
+        score
+    ):
+        self.ids.append(self.to_int(id))
+        self.positions.append(self.to_int(pos_in_series))
+        self.scores.append(self.to_int(score))
+        self.dates_created.append(self.to_timestamp(date_created))
+        self.dates_updated.append(self.to_timestamp(date_updated))
+        self.markers.append(markers)
+        self.series.append(series)
+        self.questions.append(question)
+        self.answers.append(answer)
+
+    def append(self, card_obj):
+        # the texts of a lazy card stay unread, as long as all of them are read
+        # by the same loader
+        texts = (None, None)
+        if not isinstance(card_obj, LazyCard) or card_obj.texts_loaded \
+                or self._texts_loader not in (None, card_obj._texts_loader):
+            texts = (card_obj.question, card_obj.answer)
+        else:
+            self._texts_loader = card_obj._texts_loader
+
+        self._append_row(
+            card_obj.id,
+            card_obj.pos_in_series,
+            *texts,
+            card_obj.markers,
+            card_obj.series,
+            card_obj.date_created,
+            card_obj.date_updated,
+            card_obj.score
+        )
+
+    def extend(self, card_objs):
+        for card_obj in card_objs:
+            self.append(card_obj)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            card_set = CardSet()
+            for column in (
+                'ids', 'positions', 'scores', 'dates_created',
+                'dates_updated', 'markers', 'series', 'questions', 'answers'
+            ):
+                setattr(card_set, column, getattr(self, column)[index])
+            card_set._texts_loader = self._texts_loader
+            return card_set
+
+        fields = (
+            self.from_int(self.ids[index]),
+            self.from_int(self.positions[index]),
+            self.questions[index],
+            self.answers[index],
+            self.markers[index],
+            self.series[index],
+            self.from_timestamp(self.dates_created[index]),
+            self.from_timestamp(self.dates_updated[index]),
+            self.from_int(self.scores[index]),
+        )
+        if fields[2] is None and self._texts_loader is not None:
+            return LazyCard(*fields, texts_loader=self._texts_loader)
+        return Card(*fields)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
@@ -7,6 +7,20 @@ DB = HOME + '/.local/bin/knards.db'
 # DB = 'knards.db'
 BACKUP_PATH = HOME + '/.local/bin/knards_backups/'
 # BACKUP_PATH = './knards_backups/'
+# PRAGMAs applied to every DB connection upon connecting
+DB_PRAGMAS = {
+    'cache_size': -16000,  # in KiB
+    'temp_store': 'MEMORY',
+    # 'journal_mode': 'WAL',
+}
+# the number of rows read from the DB at a time when streaming cards
+FETCH_CHUNK_SIZE = 500
+# the file every SQL statement executed is appended to as a line of JSON, None
+# to not log them (see also the --sql-log option of kn)
+SQL_LOG = None
+# sqlite reports the progress of a statement every this number of its VM steps,
+# SQL statements are timed by it
+SQL_PROGRESS_STEPS = 100
 TAGS_GROUP_1 = [
     'türkçe',
     'english',
@@ -75,6 +89,18 @@ TAGS_ONLY_REVISE = [
 def get_DB_name():
     return DB
 
+def get_DB_pragmas():
+    return DB_PRAGMAS
+
+def get_fetch_chunk_size():
+    return FETCH_CHUNK_SIZE
+
+def get_SQL_log():
+    return SQL_LOG
+
+def get_SQL_progress_steps():
+    return SQL_PROGRESS_STEPS
+
 def get_backup_path():
     return BACKUP_PATH
 
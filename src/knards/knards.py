@@ -1,49 +1,71 @@
 #!python3
 
 import click
-from datetime import datetime
-from collections import abc, namedtuple
+from datetime import datetime, time
+from collections import abc
 import os
 import re
-from shutil import copyfile
 import sys
-import sqlite3
-
-from knards import api, msg, util, exceptions, config
-
-# card object blueprint
-Card = namedtuple(
-    'Card',
-    [
-      'id',
-      'pos_in_series',
-      'question',
-      'answer',
-      'markers',
-      'series',
-      'date_created',
-      'date_updated',
-      'score'
-    ]
-)
-
-# card object defaults
-Card.__new__.__defaults__ = (
-    None,
-    0,
-    'Here, type in the question text for the new card.',
-    'Here, type in the answer text for the new card.',
-    '',
-    None,
-    datetime.now(),
-    None,
-    0
-)
+
+# the api and util modules (and the sqlite3, readchar etc. they pull in) are
+# only imported by the subcommands that use them, so that "kn --help" and the
+# like start fast
+from knards import msg, exceptions, config
+# re-exported: the card objects were defined here before they moved to
+# knards.card, knards.Card etc. keep working
+from knards.card import Card, LazyCard, CardSet
+from knards.output import OUTPUT_FORMATS, write_records
+
+STATUS_FIELDS = ('total', 'revised_today', 'revisable')
+RECOMMENDATION_FIELDS = ('action', 'group', 'tags')
+
+
+def _db_disconnect():
+    # util is only loaded if the subcommand has worked with the DB at all
+    if 'knards.util' in sys.modules:
+        sys.modules['knards.util'].db_disconnect()
 
 
 @click.group()
-def main():
-    pass
+@click.option(
+    '--profile', 'profile_path', type=click.Path(dir_okay=False),
+    envvar='KNARDS_PROFILE',
+    help='Run the subcommand under cProfile and write the stats to this file; \
+implies --timings'
+)
+@click.option(
+    '--timings', is_flag=True, envvar='KNARDS_TIMINGS',
+    help='Print the time taken by each api call and the number of SQL \
+statements upon exit'
+)
+@click.option(
+    '--sql-log', 'sql_log_path', type=click.Path(dir_okay=False),
+    envvar='KNARDS_SQL_LOG',
+    help='Append every SQL statement executed, along with the time it took, \
+to this file as a line of JSON'
+)
+@click.pass_context
+def main(ctx, profile_path, timings, sql_log_path):
+    if sql_log_path:
+        config.SQL_LOG = sql_log_path
+
+    if profile_path or timings:
+        from knards import profiling
+
+        def report():
+            profiling.stop_profiler(profile_path)
+            profiling.stop_timer()
+            click.echo(profiling.summary(), err=True)
+
+        # the callbacks are called in the reverse order, the report goes
+        # after the DB connections are closed
+        ctx.call_on_close(report)
+        profiling.start_timer()
+        if profile_path:
+            profiling.start_profiler()
+
+    # all of the DB connections are reused until the subcommand is done
+    ctx.call_on_close(_db_disconnect)
 
 
 @main.command()
@@ -52,10 +74,35 @@ def bootstrap_db():
     Initialize the DB.
     Launch this if you haven't got the file with DB (see config.py to set its name)
     """
+    from knards import api
+
     if not api.bootstrap_db():
         sys.exit(1)
 
 
+@main.command()
+def upgrade_db():
+    """
+    Upgrade the DB created by an older version of knards.
+    Launch this once after updating knards, it's safe to run it again.
+    """
+    from knards import api
+
+    try:
+        applied = api.upgrade_db(config.get_DB_name())
+    except exceptions.DBFileNotFound as e:
+        click.secho(e.args[0], fg='red', bold=True)
+        sys.exit(5)
+
+    if not applied:
+        click.secho(
+            msg.UPGRADE_DB_UP_TO_DATE.format(config.get_DB_name()),
+            fg='green', bold=True
+        )
+    for step in applied:
+        click.secho(step, fg='green', bold=True)
+
+
 @main.command()
 @click.option(
     '--qf/--af',
@@ -88,6 +135,7 @@ def new(qf, copy_last, copy_from_id, markers):
     card's text, generates an object of type knards.Card and feeds it to the
     create_card()
     """
+    from knards import api, util
 
     if markers is not None:
         markers = markers.split(',')
@@ -249,6 +297,69 @@ def new(qf, copy_last, copy_from_id, markers):
             )
 
 
+def _parse_fields(fields, available, output_format):
+    # the --fields option, which only goes with the machine-readable formats;
+    # returns None for the text one
+    if output_format == 'text':
+        if fields is not None:
+            raise click.BadParameter(
+                'only applies to --format={}.'.format(
+                    '|'.join(OUTPUT_FORMATS)
+                ),
+                param_hint='--fields'
+            )
+        return None
+
+    if fields is None:
+        return [field for field in available]
+    fields = [field.strip() for field in fields.split(',') if field.strip()]
+    for field in fields:
+        if field not in available:
+            raise click.BadParameter(
+                '{} is not one of: {}.'.format(field, ', '.join(available)),
+                param_hint='--fields'
+            )
+    return fields
+
+
+def _write_to_stdout(write):
+    # calls write() with stdout; whatever reads the output (e.g. head) may not
+    # need all of it, then stdout is pointed to /dev/null so that flushing it
+    # upon exit doesn't fail again
+    stdout = click.get_text_stream('stdout')
+    try:
+        write(stdout)
+        stdout.flush()
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), stdout.fileno())
+
+
+def _render_card_list(card_set, show_question, show_answer):
+    # yields the text of the list card by card, so that it can be output while
+    # the rest of the cards are still being read
+    for card in card_set:
+        if card.date_updated is not None:
+            date_updated = card.date_updated.strftime('%d %b %Y')
+        else:
+            date_updated = 'Never'
+        parts = [msg.CARD_LIST_TEMPLATE.format(
+            card.id,
+            card.markers,
+            card.pos_in_series,
+            card.series,
+            card.date_created.strftime('%d %b %Y'),
+            date_updated,
+            card.score,
+        )]
+        if show_question:
+            parts.append('\n{}\n'.format(card.question))
+            if show_answer:
+                parts.append('{}\n'.format(msg.DIVIDER_LINE))
+        if show_answer:
+            parts.append('\n{}\n'.format(card.answer))
+        yield ''.join(parts)
+
+
 @main.command()
 @click.option(
     '--q/--no-q',
@@ -270,10 +381,66 @@ have. Examples: --inc=python; --inc="english,vocabulary"'
     help='A list of markers none of which each card that is to be revised must \
 have. Examples: --exc=python; --exc="english,vocabulary"'
 )
-def list(q, a, include_markers, exclude_markers):
+@click.option(
+    '--editor', 'output', flag_value='editor',
+    help='Open the list in the editor (default)'
+)
+@click.option(
+    '--stdout', 'output', flag_value='stdout',
+    help='Write the list to stdout as the cards are read from the DB'
+)
+@click.option(
+    '--pager', 'output', flag_value='pager',
+    help='Page through the list with $PAGER as the cards are read from the DB'
+)
+@click.option(
+    '--format', 'output_format', default='text',
+    type=click.Choice(('text',) + OUTPUT_FORMATS),
+    help='Write the cards to stdout as a JSON array, JSON lines or CSV rather \
+than as text'
+)
+@click.option(
+    '--fields', type=str,
+    help='A list of the fields of the cards to output with --format. Example: \
+--fields="id,markers,score"'
+)
+def list(
+    q, a, include_markers, exclude_markers, output, output_format, fields
+):
     """
-    Output a set of cards in the set up editor.
+    Output a set of cards in the set up editor, to stdout or in the pager.
     """
+    from knards import api, util
+
+    # --format always writes to stdout; none of the output options given
+    # means the editor
+    if output is not None and output_format != 'text':
+        raise click.UsageError(
+            '--editor, --stdout and --pager don\'t go with --format.'
+        )
+    if output is None:
+        output = 'editor'
+
+    if fields is not None:
+        for field, shown, option in (
+            ('question', q, '--no-q'),
+            ('answer', a, '--no-a'),
+        ):
+            if not shown and field in [
+                field.strip() for field in fields.split(',')
+            ]:
+                raise click.UsageError(
+                    '--fields can\'t have {} along with {}.'.format(
+                        field, option
+                    )
+                )
+    fields = _parse_fields(fields, Card._fields, output_format)
+    if fields is not None:
+        fields = [
+            field for field in fields
+            if (q or field != 'question') and (a or field != 'answer')
+        ]
+
     if include_markers is not None:
         include_markers = include_markers.split(',')
     else:
@@ -283,39 +450,85 @@ def list(q, a, include_markers, exclude_markers):
     else:
         exclude_markers = []
 
-    # fetch cards from the DB according to the constraints defined by input args
-    card_set = api.get_card_set(
+    # stream cards from the DB according to the constraints defined by input
+    # args
+    card_set = api.iter_card_set(
         show_question=q,
         show_answer=a,
         include_markers=include_markers,
         exclude_markers=exclude_markers,
+        fields=fields,
     )
 
-    # generate list buffer
-    buf = ''
-    for card in card_set:
-        if card.date_updated is not None:
-            date_updated = \
-                card.date_updated.strftime('%d %b %Y')
-        else:
-            date_updated = 'Never'
-        buf += msg.CARD_LIST_TEMPLATE.format(
-            card.id,
-            card.markers,
-            card.pos_in_series,
-            card.series,
-            card.date_created.strftime('%d %b %Y'),
-            date_updated,
-            card.score,
+    if fields is not None:
+        _write_to_stdout(lambda stream: write_records(
+            (card._asdict() for card in card_set),
+            output_format, fields, stream
+        ))
+        return
+
+    chunks = _render_card_list(card_set, q, a)
+    if output == 'stdout':
+        _write_to_stdout(lambda stream: stream.writelines(chunks))
+    elif output == 'pager':
+        click.echo_via_pager(chunks)
+    else:
+        util.open_in_editor(chunks)
+
+
+@main.command()
+@click.argument('query', nargs=-1, required=True)
+@click.option(
+    '--inc', 'include_markers', type=str,
+    help='A list of markers all of which each card that is to be found must \
+have. Examples: --inc=python; --inc="english,vocabulary"'
+)
+@click.option(
+    '--exc', 'exclude_markers', type=str,
+    help='A list of markers none of which each card that is to be found must \
+have. Examples: --exc=python; --exc="english,vocabulary"'
+)
+@click.option(
+    '--limit', type=int, default=20,
+    help='The max number of cards to output, the best matches go first.'
+)
+def search(query, include_markers, exclude_markers, limit):
+    """
+    Find cards by the words in their question and answer texts.
+    A word ending with * matches any word starting with it.
+    """
+    from knards import api
+
+    if include_markers is not None:
+        include_markers = include_markers.split(',')
+    else:
+        include_markers = []
+    if exclude_markers is not None:
+        exclude_markers = exclude_markers.split(',')
+    else:
+        exclude_markers = []
+
+    query = ' '.join(query)
+    found = api.search_cards(
+        query,
+        include_markers=include_markers,
+        exclude_markers=exclude_markers,
+        limit=limit
+    )
+
+    if not found:
+        click.secho(
+            msg.CARDS_BY_QUERY_NOT_FOUND.format(query),
+            fg='red', bold=True
         )
-        if q:
-            buf += '\n{}\n'.format(card.question)
-            if a:
-                buf += '{}\n'.format(msg.DIVIDER_LINE)
-        if a:
-            buf += '\n{}\n'.format(card.answer)
+        sys.exit(1)
 
-    util.open_in_editor(buf)
+    for card, snippet in found:
+        click.echo(msg.CARD_SEARCH_TEMPLATE.format(
+            card.id,
+            card.markers,
+            snippet
+        ))
 
 
 @main.command()
@@ -342,6 +555,9 @@ def edit(card_id):
     6 - card not found in the DB
     7 - user failed to fill in the buffer properly
     """
+    import sqlite3
+    from knards import api, util
+
     # Exit codes:
     # 0: success
     # 1: unknown error
@@ -451,6 +667,8 @@ have. Examples: --m=python; --m="english, vocabulary"'
 )
 def delete(card_id, markers, series):
     """Delete a card/cards from the DB"""
+    import sqlite3
+    from knards import api
 
     # Exit codes:
     # 0: success
@@ -502,6 +720,63 @@ def delete(card_id, markers, series):
         )
 
 
+def _due_in_series(subset):
+    # the cards of the series (by their positions) that are due for revision,
+    # in the order of the series
+    due = []
+    for series_obj_num in sorted(subset):
+        series_obj = subset[series_obj_num]
+        if series_obj.date_updated is None or series_obj.score < (
+            datetime.now().date() - series_obj.date_updated.date()
+        ).days:
+            due.append(series_obj)
+    return due
+
+
+def _revise_in_batches(revision_queue, series_sets, batch_size):
+    # the cards are revised batch_size at a time, the ones that need it the
+    # most go first; the cards of a series go all together in the batch of its
+    # first due card
+    import sqlite3
+    from knards import util
+
+    revised_series = set()
+    while True:
+        card_objs = []
+        series_lengths = {}
+        # the queue is iterated anew for every batch: once a batch has used
+        # it up, the cards pushed back into it afterwards are still to come
+        for card_obj in revision_queue:
+            if not card_obj.series:
+                card_objs.append(card_obj)
+            elif card_obj.series not in revised_series:
+                revised_series.add(card_obj.series)
+                subset = series_sets.get(card_obj.series, {1: card_obj})
+                series_lengths[card_obj.series] = len(subset)
+                card_objs.extend(_due_in_series(subset))
+
+            if len(card_objs) >= batch_size:
+                break
+
+        if not card_objs:
+            return
+
+        try:
+            updated_card_objs = util.ask_batch(card_objs, series_lengths)
+        except (ValueError, sqlite3.OperationalError) as e:
+            # from api.update_cards
+            click.secho(str(e), fg='red', bold=True)
+            updated_card_objs = []
+
+        # the cards that weren't remembered at all are asked again later on
+        for card_obj in updated_card_objs:
+            if card_obj.score == 0 and not card_obj.series:
+                revision_queue.push(card_obj)
+
+        if not click.confirm('Next batch?', default=True):
+            sys.exit(1)
+
+
 @main.command()
 @click.option(
     '--inc', 'include_markers', type=str,
@@ -513,8 +788,15 @@ have. Examples: --inc=python; --inc="english, vocabulary"'
     help='A list of markers none of which each card that is to be revised must \
 have. Examples: --exc=python; --exc="english, vocabulary"'
 )
-def revise(include_markers, exclude_markers):
+@click.option(
+    '--batch', type=click.IntRange(min=1),
+    help='Revise this many cards at a time, all in one editor buffer to answer \
+them and one to grade the answers (a series is always revised as a whole)'
+)
+def revise(include_markers, exclude_markers, batch):
     """Revise a set of cards"""
+    import sqlite3
+    from knards import api, util
 
     # Exit codes:
     # 0: success
@@ -542,10 +824,17 @@ def revise(include_markers, exclude_markers):
     else:
         exclude_markers = []
 
+    # cards that are due by the end of today, in columns; their texts are only
+    # read when they're asked
+    due_by = datetime.combine(datetime.now().date(), time.max)
     try:
         card_set = api.get_card_set(
+            revisable_only=True,
             include_markers=include_markers,
-            exclude_markers=exclude_markers
+            exclude_markers=exclude_markers,
+            due_by=due_by,
+            lazy=True,
+            columnar=True
         )
     except TypeError as e:
         click.secho(e.args[0], fg='red', bold=True)
@@ -557,51 +846,37 @@ def revise(include_markers, exclude_markers):
         click.secho(e.args[0], fg='red', bold=True)
         sys.exit(6)
 
-    # sort the card set
-    never_updated = []
-    updated = []
-    for card in card_set:
-        if not card.date_updated:
-            never_updated.append(card)
-            continue
-        updated.append(card)
-    updated.sort(key=lambda obj: (obj.score, obj.date_updated))
-    never_updated.sort(key=lambda obj: obj.date_created)
-
-    # we want this: first go all cards that were ever revised, then unrevised
-    card_set = never_updated + updated
-
-    # proceed to revising cards
-    while card_set:
-        card_obj = card_set.pop(0)
-
+    # all of the series the cards belong to are read in one go
+    try:
+        series_sets = api.get_series_sets(
+            series for series in card_set.series if series
+        )
+    except (
+        TypeError,
+        sqlite3.OperationalError,
+        exceptions.DBFileNotFound
+    ):
+        series_sets = {}
+    revised_series = set()
+
+    # proceed to revising cards, the ones that need it the most go first
+    revision_queue = util.RevisionQueue(card_set, due_by)
+    if batch:
+        _revise_in_batches(revision_queue, series_sets, batch)
+        return
+
+    for card_obj in revision_queue:
         # if the card is part of series, pick out all cards of that series
         if card_obj.series:
-            try:
-                subset = api.get_series_set(card_obj.series)
-                subset_length = len(subset)
-            except (
-                TypeError,
-                sqlite3.OperationalError,
-                exceptions.DBFileNotFound,
-                exceptions.EmptyDB
-            ):
-                subset = {1: card_obj}
-                subset_length = 1
-
-            filtered_subset = {}
-            for series_obj_num in subset:
-                if subset[series_obj_num].date_updated is not None:
-                    if subset[series_obj_num].score < (
-                        datetime.now().date() - subset[series_obj_num].date_updated.date()
-                    ).days:
-                        filtered_subset[series_obj_num] = subset[series_obj_num]
-                else:
-                    filtered_subset[series_obj_num] = subset[series_obj_num]
-
-            while filtered_subset:
-                series_obj = filtered_subset.pop(min(filtered_subset.keys()))
+            # the whole series is revised along with its first due card
+            if card_obj.series in revised_series:
+                continue
+            revised_series.add(card_obj.series)
 
+            subset = series_sets.get(card_obj.series, {1: card_obj})
+            subset_length = len(subset)
+
+            for series_obj in _due_in_series(subset):
                 try:
                     util.ask(series_obj, subset_length)
                 except ValueError as e:
@@ -613,21 +888,18 @@ def revise(include_markers, exclude_markers):
 
         # else, just ask the question
         else:
-            # check if the card is ready to be revised
-            if card_obj.date_updated is not None:
-                if card_obj.score > (
-                    datetime.now().date() - card_obj.date_updated.date()
-                ).days:
-                    continue
-
             try:
-                util.ask(card_obj)
+                card_obj = util.ask(card_obj)
             except ValueError as e:
                 # from api.update_card
-                pass
+                card_obj = None
             except sqlite3.OperationalError as e:
                 # from api.update_card
-                pass
+                card_obj = None
+
+            # the card that wasn't remembered at all is asked again later on
+            if card_obj is not None and card_obj.score == 0:
+                revision_queue.push(card_obj)
 
 
 @main.command()
@@ -641,10 +913,24 @@ have. Examples: --inc=python; --inc="english, vocabulary"'
     help='A list of markers none of which each card that is to be revised must \
 have. Examples: --exc=python; --exc="english, vocabulary"'
 )
-def status(include_markers, exclude_markers):
+@click.option(
+    '--format', 'output_format', default='text',
+    type=click.Choice(('text',) + OUTPUT_FORMATS),
+    help='Output the numbers as a JSON object, a JSON line or CSV'
+)
+@click.option(
+    '--fields', type=str,
+    help='A list of the numbers to output with --format, out of: {}'.format(
+        ', '.join(STATUS_FIELDS)
+    )
+)
+def status(include_markers, exclude_markers, output_format, fields):
     """
     TODO
     """
+    from knards import api
+
+    fields = _parse_fields(fields, STATUS_FIELDS, output_format)
 
     if include_markers:
         include_markers = [
@@ -663,27 +949,24 @@ def status(include_markers, exclude_markers):
     else:
         exclude_markers = []
 
-    total_card_set = api.get_card_set(
-        include_markers=include_markers,
-        exclude_markers=exclude_markers
-    )
-    revised_today_set = api.get_card_set(
-        today=True,
+    summary = api.status_summary(
         include_markers=include_markers,
-        exclude_markers=exclude_markers
-    )
-    more_revisable = api.get_card_set(
-        revisable_only=True,
-        include_markers=include_markers,
-        exclude_markers=exclude_markers
+        exclude_markers=exclude_markers,
+        db_path=config.get_DB_name()
     )
 
+    if fields is not None:
+        _write_to_stdout(lambda stream: write_records(
+            [summary], output_format, fields, stream, single=True
+        ))
+        return
+
     click.secho('There\'re {} cards in the DB file in total.\n\
 You\'ve revised {} cards today.\n\
 There\'re {} more cards ready for revision today.'.format(
-        len(total_card_set),
-        len(revised_today_set),
-        len(more_revisable)
+        summary['total'],
+        summary['revised_today'],
+        summary['revisable']
     ), fg='yellow', bold=True)
 
 
@@ -697,33 +980,16 @@ def merge(db_file):
     """
     TODO
     """
+    from shutil import copyfile
+    import sqlite3
+    from knards import api
 
-    # check if merge file exists and is a proper DB file
-    try:
-        with util.db_connect(db_file) as connection:
-            cursor = connection.cursor()
-            cursor.execute("""
-                SELECT * FROM cards
-            """)
-            card_set = cursor.fetchall()
-
-        card_set_as_objects = []
-        for card in card_set:
-            card_set_as_objects.append(Card(*card))
-
-        full_card_set = api.get_card_set()
-        dates = []
-        for card in full_card_set:
-            dates.append(card.date_created)
-
-    except exceptions.DBFileNotFound as e:
-        print(e.args[0])
-        sys.exit(1)
-    except sqlite3.DatabaseError:
-        print('{} is not a proper DB file to merge.'.format(db_file))
+    if not os.path.exists(db_file):
+        print('DB file ({}) does not exist.'.format(db_file))
         sys.exit(1)
 
-    # backup both DB files
+    # backup both DB files, before anything connects to them: connecting to
+    # the default DB file brings it up to date (see migrations)
     try:
         copyfile(
             config.get_DB_name(),
@@ -752,16 +1018,15 @@ def merge(db_file):
         print("Unexpected error:", sys.exc_info())
         sys.exit(1)
 
-    # merge
-    merged = 0
-    skipped = 0
-    for card in card_set_as_objects:
-        if card.date_created in dates:
-            skipped += 1
-            continue
-
-        merged += 1
-        api.create_card(card)
+    # merge, the file to merge is checked to be a proper DB file on the way
+    try:
+        merged, skipped = api.merge_db(db_file)
+    except exceptions.DBFileNotFound as e:
+        print(e.args[0])
+        sys.exit(1)
+    except sqlite3.DatabaseError:
+        print('{} is not a proper DB file to merge.'.format(db_file))
+        sys.exit(1)
 
     if skipped == 0:
         click.secho(
@@ -782,94 +1047,62 @@ def merge(db_file):
         )
 
 @main.command()
-def recommend():
+@click.option(
+    '--format', 'output_format', default='text',
+    type=click.Choice(('text',) + OUTPUT_FORMATS),
+    help='Output the recommendations as a JSON array, JSON lines or CSV'
+)
+@click.option(
+    '--fields', type=str,
+    help='A list of the fields of the recommendations to output with \
+--format, out of: {}'.format(', '.join(RECOMMENDATION_FIELDS))
+)
+def recommend(output_format, fields):
     """
     [WIP] Command to show recommendations.
     """
-    tags_groups_indexes = [i for i, key in enumerate(config.get_tags_list())]
-    tags_groups_names = [key for i, key in enumerate(config.get_tags_list())]
-    tags_groups_total_amounts = []
-    tags_groups_ready_for_revision = []
-
-    for group_name in tags_groups_names:
-        tags_groups_total_amounts.append(len(api.get_card_set(
-            include_markers=[group_name]
-        )))
-        tags_groups_ready_for_revision.append(len(api.get_card_set(
-            revisable_only=True,
-            include_markers=[group_name]
-        )))
+    from knards import api
 
-    group_indexes_to_revise = []
-    group_indexes_to_learn = []
+    fields = _parse_fields(fields, RECOMMENDATION_FIELDS, output_format)
 
-    for index in tags_groups_indexes:
-        if ((tags_groups_total_amounts[index]
-                / (tags_groups_ready_for_revision[index] + 1)) > 2
-                or tags_groups_total_amounts[index] == 0):
-            group_indexes_to_learn.append(index)
-        else:
-            group_indexes_to_revise.append(index)
+    recommendations = api.get_recommendations()
 
-    if len(group_indexes_to_learn) == 0:
+    if fields is not None:
+        _write_to_stdout(lambda stream: write_records(
+            (
+                dict(recommendation, action=action)
+                for action in ('learn', 'revise')
+                for recommendation in recommendations[action]
+            ),
+            output_format, fields, stream
+        ))
+        return
+
+    if len(recommendations['learn']) == 0:
         click.secho(
             'Nothing to learn just yet.\n',
             fg='red', bold=True
         )
     else:
-        for index in group_indexes_to_learn:
-            sorted_by_priority = {}
-            for tag in config.get_tags_list()[tags_groups_names[index]]:
-                if tag in config.get_tags_only_revise_list():
-                    continue
-
-                total = len(api.get_card_set(include_markers=[tag]))
-                if total not in sorted_by_priority:
-                    sorted_by_priority[total] = []
-                sorted_by_priority[total].append(tag)
-
-            what = tags_groups_names[index]
-            tags = sorted_by_priority[
-                min([val for i, val in enumerate(sorted_by_priority)])
-            ]
-
+        for recommendation in recommendations['learn']:
             click.secho(
-                'Learn {}: {}.\n'.format(what, ', '.join(tags)),
+                'Learn {}: {}.\n'.format(
+                    recommendation['group'], ', '.join(recommendation['tags'])
+                ),
                 fg='green', bold=True
             )
 
-    for index in group_indexes_to_revise:
-        sorted_by_priority = {}
-        for tag in config.get_tags_list()[tags_groups_names[index]]:
-            total = api.get_card_set(include_markers=[tag])
-            revisable = api.get_card_set(
-                revisable_only=True,
-                include_markers=[tag]
-            )
-            priority = 0
-            for card in revisable:
-                if card.date_updated:
-                    priority += (datetime.now() - card.date_updated).days
-                else:
-                    priority += (datetime.now() - card.date_created).days
-            if len(total) != 0:
-                priority = round(priority / len(total))
-            if priority not in sorted_by_priority:
-                sorted_by_priority[priority] = []
-            sorted_by_priority[priority].append(tag)
-
-        what = tags_groups_names[index]
-        if sorted_by_priority != {}:
-            tags = ', '.join(sorted_by_priority[
-                max([val for i, val in enumerate(sorted_by_priority)])
-            ])
+    for recommendation in recommendations['revise']:
+        if recommendation['tags']:
             click.secho(
-                'Revise {}: {}.'.format(what, tags),
+                'Revise {}: {}.'.format(
+                    recommendation['group'], ', '.join(recommendation['tags'])
+                ),
                 fg='yellow', bold=True
             )
         else:
             click.secho(
-                'Revise {}: nothing to revise.'.format(what),
+                'Revise {}: nothing to revise.'.format(recommendation['group']),
                 fg='red', bold=True
             )
 
@@ -896,6 +1129,8 @@ def mass_tag_assign(include_markers, exclude_markers, add_marker, remove_marker)
     """
     [WIP] Mass assign of tags.
     """
+    from knards import api
+
     if include_markers is not None:
         include_markers = include_markers.split(',')
     else:
@@ -905,27 +1140,26 @@ def mass_tag_assign(include_markers, exclude_markers, add_marker, remove_marker)
     else:
         exclude_markers = []
 
-    # fetch cards from the DB according to the constraints defined by input args
-    card_set = api.get_card_set(
-        include_markers=include_markers,
-        exclude_markers=exclude_markers
-    )
-
+    # only pick out the cards that are actually affected
     if add_marker is not None:
-        for card in card_set:
-            card = card._replace(markers=card.markers + ' ' + add_marker)
-            api.update_card(card, update_now=False)
+        card_set = api.get_card_set(
+            include_markers=include_markers,
+            exclude_markers=exclude_markers + [add_marker]
+        )
+        api.update_cards([
+            card._replace(markers=card.markers + ' ' + add_marker)
+            for card in card_set
+        ], update_now=False)
 
     if remove_marker is not None:
-        for card in card_set:
-            markers = card.markers
-            i = markers.find(remove_marker)
-            ilen = i + len(remove_marker)
-            if ' ' + remove_marker + ' ' in markers:
-                markers = markers[0:i] + markers[ilen + 1:len(markers)]
-            elif remove_marker in markers and ilen == len(markers):
-                markers = markers[0:i]
-            elif remove_marker in markers and i == 0:
-                markers = markers[ilen + 1:len(markers)]
-            card = card._replace(markers=markers)
-            api.update_card(card, update_now=False)
+        card_set = api.get_card_set(
+            include_markers=include_markers + [remove_marker],
+            exclude_markers=exclude_markers
+        )
+        api.update_cards([
+            card._replace(markers=' '.join(
+                marker for marker in card.markers.split()
+                if marker != remove_marker
+            ))
+            for card in card_set
+        ], update_now=False)
@@ -0,0 +1,308 @@
+"""
+Versioned schema migrations of the DB. The version a DB is at is stored in its
+PRAGMA user_version, every migration brings it one version up and is applied
+within its own transaction. util.db_connect() applies the missing ones upon
+connecting, so DBs created by older versions of knards are upgraded in place.
+
+Migrations are only ever appended to MIGRATIONS, never changed or removed.
+"""
+
+import sqlite3
+
+from knards import util
+
+# format in a timestamp column: the timestamps DBs before version 8 stored as
+# text are converted to integer numbers exactly, including the microseconds;
+# the ones that are already integer numbers are kept as they are
+TIMESTAMP_FROM_TEXT_SQL = """
+    CASE typeof({0}) WHEN 'text' THEN
+        strftime('%s', {0}) * 1000000
+        + CAST(substr({0} || '000000', 21, 6) AS INTEGER)
+    ELSE {0} END
+"""
+
+def _create_markers_index(cursor):
+    # markers used to only live in the space separated "markers" column
+    if _table_exists(cursor, 'card_markers'):
+        return
+
+    # "markers" holds every distinct marker, "card_markers" maps cards to their
+    # markers; the "markers" column of the "cards" table stays the source of
+    # truth, these two are kept in sync with it by every api method that
+    # writes cards
+    cursor.execute("""
+        CREATE TABLE markers (
+            id integer primary key,
+            name text unique not null
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE card_markers (
+            marker_id integer not null,
+            card_id integer not null,
+            primary key (marker_id, card_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE INDEX card_markers_card_id ON card_markers (card_id, marker_id)
+    """)
+    cursor.execute("""
+        SELECT id, markers FROM cards
+    """)
+    card_markers = [
+        (card_id, set((markers or '').split()))
+        for card_id, markers in cursor.fetchall()
+    ]
+    cursor.executemany("""
+        INSERT OR IGNORE INTO markers (name) VALUES (?)
+    """, [(name,) for card_id, names in card_markers for name in names])
+    cursor.executemany("""
+        INSERT INTO card_markers (marker_id, card_id)
+        SELECT id, ? FROM markers WHERE name = ?
+    """, [
+        (card_id, name) for card_id, names in card_markers for name in names
+    ])
+
+
+def _add_due_date(cursor):
+    # cards used to have their due date calculated upon every request
+    cursor.execute("""
+        PRAGMA table_info(cards)
+    """)
+    if 'due_date' in [column[1] for column in cursor.fetchall()]:
+        return
+
+    cursor.execute("""
+        ALTER TABLE cards ADD COLUMN due_date timestamp
+    """)
+    cursor.execute("""
+        UPDATE cards SET due_date = strftime(
+            '%Y-%m-%d %H:%M:%f', date_updated, '+' || score || ' days'
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX cards_due_date ON cards (due_date)
+    """)
+
+
+def _collect_free_ids(cursor):
+    # ids of deleted cards used to be looked up upon every card creation
+    if _table_exists(cursor, 'free_ids'):
+        return
+
+    # ids freed up by deleting cards are reused by the new cards before any ids
+    # past the max one
+    cursor.execute("""
+        CREATE TABLE free_ids (
+            id integer primary key
+        )
+    """)
+    cursor.execute("""
+        SELECT id FROM cards ORDER BY id
+    """)
+    free_ids = []
+    expected_id = 1
+    for row in cursor.fetchall():
+        free_ids.extend(range(expected_id, row[0]))
+        expected_id = row[0] + 1
+    cursor.executemany("""
+        INSERT INTO free_ids (id) VALUES (?)
+    """, [(free_id,) for free_id in free_ids])
+
+
+def _index_date_created(cursor):
+    # merging and picking the last card look cards up by the date of creation
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS cards_date_created ON cards (date_created)
+    """)
+
+
+def _index_series(cursor):
+    # series used to be looked up by a full scan of the cards
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS cards_series ON cards (series)
+    """)
+
+
+def _create_fts_index(cursor):
+    # cards used to be only searchable by markers
+    if _table_exists(cursor, 'cards_fts'):
+        return
+    # sqlite may be built without FTS5, the DB is left without the index then
+    # and api.search_cards() falls back to scanning the texts
+    if not fts5_available(cursor):
+        return
+
+    # "cards_fts" is an external content FTS5 table, it doesn't store the
+    # texts but reads them from the "cards" table; the triggers keep it in sync
+    # with every write to "cards"
+    cursor.execute("""
+        CREATE VIRTUAL TABLE cards_fts USING fts5 (
+            question,
+            answer,
+            content = 'cards',
+            content_rowid = 'id'
+        )
+    """)
+    _create_fts_triggers(cursor)
+    cursor.execute("""
+        INSERT INTO cards_fts (cards_fts) VALUES ('rebuild')
+    """)
+
+
+def _create_fts_triggers(cursor):
+    cursor.execute("""
+        CREATE TRIGGER cards_fts_insert AFTER INSERT ON cards BEGIN
+            INSERT INTO cards_fts (rowid, question, answer)
+            VALUES (new.id, new.question, new.answer);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER cards_fts_delete AFTER DELETE ON cards BEGIN
+            INSERT INTO cards_fts (cards_fts, rowid, question, answer)
+            VALUES ('delete', old.id, old.question, old.answer);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER cards_fts_update AFTER UPDATE OF question, answer
+        ON cards BEGIN
+            INSERT INTO cards_fts (cards_fts, rowid, question, answer)
+            VALUES ('delete', old.id, old.question, old.answer);
+            INSERT INTO cards_fts (rowid, question, answer)
+            VALUES (new.id, new.question, new.answer);
+        END
+    """)
+
+
+def _index_date_updated(cursor):
+    # cards revised today are looked up by the date of the last revision
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS cards_date_updated ON cards (date_updated)
+    """)
+
+
+def _store_timestamps_as_integers(cursor):
+    # timestamps used to be stored as text and parsed upon every read; the
+    # table is rebuilt so that the dates get the integer type the converter is
+    # registered for, and the texts go last so that reading the rest of a row
+    # doesn't touch the pages the long texts spill over to
+    cursor.execute("""
+        CREATE TABLE cards_rebuilt (
+            id integer primary key,
+            pos_in_series number,
+            markers text,
+            series text,
+            date_created {0},
+            date_updated {0},
+            score number,
+            due_date {0},
+            question text,
+            answer text
+        )
+    """.format(util.TIMESTAMP_TYPE))
+
+    cursor.execute("""
+        INSERT INTO cards_rebuilt (
+            id, pos_in_series, markers, series, date_created, date_updated,
+            score, question, answer
+        )
+        SELECT
+            id, pos_in_series, markers, series, {}, {}, score, question, answer
+        FROM cards
+    """.format(
+        TIMESTAMP_FROM_TEXT_SQL.format('date_created'),
+        TIMESTAMP_FROM_TEXT_SQL.format('date_updated')
+    ))
+    cursor.execute("""
+        UPDATE cards_rebuilt SET due_date = date_updated + score * 86400000000
+    """)
+
+    # the indexes and the triggers go along with the old table
+    cursor.execute("""
+        DROP TABLE cards
+    """)
+    cursor.execute("""
+        ALTER TABLE cards_rebuilt RENAME TO cards
+    """)
+    for column in ('due_date', 'date_created', 'series', 'date_updated'):
+        cursor.execute("""
+            CREATE INDEX cards_{0} ON cards ({0})
+        """.format(column))
+    if _table_exists(cursor, 'cards_fts'):
+        _create_fts_triggers(cursor)
+
+
+# (description, migration) pairs, the version of the DB after applying a
+# migration is its position in the list starting with 1
+MIGRATIONS = [
+    ('Created the markers index.', _create_markers_index),
+    ('Calculated due dates of all cards.', _add_due_date),
+    ('Collected ids of deleted cards for reuse.', _collect_free_ids),
+    ('Indexed cards by the date of creation.', _index_date_created),
+    ('Indexed cards by series.', _index_series),
+    ('Built the full-text search index.', _create_fts_index),
+    ('Indexed cards by the date of the last revision.', _index_date_updated),
+    ('Stored dates as integer numbers.', _store_timestamps_as_integers),
+]
+
+
+def _table_exists(cursor, name):
+    cursor.execute("""
+        SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?
+    """, (name,))
+    return cursor.fetchone() is not None
+
+
+def fts5_available(cursor):
+    """Returns whether the sqlite knards runs with has the FTS5 extension"""
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE temp.fts5_check USING fts5 (text)
+        """)
+    except sqlite3.OperationalError:
+        return False
+    cursor.execute("""
+        DROP TABLE temp.fts5_check
+    """)
+    return True
+
+
+def get_version(connection):
+    """Returns the schema version the DB is at"""
+    return connection.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(connection):
+    """Applies the migrations the DB is missing, each within its own
+    transaction along with the bump of the version
+
+    Args:
+        connection (sqlite3.Connection): An open connection to the DB
+
+    Returns:
+        A list of descriptions of the applied migrations ([] if the DB was up
+    to date or is not a knards DB at all)
+    """
+
+    applied = []
+
+    if get_version(connection) >= len(MIGRATIONS):
+        return applied
+
+    cursor = connection.cursor()
+    if not _table_exists(cursor, 'cards'):
+        return applied
+
+    for version, (description, migration) in enumerate(MIGRATIONS, 1):
+        with connection:
+            # the lock is taken before checking the version so that another
+            # process can't apply the same migration in the meantime
+            cursor.execute('BEGIN IMMEDIATE')
+            if get_version(connection) >= version:
+                continue
+
+            migration(cursor)
+            cursor.execute('PRAGMA user_version = {}'.format(version))
+            applied.append(description)
+
+    return applied
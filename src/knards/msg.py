@@ -2,11 +2,33 @@
 DIVIDER_LINE = '--------------------------------------------------------------\
 --------------------------------------'
 CARD_LIST_TEMPLATE = '=== #{} | {} | #{} in "{}" | {} | {} | {} ===\n'
+CARD_SEARCH_TEMPLATE = '=== #{} | {} ===\n{}\n'
+# the buffer of kn revise --batch, see util.ask_batch()
+BATCH_CARD_TEMPLATE = '=== {} ===\n{}\n'
+BATCH_ANSWER_LINE = '--- Your answer ---'
+BATCH_CORRECT_ANSWER_LINE = '--- Correct answer ---'
+BATCH_GRADE_LINE = 'Grade: '
+BATCH_ANSWERS_PROMPT = 'Type in your answer to every card under its "{}" \
+line, then save the buffer and close the editor to submit.\n'.format(
+    BATCH_ANSWER_LINE
+)
+BATCH_GRADES_PROMPT = 'Grade every card on its "{}" line with one of the \
+following, then save the buffer and close the editor to submit; the cards left \
+without a grade are not updated:\n\
+3 - I know this well (card\'s score grows to a greater Fibonacci number)\n\
+2 - I\'ve made some minor mistakes (card\'s score becomes a lesser Fibonacci \
+number)\n\
+1 - I had problems with remembering this/I\'ve made critical mistakes (card\'s \
+score becomes equal 1)\n\
+0 - I do not know this at all (card\'s score becomes equal 0)\n'.format(
+    BATCH_GRADE_LINE.strip()
+)
 
 # SUCCESS MESSAGES
 BOOTSTRAP_DB_SUCCESS = '{} was successfully created.'
 NEW_CARD_SUCCESS = 'Card #{} was successfully created.'
 EDIT_CARD_SUCCESS = 'Card #{} was successfully updated.'
+UPGRADE_DB_UP_TO_DATE = '{} is already up to date.'
 
 # FAILURE MESSAGES
 DB_ALREADY_EXISTS = '{} already exists!'
@@ -25,9 +47,12 @@ NEW_CARD_FAILURE = 'Couldn\'t save the card to the DB. Make sure the file \
 with it does exist.'
 EDIT_CARD_FAILURE = 'Couldn\'t save the card to the DB.'
 CARD_BY_ID_NOT_FOUND = 'Card #{} doesn\'t exist in the DB.'
+CARDS_BY_QUERY_NOT_FOUND = 'No cards matching "{}" has been found in the DB.'
 CARDS_BY_MARKERS_NOT_FOUND = 'No cards containing markers "{}" has been found \
 in the DB.'
 
+BATCH_GRADES_INVALID = 'Cards {} weren\'t graded with one of 0, 1, 2 or 3 and \
+were left as they were.'
 RETRY = 'Retry? (press \'y\' to retry or any other key to abort)'
 CLI_ERROR_DONT_CHANGE_MARKERS = 'Don\'t change the structure of the prompt \
 file - first line must look like this: Markers: [here type in markers for the \
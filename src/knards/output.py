@@ -0,0 +1,63 @@
+"""
+The machine-readable output of the subcommands (see their --format option).
+Kept apart from util so that the entry point can build its options out of
+OUTPUT_FORMATS without loading the DB layer; csv and json are only imported
+once something is written.
+"""
+
+from datetime import datetime
+
+# the machine-readable formats the subcommands output their results in
+OUTPUT_FORMATS = ('json', 'jsonl', 'csv')
+
+
+def _output_value(value, output_format):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    # lists (of markers etc.) are space separated in CSV, like the markers of a
+    # card are
+    if output_format == 'csv' and isinstance(value, list):
+        return ' '.join(value)
+    return value
+
+
+def write_records(records, output_format, fields, stream, single=False):
+    """Writes every record to the stream as soon as it comes, so the records
+    are never all in memory at once: "json" is an array of objects, "jsonl" is
+    an object per line, "csv" is a header line and a row per record. Dates are
+    output in ISO format.
+
+    Args:
+        records (dict[]): An iterable of dicts, e.g. card objects' ._asdict()
+        output_format (str): One of OUTPUT_FORMATS
+        fields (str[]): The keys of the records to output, in this order
+        stream: The text stream to write to
+        single (bool): There's only one record, it's output as a JSON object
+    rather than an array of them (optional, defaults to False)
+    """
+
+    import csv
+    import json
+
+    if output_format == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=fields, lineterminator='\n')
+        writer.writeheader()
+
+    count = 0
+    for record in records:
+        row = {
+            field: _output_value(record[field], output_format)
+            for field in fields
+        }
+        if output_format == 'csv':
+            writer.writerow(row)
+        elif output_format == 'jsonl' or single:
+            stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+        else:
+            stream.write(('[\n' if not count else ',\n') + json.dumps(
+                row, ensure_ascii=False
+            ))
+        count += 1
+
+    if output_format == 'json' and not single:
+        stream.write('\n]\n' if count else '[]\n')
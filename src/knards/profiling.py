@@ -0,0 +1,150 @@
+"""
+Instrumentation of the kn subcommands (see the --profile and --timings options
+of the main command). The timer records the wall time of every call of the
+public api methods and counts the SQL statements executed (see
+util.QueryCounter); it's cheap enough to leave on. The profiler runs the whole
+subcommand under cProfile and writes the stats to a file that pstats, snakeviz
+and the like can read.
+"""
+
+import functools
+import inspect
+import time
+
+# api method name -> [number of calls, total seconds]; only the outermost api
+# calls are recorded, so the total adds up to the time spent in the api
+_api_calls = {}
+# the number of the api calls in progress (the items of the generators they
+# return included)
+_depth = 0
+_queries = None
+_started = None
+# the api methods as they were before the timer wrapped them, to be put back
+# once it's stopped
+_originals = {}
+_profiler = None
+
+
+def _record(name, seconds):
+    calls = _api_calls.setdefault(name, [0, 0.0])
+    calls[0] += 1
+    calls[1] += seconds
+
+
+def _timed(name, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        global _depth
+        # the api calls made by another one are a part of its time
+        if _depth:
+            return fn(*args, **kwargs)
+
+        _depth += 1
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            _record(name, time.perf_counter() - start)
+            raise
+        finally:
+            _depth -= 1
+        seconds = time.perf_counter() - start
+
+        # generator functions, and the functions that return generators
+        # (api.iter_card_set() and the like) do most of the work as the items
+        # are produced
+        if inspect.isgenerator(result):
+            return _timed_items(name, result, seconds)
+        _record(name, seconds)
+        return result
+
+    return wrapper
+
+
+def _timed_items(name, items, seconds):
+    # only the time spent producing the items counts, not the time the caller
+    # spends on them in between
+    global _depth
+    try:
+        while True:
+            _depth += 1
+            start = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            finally:
+                _depth -= 1
+                seconds += time.perf_counter() - start
+            yield item
+    finally:
+        _record(name, seconds)
+
+
+def start_timer():
+    """Starts recording the api calls and the SQL statements; the counts of a
+    previous run are reset"""
+    global _queries, _started
+    from knards import api, util
+
+    stop_timer()
+    _api_calls.clear()
+    _queries = util.QueryCounter().start()
+
+    for name, fn in vars(api).items():
+        if not name.startswith('_') and inspect.isfunction(fn) \
+                and fn.__module__ == api.__name__:
+            _originals[(api, name)] = fn
+            setattr(api, name, _timed(name, fn))
+
+    _started = time.perf_counter()
+
+
+def stop_timer():
+    """Stops recording and puts the api methods back the way they were"""
+    if _queries is not None:
+        _queries.stop()
+    for (module, name), fn in _originals.items():
+        setattr(module, name, fn)
+    _originals.clear()
+
+
+def start_profiler():
+    """Starts profiling the current thread with cProfile"""
+    global _profiler
+    import cProfile
+
+    _profiler = cProfile.Profile()
+    _profiler.enable()
+
+
+def stop_profiler(stats_path):
+    """Stops the profiler and writes the stats collected to the file"""
+    global _profiler
+
+    if _profiler is None:
+        return
+    _profiler.disable()
+    _profiler.dump_stats(stats_path)
+    _profiler = None
+
+
+def summary():
+    """Returns the table of the api calls recorded by the timer, the slowest
+    first, along with the number of SQL statements and the total wall time"""
+    lines = ['{:<24}{:>8}{:>12}'.format('api call', 'calls', 'total')]
+    for name, (calls, seconds) in sorted(
+        _api_calls.items(), key=lambda item: -item[1][1]
+    ):
+        lines.append('{:<24}{:>8}{:>10.1f}ms'.format(
+            name, calls, seconds * 1000
+        ))
+    if _queries is not None:
+        lines.append('SQL statements: {} ({:.1f}ms)'.format(
+            _queries.count, _queries.seconds * 1000
+        ))
+    if _started is not None:
+        lines.append('Wall time: {:.1f}ms'.format(
+            (time.perf_counter() - _started) * 1000
+        ))
+    return '\n'.join(lines)
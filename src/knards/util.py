@@ -1,41 +1,207 @@
 import click
-from datetime import datetime
+from datetime import datetime, timedelta
+import heapq
+import itertools
+import json
 import os
 import re
-import readchar
 import sqlite3
-import subprocess
 import sys
-import tempfile
+import threading
+import time
 
-from knards import knards, config, msg, exceptions, api
+from knards import config, msg, exceptions, api, migrations
+from knards.card import CardSet, to_timestamp, from_timestamp
 
 
+# timestamps are stored as integer numbers of microseconds since the epoch (see
+# knards.card.to_timestamp); columns declared as TIMESTAMP_TYPE are converted
+# back to datetime objects upon reading
+TIMESTAMP_TYPE = 'timestamp_us integer'
+
+sqlite3.register_adapter(datetime, to_timestamp)
+sqlite3.register_converter(TIMESTAMP_TYPE.split()[0], from_timestamp)
+
+# connections are kept open and reused by all of the api methods, one per DB
+# file per thread
+_connections = threading.local()
+
+# the QueryCounter objects that are counting at the moment
+_query_counters = []
+
+class QueryCounter:
+  """
+  Counts and times the SQL statements executed on the connections handed out by
+  db_connect() (once connected, setting them up doesn't count) between start()
+  and stop(), or within a with block:
+
+    with util.QueryCounter() as queries:
+      api.status_summary(db_path=db_path)
+    assert queries.count == 1
+
+  Every statement sqlite runs counts, the implicit BEGIN and COMMIT of a
+  transaction and every execution of the statement passed to executemany()
+  included; the statements run by triggers don't. The time of a statement is
+  measured from its start to the last time sqlite reported progress on it (see
+  config.get_SQL_progress_steps()), so the time spent in Python in between
+  fetching its rows doesn't count.
+  """
+  def __init__(self):
+    self.count = 0
+    self.seconds = 0.0
+    self.statements = []
+
+  def start(self):
+    _query_counters.append(self)
+    return self
+
+  def stop(self):
+    # the statements that are still running are done as far as the counter
+    # is concerned
+    for tracer in getattr(_connections, 'tracers', {}).values():
+      tracer.finish()
+    if self in _query_counters:
+      _query_counters.remove(self)
+
+  def __enter__(self):
+    return self.start()
+
+  def __exit__(self, *exc_info):
+    self.stop()
+
+class _StatementTracer:
+  """
+  Installed as the trace callback of a connection, feeds the statements
+  executed on it to the active QueryCounter objects and the SQL log (see
+  config.get_SQL_log()).
+  """
+  def __init__(self, connection, db_path):
+    self.connection = connection
+    self.db_path = db_path
+    self.statement = None
+    self.progress_handler = False
+
+  def __call__(self, statement):
+    self.finish()
+
+    log_path = config.get_SQL_log()
+    if statement.startswith('--') or not (_query_counters or log_path):
+      if self.progress_handler:
+        self.connection.set_progress_handler(None, 0)
+        self.progress_handler = False
+      return
+
+    if not self.progress_handler:
+      self.connection.set_progress_handler(
+        self.progress, config.get_SQL_progress_steps()
+      )
+      self.progress_handler = True
+
+    self.statement = statement
+    self.log_path = log_path
+    self.counters = list(_query_counters)
+    for counter in self.counters:
+      counter.count += 1
+      counter.statements.append(statement)
+    self.started = self.progressed = time.perf_counter()
+
+  def progress(self):
+    self.progressed = time.perf_counter()
+    return 0
+
+  def finish(self):
+    if self.statement is None:
+      return
+
+    seconds = self.progressed - self.started
+    for counter in self.counters:
+      counter.seconds += seconds
+    if self.log_path:
+      with open(self.log_path, 'a') as log:
+        log.write(json.dumps({
+          'date': datetime.now().isoformat(),
+          'db': self.db_path,
+          'sql': ' '.join(self.statement.split()),
+          'ms': round(seconds * 1000, 3),
+        }) + '\n')
+
+    self.statement = None
+
 def db_connect(db_path):
   """
-  Check if the DB file exists and, if yes, connect to it and return the
-  connection handler.
+  Return the connection handler for the DB file. The first request for the file
+  (within the current thread) checks if the file exists and, if yes, connects to
+  it, applies the PRAGMAs set up in config and the missing schema migrations
+  and installs the tracing of the SQL statements (see QueryCounter); the
+  following ones reuse the connection.
   """
+  if not hasattr(_connections, 'by_path'):
+    _connections.by_path = {}
+    _connections.tracers = {}
+
+  key = os.path.abspath(db_path)
+  connection = _connections.by_path.get(key)
+  if connection is not None:
+    return connection
+
   if not os.path.exists(db_path):
     raise exceptions.DBFileNotFound(
       'DB file ({}) does not exist.'.format(db_path)
     )
 
   connection = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+  for pragma, value in config.get_DB_pragmas().items():
+    connection.execute('PRAGMA {} = {}'.format(pragma, value))
+  migrations.migrate(connection)
+  tracer = _StatementTracer(connection, key)
+  connection.set_trace_callback(tracer)
+
+  _connections.by_path[key] = connection
+  _connections.tracers[key] = tracer
   return connection
 
+def db_disconnect(db_path=None):
+  """
+  Close the connection to the DB file opened by db_connect() (within the
+  current thread), or all of them if db_path is not passed in.
+  """
+  if not hasattr(_connections, 'by_path'):
+    return
+
+  if db_path is None:
+    keys = [key for key in _connections.by_path]
+  else:
+    keys = [os.path.abspath(db_path)]
+
+  for key in keys:
+    tracer = _connections.tracers.pop(key, None)
+    if tracer is not None:
+      tracer.finish()
+    connection = _connections.by_path.pop(key, None)
+    if connection is not None:
+      connection.close()
+
 def open_in_editor(buf, editor='nvim'):
   """
   Takes in:
-  1. buf - text contents to be output to the editor, buffer.
+  1. buf - text contents to be output to the editor, buffer; or an iterable of
+  chunks of it, which are written to the file one by one as they come.
   2. editor - editor to use, default is vim; other editor possible on in theory
   and are neither tested nor recommended to use :)
 
   Opens contents of buf in editor and returns what's in the editor's buffer
   upon save & exit (:wq in vim)
   """
+  # only the subcommands that open the editor pay for importing these
+  import subprocess
+  import tempfile
+
+  if isinstance(buf, str):
+    buf = [buf]
+
   with tempfile.NamedTemporaryFile(suffix=".kn") as tf:
-    tf.write(buf.encode('utf-8'))
+    for chunk in buf:
+      tf.write(chunk.encode('utf-8'))
     tf.flush()
     subprocess.call([editor, tf.name])
     tf.seek(0)
@@ -82,6 +248,9 @@ def retry_buffer(retry_count):
   """
   This is the method for the buffer retry functionality.
   """
+  # readchar takes a while to import and is only needed for this prompt
+  import readchar
+
   print(msg.RETRY)
   retry = readchar.readkey()
   if retry != 'y':
@@ -94,28 +263,15 @@ def retry_buffer(retry_count):
 
   return True
 
-def ask(card_obj, series_length=None):
-  """Puts up a text buffer for card revision
-
-  Args:
-    card_obj (knards.Card): An object of type knards.Card
-    series_length (int): If the card is a part of a series, we will also need
-  to know the length of the series
-
-  Raises:
-    TODO
-
-  Returns:
-    TODO
-  """
-
+def _card_title(card_obj, series_length=None):
+  # the line the card is introduced with in the buffers of revision
   if card_obj.date_updated:
     date_updated = card_obj.date_updated.strftime('%d %b %Y')
   else:
     date_updated = 'Never'
 
   if series_length:
-    buffer_title = 'Card #{} | {} | {}/{} in "{}" | {} | {} | {}\n'.format(
+    return 'Card #{} | {} | {}/{} in "{}" | {} | {} | {}'.format(
       card_obj.id,
       card_obj.markers,
       card_obj.pos_in_series,
@@ -126,7 +282,7 @@ def ask(card_obj, series_length=None):
       card_obj.score
     )
   else:
-    buffer_title = 'Card #{} | {} | {} | {} | {}\n'.format(
+    return 'Card #{} | {} | {} | {} | {}'.format(
       card_obj.id,
       card_obj.markers,
       card_obj.date_created.strftime('%d %b %Y'),
@@ -134,6 +290,23 @@ def ask(card_obj, series_length=None):
       card_obj.score
     )
 
+def ask(card_obj, series_length=None):
+  """Puts up a text buffer for card revision
+
+  Args:
+    card_obj (knards.Card): An object of type knards.Card
+    series_length (int): If the card is a part of a series, we will also need
+  to know the length of the series
+
+  Raises:
+    TODO
+
+  Returns:
+    The updated object of type knards.Card, None if the card wasn't updated
+  """
+
+  buffer_title = _card_title(card_obj, series_length) + '\n'
+
   buffer_prompt = buffer_title + '{}\n{}\n{}\n{}'.format(
     msg.DIVIDER_LINE,
     card_obj.question,
@@ -167,11 +340,12 @@ I\'ve made some minor mistakes (card\'s score becomes equal {})\n\
 I had problems with remembering this/I\'ve made critical mistakes \
 (card\'s status becomes equal 1)\n\
 I do not know this at all (card\'s status becomes equal 0)'.format(
-      get_fibonacci_sequence(card_obj.score)[-1],
-      get_fibonacci_sequence(card_obj.score)[-3]
+      grade_score(card_obj.score, 3),
+      grade_score(card_obj.score, 2)
     )
   )
 
+  updated_card_obj = None
   valid = False
   retry_count = 1
   while not valid:
@@ -188,9 +362,10 @@ buffer and leave only one of the offered options (listed underneath the second\
     else:
       card_obj = card_obj._replace(date_updated=datetime.now())
       card_obj = card_obj._replace(
-        score=re.findall(r'\d+', check)[0]
+        score=int(re.findall(r'\d+', check)[0])
       )
       api.update_card(card_obj)
+      updated_card_obj = card_obj
       break
 
     if retry_count > 3:
@@ -204,6 +379,209 @@ buffer and leave only one of the offered options (listed underneath the second\
   if not click.confirm('Next card?', default=True):
     sys.exit(1)
 
+  return updated_card_obj
+
+def grade_score(score, grade):
+  """
+  Return the score a card of the score gets by the grade of its revision: 3 -
+  it's known well, 2 - minor mistakes were made, 1 - there were problems with
+  remembering it, 0 - it's not known at all. Both ask() and ask_batch() score
+  the cards by it.
+  """
+  sequence = get_fibonacci_sequence(score)
+  return (0, 1, sequence[-3], sequence[-1])[grade]
+
+def render_batch(card_objs, series_lengths={}, answers=None):
+  """
+  Takes in:
+  1. card_objs - an iterable of objects of type knards.Card.
+  2. series_lengths - the lengths of the series the cards are parts of, by the
+  names of the series.
+  3. answers - the answers typed in by the user, by card ids (see
+  parse_batch()).
+
+  Returns the buffer of the revision of a batch of cards, as a generator of its
+  chunks (see open_in_editor()): without answers, the one to answer every card
+  in; with them, the one to grade every answer in, next to the correct one.
+  """
+  yield msg.BATCH_ANSWERS_PROMPT if answers is None \
+    else msg.BATCH_GRADES_PROMPT
+
+  for card_obj in card_objs:
+    parts = [
+      '\n',
+      msg.BATCH_CARD_TEMPLATE.format(
+        _card_title(card_obj, series_lengths.get(card_obj.series)),
+        card_obj.question
+      ),
+      msg.BATCH_ANSWER_LINE + '\n',
+    ]
+    if answers is None:
+      parts.append('\n')
+    else:
+      parts.extend([
+        answers.get(card_obj.id, '') + '\n',
+        msg.BATCH_CORRECT_ANSWER_LINE + '\n',
+        card_obj.answer + '\n',
+        msg.BATCH_GRADE_LINE + '\n',
+      ])
+    yield ''.join(parts)
+
+_BATCH_CARD_LINE = re.compile(r'^=== Card #(\d+) \|.* ===$')
+
+def parse_batch(buffer):
+  """
+  Reads the buffer of render_batch() back, in a single pass over its lines.
+
+  Returns a dict of the cards found in the buffer by their ids, each a dict of
+  the 'answer' typed in under the answer line and the 'grade' typed in on the
+  grade line (None if there's no grade line).
+  """
+  cards = {}
+  card = None
+  section = None
+
+  for line in buffer.split('\n'):
+    match = _BATCH_CARD_LINE.match(line)
+    if match:
+      card = cards.setdefault(int(match.group(1)), {
+        'answer': [],
+        'grade': None,
+      })
+      section = None
+    elif card is None:
+      # the prompt at the top of the buffer
+      continue
+    elif line == msg.BATCH_ANSWER_LINE:
+      section = 'answer'
+    elif line == msg.BATCH_CORRECT_ANSWER_LINE:
+      section = 'correct answer'
+    elif section == 'answer':
+      card['answer'].append(line)
+    elif section == 'correct answer' \
+        and line.startswith(msg.BATCH_GRADE_LINE.strip()):
+      # the grade line goes after the correct answer, the last one counts
+      card['grade'] = line[len(msg.BATCH_GRADE_LINE.strip()):].strip()
+
+  for card in cards.values():
+    card['answer'] = '\n'.join(card['answer']).strip('\n')
+  return cards
+
+def ask_batch(card_objs, series_lengths={}):
+  """Puts up two text buffers for the revision of a batch of cards: one to
+  answer all of them in, then one to grade all of the answers in; the grades
+  are stored in one go
+
+  Args:
+    card_objs (knards.Card[]): An iterable of objects of type knards.Card
+    series_lengths (dict): The lengths of the series the cards are parts of, by
+  the names of the series
+
+  Raises:
+    ValueError, sqlite3.OperationalError: From api.update_cards()
+
+  Returns:
+    A list of the updated objects of type knards.Card, the cards that weren't
+  graded are left out
+  """
+
+  card_objs = [card_obj for card_obj in card_objs]
+  # the texts of all of the cards are read in one go
+  api.load_texts(card_objs)
+
+  answers = parse_batch(open_in_editor(
+    render_batch(card_objs, series_lengths)
+  ))
+  grades = parse_batch(open_in_editor(render_batch(
+    card_objs,
+    series_lengths,
+    {card_id: card['answer'] for card_id, card in answers.items()}
+  )))
+
+  now = datetime.now()
+  updated_card_objs = []
+  invalid_ids = []
+  for card_obj in card_objs:
+    grade = grades.get(card_obj.id, {}).get('grade')
+    if not grade:
+      continue
+    if grade not in ('0', '1', '2', '3'):
+      invalid_ids.append(card_obj.id)
+      continue
+    updated_card_objs.append(card_obj._replace(
+      date_updated=now,
+      score=grade_score(card_obj.score, int(grade))
+    ))
+
+  if invalid_ids:
+    click.secho(msg.BATCH_GRADES_INVALID.format(
+      ', '.join('#{}'.format(card_id) for card_id in invalid_ids)
+    ), fg='red', bold=True)
+
+  if updated_card_objs:
+    api.update_cards(updated_card_objs)
+  return updated_card_objs
+
+class RevisionQueue:
+  """
+  The queue of cards to revise, backed by a heap. The cards that were never
+  revised go first (the earliest created first), then the revised ones (the
+  lowest score first, the earliest revised first). Only the cards that are due
+  by the set up moment are yielded, cards can be pushed in while iterating.
+  The cards are kept in a knards.CardSet and the heap is keyed off its columns,
+  card objects are only created once they're popped.
+  """
+
+  def __init__(self, card_set=[], due_by=None):
+    """
+    Takes in:
+    1. card_set - an iterable of objects of type knards.Card, or a
+    knards.CardSet.
+    2. due_by - the moment the cards must be due by to be yielded (datetime,
+    optional, defaults to the moment of each check).
+    """
+    self.due_by = due_by
+    if isinstance(card_set, CardSet):
+      # pushed cards are added to the set, the passed in one stays as it was
+      self._card_set = card_set[:]
+    else:
+      self._card_set = CardSet(card_set)
+    # the counter keeps the order of cards with equal keys stable
+    self._counter = itertools.count()
+    self._heap = [self._entry(index) for index in range(len(self._card_set))]
+    heapq.heapify(self._heap)
+
+  def _entry(self, index):
+    date_updated = self._card_set.dates_updated[index]
+    if date_updated == CardSet.NONE:
+      key = (0, 0, self._card_set.dates_created[index])
+    else:
+      key = (1, self._card_set.scores[index], date_updated)
+    return (key, next(self._counter), index)
+
+  def is_due(self, card_obj):
+    """
+    A card is due if it was never revised or if .score days have passed since
+    its last revision.
+    """
+    if card_obj.date_updated is None:
+      return True
+    return card_obj.date_updated + timedelta(days=int(card_obj.score)) <= \
+      (self.due_by or datetime.now())
+
+  def push(self, card_obj):
+    self._card_set.append(card_obj)
+    heapq.heappush(self._heap, self._entry(len(self._card_set) - 1))
+
+  def __len__(self):
+    return len(self._heap)
+
+  def __iter__(self):
+    while self._heap:
+      card_obj = self._card_set[heapq.heappop(self._heap)[2]]
+      if self.is_due(card_obj):
+        yield card_obj
+
 def get_fibonacci_sequence(target_number):
   """Returns a subset of the Fibonacci numeric sequence up to 'target_number'
   + the next element after that
@@ -1,6 +1,6 @@
 import os
 import pytest
-from knards import api
+from knards import api, util
 
 
 @pytest.fixture()
@@ -12,4 +12,5 @@ def init_db(tmpdir):
   """
   api.bootstrap_db(str(tmpdir) + '/test.db')
   yield str(tmpdir) + '/test.db'
+  util.db_disconnect(str(tmpdir) + '/test.db')
   os.remove(str(tmpdir) + '/test.db')
@@ -5,6 +5,18 @@ import pytest
 from knards import knards, api, util, config
 
 
+def mock_editor(mocker):
+  """
+  The list is passed to the editor in chunks as the cards are read; returns the
+  list the texts passed to the editor are joined into, one per call.
+  """
+  buffers = []
+  mocker.patch(
+    'knards.util.open_in_editor',
+    side_effect=lambda chunks: buffers.append(''.join(chunks))
+  )
+  return buffers
+
 def test_markers_option_is_properly_translated_to_list(mocker):
   """
   1. --inc=python must be translated to ['python']
@@ -17,22 +29,22 @@ def test_markers_option_is_properly_translated_to_list(mocker):
   """
   runner = CliRunner()
   with runner.isolated_filesystem():
-    mocker.patch('knards.api.get_card_set', return_value=False)
+    mocker.patch('knards.api.iter_card_set', return_value=[])
 
     runner.invoke(knards.main, ['list', '--inc', 'python'])
-    assert api.get_card_set.call_args_list[0][1]['include_markers'] == \
+    assert api.iter_card_set.call_args_list[0][1]['include_markers'] == \
       ['python']
 
     runner.invoke(knards.main, ['list', '--inc', 'python,REST API'])
-    assert api.get_card_set.call_args_list[1][1]['include_markers'] == \
+    assert api.iter_card_set.call_args_list[1][1]['include_markers'] == \
       ['python', 'REST API']
 
     runner.invoke(knards.main, ['list', '--exc', 'english'])
-    assert api.get_card_set.call_args_list[2][1]['exclude_markers'] == \
+    assert api.iter_card_set.call_args_list[2][1]['exclude_markers'] == \
       ['english']
 
     runner.invoke(knards.main, ['list', '--exc', 'phrases,english'])
-    assert api.get_card_set.call_args_list[3][1]['exclude_markers'] == \
+    assert api.iter_card_set.call_args_list[3][1]['exclude_markers'] == \
       ['phrases', 'english']
 
 def test_if_q_and_a_are_true_question_and_answer_texts_are_present_in_output(
@@ -53,15 +65,15 @@ def test_if_q_and_a_are_true_question_and_answer_texts_are_present_in_output(
     db_path = os.getcwd() + '/' + config.DB
     api.create_card(card_obj, db_path)
 
-    mocker.patch('knards.util.open_in_editor')
+    buffers = mock_editor(mocker)
 
     runner.invoke(knards.main, ['list'])
-    assert 'question' in util.open_in_editor.call_args_list[0][0][0].lower()
-    assert 'answer' in util.open_in_editor.call_args_list[0][0][0].lower()
+    assert 'question' in buffers[0].lower()
+    assert 'answer' in buffers[0].lower()
 
     runner.invoke(knards.main, ['list', '--q', '--a'])
-    assert 'question' in util.open_in_editor.call_args_list[1][0][0].lower()
-    assert 'answer' in util.open_in_editor.call_args_list[1][0][0].lower()
+    assert 'question' in buffers[1].lower()
+    assert 'answer' in buffers[1].lower()
 
 def test_if_q_and_a_are_false_question_and_answer_texts_are_not_in_output(
   mocker
@@ -81,15 +93,15 @@ def test_if_q_and_a_are_false_question_and_answer_texts_are_not_in_output(
     db_path = os.getcwd() + '/' + config.DB
     api.create_card(card_obj, db_path)
 
-    mocker.patch('knards.util.open_in_editor')
+    buffers = mock_editor(mocker)
 
     runner.invoke(knards.main, ['list', '--no-q'])
-    assert 'question' not in util.open_in_editor.call_args_list[0][0][0].lower()
-    assert 'answer' in util.open_in_editor.call_args_list[0][0][0].lower()
+    assert 'question' not in buffers[0].lower()
+    assert 'answer' in buffers[0].lower()
 
     runner.invoke(knards.main, ['list', '--no-q', '--no-a'])
-    assert 'question' not in util.open_in_editor.call_args_list[1][0][0].lower()
-    assert 'answer' not in util.open_in_editor.call_args_list[1][0][0].lower()
+    assert 'question' not in buffers[1].lower()
+    assert 'answer' not in buffers[1].lower()
 
 def test_if_card_has_date_updated_none_its_swapped_with_never_in_output(
   mocker
@@ -113,10 +125,10 @@ def test_if_card_has_date_updated_none_its_swapped_with_never_in_output(
     api.create_card(card_obj2, db_path)
     api.create_card(card_obj3, db_path)
 
-    mocker.patch('knards.util.open_in_editor')
+    buffers = mock_editor(mocker)
 
     runner.invoke(knards.main, ['list'])
-    assert util.open_in_editor.call_args_list[0][0][0].count('Never') == 2
+    assert buffers[0].count('Never') == 2
 
 def test_resulting_list_is_opened_in_editor_and_then_exit_code_0(mocker):
   """
@@ -134,3 +146,125 @@ def test_resulting_list_is_opened_in_editor_and_then_exit_code_0(mocker):
     result = runner.invoke(knards.main, ['list'])
     assert result.exit_code == 0
     assert util.open_in_editor.call_count == 1
+
+def test_list_is_written_to_stdout(mocker):
+  """
+  With --stdout, the list is written to stdout instead of opening the editor.
+  """
+  mocker.patch('knards.api.iter_card_set', return_value=iter([
+    knards.Card(id=1, question='First question', answer='First answer'),
+    knards.Card(id=2, question='Second question', answer='Second answer'),
+  ]))
+  mocker.patch('knards.util.open_in_editor')
+
+  runner = CliRunner()
+  result = runner.invoke(knards.main, ['list', '--stdout', '--no-a'])
+  assert result.exit_code == 0
+  assert util.open_in_editor.call_count == 0
+  assert '=== #1 |' in result.output
+  assert 'Second question' in result.output
+  assert 'answer' not in result.output
+
+def test_list_is_opened_in_the_editor_by_default(mocker):
+  """
+  Without any of --editor, --stdout and --pager, the list is opened in the
+  editor, same as with --editor.
+  """
+  for args in (['list'], ['list', '--editor']):
+    mocker.patch('knards.api.iter_card_set', return_value=iter([
+      knards.Card(id=1, question='First question'),
+    ]))
+    buffers = mock_editor(mocker)
+
+    runner = CliRunner()
+    result = runner.invoke(knards.main, args)
+    assert result.exit_code == 0
+    assert len(buffers) == 1
+    assert 'First question' in buffers[0]
+    assert result.output == ''
+
+def test_list_is_paged(mocker):
+  """
+  With --pager, the cards are passed to the pager one by one.
+  """
+  mocker.patch('knards.api.iter_card_set', return_value=iter([
+    knards.Card(id=1, question='First question'),
+    knards.Card(id=2, question='Second question'),
+  ]))
+  pages = []
+  mocker.patch(
+    'click.echo_via_pager',
+    side_effect=lambda chunks: pages.extend(chunks)
+  )
+
+  runner = CliRunner()
+  result = runner.invoke(knards.main, ['list', '--pager'])
+  assert result.exit_code == 0
+  assert len(pages) == 2
+  assert 'First question' in pages[0]
+  assert 'Second question' in pages[1]
+
+def test_cards_are_output_in_the_format_with_the_fields(mocker):
+  """
+  With --format, the selected fields of the cards are written to stdout, and
+  only those are read from the DB.
+  """
+  mocker.patch('knards.api.iter_card_set', return_value=iter([
+    knards.Card(id=1, markers='python', score=3),
+    knards.Card(id=2, markers='english', score=0),
+  ]))
+
+  runner = CliRunner()
+  result = runner.invoke(knards.main, [
+    'list', '--format', 'csv', '--fields', 'id,score'
+  ])
+  assert result.exit_code == 0
+  assert result.output == 'id,score\n1,3\n2,0\n'
+  assert api.iter_card_set.call_args[1]['fields'] == ['id', 'score']
+
+def test_unknown_fields_are_rejected(mocker):
+  """
+  Fields that are not fields of a card, or fields without --format, are bad
+  input arguments (exit code 2).
+  """
+  mocker.patch('knards.api.iter_card_set', return_value=iter([]))
+
+  runner = CliRunner()
+  result = runner.invoke(knards.main, [
+    'list', '--format', 'json', '--fields', 'id,color'
+  ])
+  assert result.exit_code == 2
+
+  result = runner.invoke(knards.main, ['list', '--fields', 'id'])
+  assert result.exit_code == 2
+
+def test_conflicting_options_are_rejected(mocker):
+  """
+  --format doesn't go with --editor, --stdout or --pager, and --fields can't
+  have the question or the answer the --no-q/--no-a options leave out (exit
+  code 2).
+  """
+  mocker.patch('knards.api.iter_card_set', return_value=iter([]))
+
+  runner = CliRunner()
+  for option in ('--editor', '--stdout', '--pager'):
+    result = runner.invoke(knards.main, ['list', '--format', 'json', option])
+    assert result.exit_code == 2
+    assert 'don\'t go with --format' in result.output
+
+  result = runner.invoke(knards.main, [
+    'list', '--format', 'json', '--fields', 'id,question', '--no-q'
+  ])
+  assert result.exit_code == 2
+  assert 'question along with --no-q' in result.output
+
+  result = runner.invoke(knards.main, [
+    'list', '--format', 'json', '--fields', 'answer', '--no-a'
+  ])
+  assert result.exit_code == 2
+  assert not api.iter_card_set.called
+
+  result = runner.invoke(knards.main, [
+    'list', '--format', 'json', '--fields', 'id,answer', '--no-q'
+  ])
+  assert result.exit_code == 0
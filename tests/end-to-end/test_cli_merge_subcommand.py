@@ -0,0 +1,42 @@
+from click.testing import CliRunner
+import os
+
+from knards import knards, api, util
+
+
+def test_DB_files_are_backed_up_before_merging(mocker, tmpdir):
+  """
+  Both DB files are backed up before anything connects to them, the backups
+  are byte for byte what the files were.
+  """
+  db_path = str(tmpdir) + '/main.db'
+  merge_path = str(tmpdir) + '/merge.db'
+  api.bootstrap_db(db_path)
+  api.bootstrap_db(merge_path)
+  util.db_disconnect()
+  contents = {}
+  for path in (db_path, merge_path):
+    with open(path, 'rb') as db_file:
+      contents[path] = db_file.read()
+
+  backup_path = str(tmpdir) + '/backups/'
+  os.mkdir(backup_path)
+  mocker.patch('knards.config.get_DB_name', return_value=db_path)
+  mocker.patch('knards.config.get_backup_path', return_value=backup_path)
+
+  def merge_db(merge_db_path):
+    # nothing is connected to yet
+    assert not getattr(util._connections, 'by_path', {})
+    return 0, 0
+  mocker.patch('knards.api.merge_db', side_effect=merge_db)
+
+  runner = CliRunner()
+  result = runner.invoke(knards.main, ['merge', '--db', merge_path])
+  assert result.exit_code == 0
+  assert api.merge_db.called
+
+  backups = sorted(os.listdir(backup_path))
+  assert [backup.split('_')[0] for backup in backups] == ['main', 'merge']
+  for backup, path in zip(backups, (db_path, merge_path)):
+    with open(backup_path + backup, 'rb') as backup_file:
+      assert backup_file.read() == contents[path]
@@ -0,0 +1,60 @@
+from click.testing import CliRunner
+import pstats
+import pytest
+
+from knards import knards, api
+
+
+@pytest.fixture()
+def status_db(init_db, mocker):
+  """
+  Makes the status subcommand work with the test DB.
+  """
+  mocker.patch('knards.config.get_DB_name', return_value=init_db)
+  return init_db
+
+def test_timings_are_printed_upon_exit(status_db):
+  """
+  With --timings, the api calls and the number of SQL statements are printed
+  out once the subcommand is done.
+  """
+  runner = CliRunner()
+  result = runner.invoke(knards.main, ['--timings', 'status'])
+  assert result.exit_code == 0
+  assert 'status_summary' in result.output
+  assert 'SQL statements: 1' in result.output
+
+def test_timings_are_enabled_by_the_env_var(status_db):
+  """
+  KNARDS_TIMINGS does the same as --timings.
+  """
+  runner = CliRunner()
+  result = runner.invoke(knards.main, ['status'], env={'KNARDS_TIMINGS': '1'})
+  assert result.exit_code == 0
+  assert 'SQL statements: 1' in result.output
+
+def test_profile_stats_are_written_to_the_file(status_db):
+  """
+  With --profile, the stats of the subcommand are written to the file, and the
+  timings are printed out as well.
+  """
+  runner = CliRunner()
+  with runner.isolated_filesystem():
+    result = runner.invoke(knards.main, ['--profile', 'kn.prof', 'status'])
+    assert result.exit_code == 0
+    assert 'status_summary' in result.output
+
+    stats = pstats.Stats('kn.prof')
+    assert 'status_summary' in [
+      function for _, _, function in stats.stats
+    ]
+
+def test_api_methods_are_restored_upon_exit(status_db):
+  """
+  The api methods are only wrapped by the timer while the subcommand runs.
+  """
+  status_summary = api.status_summary
+
+  runner = CliRunner()
+  runner.invoke(knards.main, ['--timings', 'status'])
+  assert api.status_summary is status_summary
@@ -0,0 +1,49 @@
+from click.testing import CliRunner
+import json
+
+from knards import knards, api
+
+
+RECOMMENDATIONS = {
+  'learn': [{'group': 'languages', 'tags': ['english', 'deutsch']}],
+  'revise': [
+    {'group': 'IT', 'tags': ['python']},
+    {'group': 'misc', 'tags': []},
+  ],
+}
+
+def test_recommendations_are_output_as_text(mocker):
+  """
+  By default, every recommendation is a line of text.
+  """
+  mocker.patch('knards.api.get_recommendations', return_value=RECOMMENDATIONS)
+
+  runner = CliRunner()
+  result = runner.invoke(knards.main, ['recommend'])
+  assert result.exit_code == 0
+  assert 'Learn languages: english, deutsch.' in result.output
+  assert 'Revise IT: python.' in result.output
+  assert 'Revise misc: nothing to revise.' in result.output
+
+def test_recommendations_are_output_in_the_format(mocker):
+  """
+  With --format, every recommendation is a record of its action, group and
+  tags.
+  """
+  mocker.patch('knards.api.get_recommendations', return_value=RECOMMENDATIONS)
+
+  runner = CliRunner()
+  result = runner.invoke(knards.main, ['recommend', '--format', 'jsonl'])
+  assert result.exit_code == 0
+  assert [json.loads(line) for line in result.output.splitlines()] == [
+    {'action': 'learn', 'group': 'languages', 'tags': ['english', 'deutsch']},
+    {'action': 'revise', 'group': 'IT', 'tags': ['python']},
+    {'action': 'revise', 'group': 'misc', 'tags': []},
+  ]
+
+  result = runner.invoke(knards.main, [
+    'recommend', '--format', 'csv', '--fields', 'group,tags'
+  ])
+  assert result.exit_code == 0
+  assert result.output == 'group,tags\nlanguages,english deutsch\nIT,python\n\
+misc,\n'
@@ -1,8 +1,9 @@
 from click.testing import CliRunner
+from datetime import datetime
 import os
 import pytest
 
-from knards import knards, api, config
+from knards import knards, api, config, util
 
 
 def test_markers_option_is_properly_translated_to_list(mocker):
@@ -35,3 +36,74 @@ def test_markers_option_is_properly_translated_to_list(mocker):
     runner.invoke(knards.main, ['revise', '--exc', 'phrases,english'])
     assert api.get_card_set.call_args_list[3][1]['exclude_markers'] == \
       ['phrases', 'english']
+
+def test_cards_are_revised_in_batches(mocker):
+  """
+  With --batch, the cards are passed on to util.ask_batch() that many at a
+  time (the cards of a series all go in the batch of the first one of them),
+  and the cards that weren't remembered at all come back in a later batch.
+  """
+  card_set = knards.CardSet([
+    knards.Card(id=1, date_created=datetime(2020, 1, 1)),
+    knards.Card(id=2, date_created=datetime(2020, 1, 2), series='s'),
+    knards.Card(id=3, date_created=datetime(2020, 1, 3)),
+    knards.Card(id=4, date_created=datetime(2020, 1, 4)),
+  ])
+  series_sets = {'s': {
+    1: knards.Card(id=2, series='s', pos_in_series=1),
+    2: knards.Card(id=5, series='s', pos_in_series=2),
+  }}
+  mocker.patch('knards.api.get_card_set', return_value=card_set)
+  mocker.patch('knards.api.get_series_sets', return_value=series_sets)
+
+  batches = []
+  def ask_batch(card_objs, series_lengths):
+    batches.append([card_obj.id for card_obj in card_objs])
+    # the first card is forgotten the first time round only
+    return [
+      card_obj._replace(
+        date_updated=datetime.now(),
+        score=0 if card_obj.id == 1 and len(batches) == 1 else 1
+      )
+      for card_obj in card_objs
+    ]
+  mocker.patch('knards.util.ask_batch', side_effect=ask_batch)
+
+  runner = CliRunner()
+  result = runner.invoke(
+    knards.main, ['revise', '--batch', '2'], input='y\ny\ny\n'
+  )
+  assert result.exit_code == 0
+  assert batches == [[1, 2, 5], [3, 4], [1]]
+  assert util.ask_batch.call_args_list[0][0][1] == {'s': 2}
+
+def test_forgotten_cards_come_back_once_the_queue_is_used_up(mocker):
+  """
+  A card graded 0 comes back in a later batch even if the batch it was in took
+  all of the cards that were left in the queue.
+  """
+  card_set = knards.CardSet([
+    knards.Card(id=1, date_created=datetime(2020, 1, 1)),
+    knards.Card(id=2, date_created=datetime(2020, 1, 2)),
+  ])
+  mocker.patch('knards.api.get_card_set', return_value=card_set)
+  mocker.patch('knards.api.get_series_sets', return_value={})
+
+  batches = []
+  def ask_batch(card_objs, series_lengths):
+    batches.append([card_obj.id for card_obj in card_objs])
+    return [
+      card_obj._replace(
+        date_updated=datetime.now(),
+        score=0 if card_obj.id == 1 and len(batches) == 1 else 1
+      )
+      for card_obj in card_objs
+    ]
+  mocker.patch('knards.util.ask_batch', side_effect=ask_batch)
+
+  runner = CliRunner()
+  result = runner.invoke(
+    knards.main, ['revise', '--batch', '5'], input='y\ny\n'
+  )
+  assert result.exit_code == 0
+  assert batches == [[1, 2], [1]]
@@ -0,0 +1,41 @@
+from click.testing import CliRunner
+import pytest
+
+from knards import knards, api, msg
+
+
+def test_query_words_and_options_are_passed_to_api(mocker):
+  """
+  All of the arguments make up the query, markers options are translated to
+  lists.
+  """
+  runner = CliRunner()
+  with runner.isolated_filesystem():
+    mocker.patch('knards.api.search_cards', return_value=[])
+
+    result = runner.invoke(knards.main, [
+      'search', 'list', 'comprehension', '--inc', 'python,basics',
+      '--limit', '5'
+    ])
+    assert result.exit_code == 1
+    assert api.search_cards.call_args[0][0] == 'list comprehension'
+    assert api.search_cards.call_args[1]['include_markers'] == \
+      ['python', 'basics']
+    assert api.search_cards.call_args[1]['exclude_markers'] == []
+    assert api.search_cards.call_args[1]['limit'] == 5
+
+def test_found_cards_are_output_with_snippets(mocker):
+  """
+  Every found card is output with its id, markers and the snippet.
+  """
+  runner = CliRunner()
+  with runner.isolated_filesystem():
+    mocker.patch('knards.api.search_cards', return_value=[
+      (knards.Card(id=7, markers='python'), 'What is a [decorator]?'),
+    ])
+
+    result = runner.invoke(knards.main, ['search', 'decorator'])
+    assert result.exit_code == 0
+    assert msg.CARD_SEARCH_TEMPLATE.format(
+      7, 'python', 'What is a [decorator]?'
+    ) in result.output
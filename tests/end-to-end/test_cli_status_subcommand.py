@@ -0,0 +1,44 @@
+from click.testing import CliRunner
+import json
+
+from knards import knards, api, util
+
+
+def test_status_takes_a_single_query(init_db, mocker):
+  """
+  All of the numbers output by the status subcommand are counted with a single
+  query.
+  """
+  mocker.patch('knards.config.get_DB_name', return_value=init_db)
+  util.db_connect(init_db)
+  # the subcommand closes the connections once it's done
+  mocker.patch('knards.util.db_disconnect')
+
+  runner = CliRunner()
+  with util.QueryCounter() as queries:
+    result = runner.invoke(knards.main, ['status', '--inc', 'python'])
+
+  assert result.exit_code == 0
+  assert queries.count <= 1, queries.statements
+
+def test_status_is_output_in_the_format(mocker):
+  """
+  With --format, the numbers are written to stdout as a JSON object, a JSON
+  line or CSV.
+  """
+  mocker.patch('knards.api.status_summary', return_value={
+    'total': 10, 'revised_today': 2, 'revisable': 5
+  })
+
+  runner = CliRunner()
+  result = runner.invoke(knards.main, ['status', '--format', 'json'])
+  assert result.exit_code == 0
+  assert json.loads(result.output) == {
+    'total': 10, 'revised_today': 2, 'revisable': 5
+  }
+
+  result = runner.invoke(knards.main, [
+    'status', '--format', 'csv', '--fields', 'revisable'
+  ])
+  assert result.exit_code == 0
+  assert result.output == 'revisable\n5\n'
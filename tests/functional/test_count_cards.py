@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from knards import knards, api
+
+
+def test_counts_cards_adhering_to_constraints(init_db):
+  """
+  count_cards() returns the number of cards get_card_set() would return for
+  the same constraints.
+  """
+  assert api.count_cards(db_path=init_db) == 0
+
+  api.create_cards([
+    knards.Card(markers='python specific', date_created=datetime.now()),
+    knards.Card(markers='python', date_created=datetime.now()),
+    knards.Card(markers='javascript', date_created=datetime.now()),
+  ], init_db)
+
+  assert api.count_cards(db_path=init_db) == 3
+  assert api.count_cards(include_markers=['python'], db_path=init_db) == 2
+  assert api.count_cards(
+    include_markers=['python'],
+    exclude_markers=['specific'],
+    db_path=init_db
+  ) == 1
+  assert api.count_cards(today=True, db_path=init_db) == 0
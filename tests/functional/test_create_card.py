@@ -57,3 +57,24 @@ def test_create_card_index_generation(mocker, init_db):
   assert api.delete_card(card_id=2, db_path=init_db)
   card_id = api.create_card(card_obj1, init_db)
   assert card_id == 2
+
+def test_freed_up_ids_are_reused_lowest_first(mocker, init_db):
+  """
+  Ids of deleted cards are reused by the new cards, lowest first, even if the
+  deleted cards had the highest ids in the DB. Only after all of them are
+  taken, new ids past the max one are generated.
+  """
+  for i in range(5):
+    api.create_card(knards.Card(), init_db)
+
+  for card_id in (5, 2, 4):
+    mocker.patch(
+      'knards.api.get_card_by_id',
+      return_value=api.get_card_by_id(card_id=card_id, db_path=init_db)
+    )
+    api.delete_card(card_id=card_id, db_path=init_db)
+  mocker.stopall()
+
+  assert [
+    api.create_card(knards.Card(), init_db) for i in range(5)
+  ] == [2, 4, 5, 6, 7]
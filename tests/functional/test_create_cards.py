@@ -0,0 +1,40 @@
+import pytest
+
+from knards import knards, api
+
+
+def test_input_args_must_be_card_objs(init_db):
+  """
+  create_cards() takes in an iterable of objects of type knards.Card and
+  stores none of them if any of the objects is of some other type.
+  """
+  with pytest.raises(ValueError):
+    api.create_cards([knards.Card(), 111], init_db)
+
+  assert api.get_last_card(db_path=init_db) is None
+
+def test_cards_are_created_with_consecutive_ids(init_db):
+  """
+  create_cards() stores all of the passed in cards and returns the ids they
+  were created with, in the same order.
+  """
+  card_ids = api.create_cards(
+    (knards.Card(markers='batch {}'.format(i)) for i in range(3)),
+    init_db
+  )
+  assert card_ids == [1, 2, 3]
+
+  for i, card_id in enumerate(card_ids):
+    assert api.get_card_by_id(card_id, init_db).markers == 'batch {}'.format(i)
+  assert len(api.get_card_set(include_markers=['batch'], db_path=init_db)) == 3
+
+def test_freed_up_ids_are_reused_first(init_db):
+  """
+  create_cards() reuses the ids freed up by deleting cards before generating
+  new ones.
+  """
+  api.create_cards([knards.Card() for i in range(4)], init_db)
+  api.delete_cards([1, 3], init_db)
+
+  assert api.create_cards([knards.Card() for i in range(3)], init_db) == \
+    [1, 3, 5]
@@ -0,0 +1,28 @@
+import pytest
+
+from knards import knards, api
+
+
+def test_card_ids_must_be_integers(init_db):
+  """
+  delete_cards() takes in an iterable of integer card ids.
+  """
+  api.create_card(knards.Card(), init_db)
+
+  with pytest.raises(TypeError):
+    api.delete_cards(['1'], init_db)
+
+  assert api.get_card_by_id(1, init_db).id == 1
+
+def test_only_existing_cards_are_reported_as_deleted(init_db):
+  """
+  delete_cards() removes all of the cards with the passed in ids and returns
+  the ids of the cards that were actually removed.
+  """
+  api.create_cards([knards.Card(markers='python') for i in range(3)], init_db)
+
+  assert api.delete_cards([3, 1, 7, 1], init_db) == [3, 1]
+  assert [card.id for card in api.get_card_set(
+    include_markers=['python'],
+    db_path=init_db
+  )] == [2]
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+import pytest
 
 from knards import knards, api
 
@@ -179,3 +180,112 @@ def test_if_today_is_true_return_only_cards_that_were_reviewed_today(init_db):
 
   assert len(api.get_card_set(today=True, db_path=init_db)) == 1
   assert len(api.get_card_set(today=False, db_path=init_db)) == 3
+
+def test_constraints_are_combined_and_applied_within_the_db(init_db):
+  """
+  All of the constraints passed to get_card_set() are applied together, with
+  the same semantics as before: whole word markers only, revisable cards are
+  ones that had at least .score full days passed since .date_updated.
+  """
+  now = datetime.now()
+  card_obj1 = knards.Card(markers='python specific', date_created=now)
+  card_obj2 = knards.Card(
+    markers='python specific',
+    date_created=now,
+    date_updated=now - timedelta(days=1, hours=1),
+    score=1
+  )
+  card_obj3 = knards.Card(
+    markers='python nonspecific',
+    date_created=now,
+    date_updated=now - timedelta(hours=23),
+    score=1
+  )
+  card_obj4 = knards.Card(
+    markers='javascript specific',
+    date_created=now,
+    date_updated=now,
+    score=0
+  )
+  api.create_card(card_obj1, init_db)
+  api.create_card(card_obj2, init_db)
+  api.create_card(card_obj3, init_db)
+  api.create_card(card_obj4, init_db)
+
+  assert [card.id for card in api.get_card_set(
+    revisable_only=True,
+    db_path=init_db
+  )] == [1, 2, 4]
+  assert [card.id for card in api.get_card_set(
+    revisable_only=True,
+    include_markers=['python'],
+    db_path=init_db
+  )] == [1, 2]
+  assert [card.id for card in api.get_card_set(
+    revisable_only=True,
+    exclude_markers=['specific'],
+    db_path=init_db
+  )] == []
+  assert [card.id for card in api.get_card_set(
+    today=True,
+    include_markers=['specific'],
+    db_path=init_db
+  )] == [4]
+  assert api.get_card_set(
+    include_markers=['python specific'],
+    db_path=init_db
+  ) == []
+  assert len(api.get_card_set(
+    exclude_markers=['python specific'],
+    db_path=init_db
+  )) == 4
+
+def test_only_requested_fields_are_read(init_db):
+  """
+  If get_card_set() is passed fields=[...], only those fields are read from
+  the DB, the rest are left empty; show_question/show_answer=False leave the
+  texts out the same way.
+  """
+  card_obj = knards.Card(
+    question='question text',
+    answer='answer text',
+    markers='python',
+    date_created=datetime.now(),
+    score=3
+  )
+  api.create_card(card_obj, init_db)
+
+  card_set = api.get_card_set(fields=['id', 'score'], db_path=init_db)
+  assert card_set == [knards.Card(
+    id=1,
+    pos_in_series=None,
+    question='',
+    answer='',
+    markers=None,
+    date_created=None,
+    score=3
+  )]
+
+  card_set = api.get_card_set(show_answer=False, db_path=init_db)
+  assert card_set[0].question == 'question text'
+  assert card_set[0].answer == ''
+  assert card_set[0].markers == 'python'
+
+  with pytest.raises(ValueError):
+    api.get_card_set(fields=['id', 'due'], db_path=init_db)
+
+def test_columnar_set_holds_the_same_cards(init_db):
+  """
+  With columnar=True, get_card_set() returns a knards.CardSet of the same
+  cards.
+  """
+  api.create_cards([
+    knards.Card(markers='python'),
+    knards.Card(markers='javascript', series='basics', pos_in_series=2),
+  ], init_db)
+
+  card_set = api.get_card_set(columnar=True, db_path=init_db)
+
+  assert isinstance(card_set, knards.CardSet)
+  assert list(card_set) == api.get_card_set(db_path=init_db)
+  assert card_set.series == [None, 'basics']
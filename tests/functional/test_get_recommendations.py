@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+
+from knards import knards, api
+
+
+TAGS_LIST = {
+  'languages': ['english', 'german'],
+  'IT': ['python', 'sql'],
+}
+
+
+def test_marker_stats_match_the_cards(init_db):
+  """
+  get_marker_stats() counts the cards with each marker, the revisable ones and
+  the full days they're overdue, in one go.
+  """
+  now = datetime.now()
+  api.create_cards([
+    knards.Card(markers='python', date_created=now - timedelta(days=5)),
+    knards.Card(
+      markers='python sql',
+      date_created=now - timedelta(days=30),
+      date_updated=now - timedelta(days=10, hours=12),
+      score=3
+    ),
+    knards.Card(
+      markers='sql',
+      date_created=now,
+      date_updated=now,
+      score=5
+    ),
+  ], init_db)
+
+  assert api.get_marker_stats(
+    ['python', 'sql', 'english'], db_path=init_db
+  ) == {
+    'python': {'total': 2, 'revisable': 2, 'overdue_days': 15},
+    'sql': {'total': 2, 'revisable': 1, 'overdue_days': 10},
+  }
+
+def test_empty_DB_recommends_to_learn_everything(init_db):
+  """
+  get_recommendations() on an empty DB doesn't raise, every group is to be
+  learnt starting with all of its tags.
+  """
+  assert api.get_recommendations(
+    tags_list=TAGS_LIST,
+    tags_only_revise=['sql'],
+    db_path=init_db
+  ) == {
+    'learn': [
+      {'group': 'languages', 'tags': ['english', 'german']},
+      {'group': 'IT', 'tags': ['python']},
+    ],
+    'revise': [],
+  }
+
+def test_overdue_tags_are_recommended_to_revise(init_db):
+  """
+  Groups with enough revisable cards are to be revised, starting with the tags
+  overdue the most on average; the rest are to be learnt starting with the tags
+  with the fewest cards.
+  """
+  now = datetime.now()
+  api.create_cards([
+    knards.Card(
+      markers='IT python',
+      date_created=now - timedelta(days=20),
+      date_updated=now - timedelta(days=9),
+      score=1
+    ),
+    knards.Card(
+      markers='IT sql',
+      date_created=now - timedelta(days=20),
+      date_updated=now - timedelta(days=2),
+      score=1
+    ),
+    knards.Card(markers='languages english', date_created=now),
+    knards.Card(
+      markers='languages english',
+      date_created=now,
+      date_updated=now,
+      score=5
+    ),
+    knards.Card(
+      markers='languages english',
+      date_created=now,
+      date_updated=now,
+      score=5
+    ),
+    knards.Card(
+      markers='languages english',
+      date_created=now,
+      date_updated=now,
+      score=5
+    ),
+    knards.Card(
+      markers='languages english',
+      date_created=now,
+      date_updated=now,
+      score=5
+    ),
+  ], init_db)
+
+  assert api.get_recommendations(
+    tags_list=TAGS_LIST,
+    tags_only_revise=[],
+    db_path=init_db
+  ) == {
+    'learn': [{'group': 'languages', 'tags': ['german']}],
+    'revise': [{'group': 'IT', 'tags': ['python']}],
+  }
@@ -0,0 +1,55 @@
+import pytest
+
+from knards import knards, api, exceptions
+
+
+def test_series_names_must_be_a_list_of_str(init_db):
+  """
+  get_series_sets() raises TypeError if it's not passed a list of strings.
+  """
+  with pytest.raises(TypeError):
+    api.get_series_sets('series', db_path=init_db)
+  with pytest.raises(TypeError):
+    api.get_series_sets(['series', 1], db_path=init_db)
+
+def test_cards_are_grouped_by_series_and_position(init_db):
+  """
+  get_series_sets() returns the cards of every requested series keyed by their
+  positions, series without cards are omitted.
+  """
+  api.create_cards([
+    knards.Card(series='first', pos_in_series=2),
+    knards.Card(series='second', pos_in_series=1),
+    knards.Card(series='first', pos_in_series=1),
+    knards.Card(series='third', pos_in_series=1),
+    knards.Card(),
+  ], init_db)
+
+  series_sets = api.get_series_sets(
+    ['first', 'second', 'first', 'missing'],
+    db_path=init_db
+  )
+
+  assert {
+    series_name: {
+      pos_in_series: card.id for pos_in_series, card in series_set.items()
+    } for series_name, series_set in series_sets.items()
+  } == {
+    'first': {1: 3, 2: 1},
+    'second': {1: 2},
+  }
+
+def test_get_series_set_reads_a_single_series(init_db):
+  """
+  get_series_set() returns the same as get_series_sets() for one series and
+  raises if there're no cards in it.
+  """
+  api.create_cards([
+    knards.Card(series='first', pos_in_series=1),
+    knards.Card(series='first', pos_in_series=2),
+  ], init_db)
+
+  assert api.get_series_set('first', db_path=init_db) == \
+    api.get_series_sets(['first'], db_path=init_db)['first']
+  with pytest.raises(exceptions.EmptyDB):
+    api.get_series_set('missing', db_path=init_db)
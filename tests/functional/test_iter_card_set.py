@@ -0,0 +1,89 @@
+import pytest
+import types
+
+from knards import knards, api
+
+
+def test_empty_DB_yields_nothing(init_db):
+  """
+  Unlike get_card_set(), iter_card_set() doesn't treat an empty DB as an error.
+  """
+  assert list(api.iter_card_set(db_path=init_db)) == []
+
+def test_yields_the_same_cards_as_get_card_set(init_db):
+  """
+  iter_card_set() yields cards one by one, reading them in chunks of
+  chunk_size rows, and the result is the same as the one of get_card_set().
+  """
+  for i in range(7):
+    api.create_card(
+      knards.Card(markers='python' if i % 2 else 'javascript'),
+      init_db
+    )
+
+  card_set = api.iter_card_set(
+    include_markers=['python'],
+    show_answer=False,
+    chunk_size=2,
+    db_path=init_db
+  )
+  assert isinstance(card_set, types.GeneratorType)
+  assert list(card_set) == api.get_card_set(
+    include_markers=['python'],
+    show_answer=False,
+    db_path=init_db
+  )
+
+def test_wrong_options_raise_upon_the_call(init_db):
+  """
+  Options are checked right away, not upon the first iteration.
+  """
+  with pytest.raises(TypeError):
+    api.iter_card_set(chunk_size=0, db_path=init_db)
+
+def test_lazy_cards_read_their_texts_upon_access(init_db):
+  """
+  With lazy=True, the texts aren't part of the query, each card reads them
+  when they're accessed; the cards are the same as the eager ones otherwise.
+  """
+  api.create_cards([
+    knards.Card(question='first', answer='one'),
+    knards.Card(question='second', answer='two'),
+  ], init_db)
+
+  card_set = list(api.iter_card_set(
+    show_answer=False,
+    lazy=True,
+    db_path=init_db
+  ))
+  assert all(isinstance(card, knards.LazyCard) for card in card_set)
+  assert not any(card.texts_loaded for card in card_set)
+
+  api.update_cards(
+    [card._replace(question='edited') for card in api.get_card_set(
+      db_path=init_db
+    )[:1]],
+    db_path=init_db
+  )
+
+  assert card_set[0].question == 'edited'
+  assert card_set[0].answer == ''
+  assert not card_set[1].texts_loaded
+  assert card_set[1] == api.get_card_set(
+    show_answer=False,
+    db_path=init_db
+  )[1]
+
+def test_texts_of_lazy_cards_are_loaded_in_one_go(init_db):
+  """
+  load_texts() reads the texts of all of the passed in lazy cards at once.
+  """
+  api.create_cards([
+    knards.Card(question='first'),
+    knards.Card(question='second'),
+  ], init_db)
+  card_set = api.get_card_set(lazy=True, db_path=init_db)
+
+  assert api.load_texts(card_set) == card_set
+  assert all(card.texts_loaded for card in card_set)
+  assert [card.question for card in card_set] == ['first', 'second']
@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta
+import sqlite3
+
+import pytest
+
+from knards import knards, api, exceptions
+
+
+def test_merge_file_must_exist(init_db):
+  """
+  merge_db() raises if there's no DB file to merge.
+  """
+  with pytest.raises(exceptions.DBFileNotFound):
+    api.merge_db(init_db + '.missing', db_path=init_db)
+
+def test_merge_file_must_be_a_DB(init_db, tmpdir):
+  """
+  merge_db() raises if the file to merge is not a DB with cards, the DB stays
+  as it was.
+  """
+  merge_path = str(tmpdir) + '/merge.db'
+  with open(merge_path, 'w') as merge_file:
+    merge_file.write('not a DB')
+
+  with pytest.raises(sqlite3.DatabaseError):
+    api.merge_db(merge_path, db_path=init_db)
+
+  assert api.count_cards(db_path=init_db) == 0
+
+def test_cards_are_merged_and_duplicates_skipped(init_db, tmpdir):
+  """
+  merge_db() copies the cards that don't exist in the DB yet, they get new ids
+  (freed up ones first), due dates and markers index entries; cards created at
+  the same moment as ones in the DB are skipped.
+  """
+  merge_path = str(tmpdir) + '/merge.db'
+  api.bootstrap_db(merge_path)
+
+  now = datetime.now()
+  shared = knards.Card(question='shared', markers='python', date_created=now)
+  api.create_cards([
+    shared,
+    knards.Card(question='deleted', date_created=now - timedelta(days=9)),
+    knards.Card(question='main', date_created=now - timedelta(days=8)),
+  ], init_db)
+  api.delete_cards([2], init_db)
+  api.create_cards([
+    knards.Card(
+      question='revised',
+      markers='python test',
+      date_created=now - timedelta(days=7),
+      date_updated=now - timedelta(days=3),
+      score=2
+    ),
+    shared,
+    knards.Card(question='new', markers='test', date_created=now),
+  ], merge_path)
+  api.create_cards([
+    knards.Card(question='new', markers='test', date_created=now),
+  ], merge_path)
+  api.delete_cards([3], merge_path)
+  api.create_cards([
+    knards.Card(
+      question='newer', markers='test', date_created=now + timedelta(days=1)
+    ),
+  ], merge_path)
+
+  assert api.merge_db(merge_path, db_path=init_db) == (2, 2)
+
+  card_set = api.get_card_set(db_path=init_db)
+  assert [(card.id, card.question) for card in card_set] == [
+    (1, 'shared'),
+    (2, 'revised'),
+    (3, 'main'),
+    (4, 'newer'),
+  ]
+  assert card_set[1].markers == 'python test'
+  assert card_set[1].date_updated == now - timedelta(days=3)
+  assert api.count_cards(
+    revisable_only=True, include_markers=['test'], db_path=init_db
+  ) == 2
+  assert api.count_cards(
+    include_markers=['python'], db_path=init_db
+  ) == 2
+
+def test_merging_twice_skips_everything(init_db, tmpdir):
+  """
+  Merging the same DB file again doesn't duplicate any card.
+  """
+  merge_path = str(tmpdir) + '/merge.db'
+  api.bootstrap_db(merge_path)
+  api.create_cards([knards.Card(), knards.Card()], merge_path)
+
+  assert api.merge_db(merge_path, db_path=init_db) == (2, 0)
+  assert api.merge_db(merge_path, db_path=init_db) == (0, 2)
+  assert api.count_cards(db_path=init_db) == 2
+
+def test_merge_file_is_left_as_it_is(init_db, tmpdir):
+  """
+  The DB to merge is only read: one created by an older version of knards, with
+  the dates stored as text, isn't upgraded, and its dates are converted on the
+  way into the DB.
+  """
+  merge_path = str(tmpdir) + '/legacy.db'
+  created = datetime(2020, 1, 2, 3, 4, 5, 678901)
+  connection = sqlite3.connect(merge_path)
+  with connection:
+    connection.execute("""
+      CREATE TABLE cards (
+        id integer primary key,
+        pos_in_series number,
+        question text,
+        answer text,
+        markers text,
+        series text,
+        date_created timestamp,
+        date_updated timestamp,
+        score number
+      )
+    """)
+    connection.execute("""
+      INSERT INTO cards VALUES (1, 0, 'q', 'a', 'python', NULL, ?, ?, 3)
+    """, (str(created), str(created + timedelta(days=1))))
+  connection.close()
+  with open(merge_path, 'rb') as merge_file:
+    contents = merge_file.read()
+
+  assert api.merge_db(merge_path, db_path=init_db) == (1, 0)
+  assert api.merge_db(merge_path, db_path=init_db) == (0, 1)
+
+  with open(merge_path, 'rb') as merge_file:
+    assert merge_file.read() == contents
+  card = api.get_card_by_id(1, db_path=init_db)
+  assert card.date_created == created
+  assert card.date_updated == created + timedelta(days=1)
+  assert api.count_cards(
+    revisable_only=True, include_markers=['python'], db_path=init_db
+  ) == 1
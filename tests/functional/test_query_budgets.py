@@ -0,0 +1,63 @@
+from datetime import datetime
+import pytest
+
+from knards import knards, api, util
+
+
+@pytest.fixture()
+def cards_db(init_db):
+  """
+  A DB with a few dozen cards, some of them revised, some of them in series.
+  """
+  card_objs = []
+  for i in range(40):
+    card_objs.append(knards.Card(
+      question='Question {}'.format(i),
+      markers='python basics' if i % 2 else 'javascript',
+      series='series {}'.format(i % 5) if i < 20 else None,
+      pos_in_series=i // 5 + 1 if i < 20 else 0,
+      date_updated=datetime(2019, 1, 1) if i % 3 else None,
+      score=i % 7
+    ))
+  api.create_cards(card_objs, init_db)
+  # connecting (and migrating) is not a part of any budget
+  util.db_connect(init_db)
+  return init_db
+
+@pytest.mark.parametrize('call', [
+  lambda db: api.status_summary(['python'], ['basics'], db),
+  lambda db: api.count_cards(revisable_only=True, db_path=db),
+  lambda db: api.get_card_set(
+    revisable_only=True, include_markers=['python'], db_path=db
+  ),
+  lambda db: api.get_card_set(exclude_markers=['python'], db_path=db),
+  lambda db: api.get_card_by_id(3, db),
+  lambda db: api.get_last_card(['python'], db),
+  lambda db: api.get_series_sets(
+    ['series {}'.format(i) for i in range(5)], db
+  ),
+  lambda db: api.get_recommendations(
+    {'languages': ['python', 'javascript']}, ['basics'], db
+  ),
+  lambda db: api.search_cards('question', db_path=db),
+])
+def test_reads_take_a_single_query(cards_db, call):
+  """
+  Every api method that reads cards does so with a single query, no matter how
+  many cards, markers or series there are (get_card_set() takes one more to
+  tell an empty DB from an empty set, but only if it finds nothing).
+  """
+  with util.QueryCounter() as queries:
+    call(cards_db)
+
+  assert queries.count == 1, queries.statements
+
+def test_lazy_texts_are_read_in_one_query_per_batch(cards_db):
+  """
+  Texts of lazy cards read by load_texts() take one more query.
+  """
+  with util.QueryCounter() as queries:
+    card_objs = api.get_card_set(lazy=True, db_path=cards_db)
+    api.load_texts(card_objs)
+
+  assert queries.count == 2, queries.statements
@@ -0,0 +1,118 @@
+import pytest
+
+from knards import knards, api, util
+
+
+@pytest.fixture()
+def search_db(init_db):
+  api.create_cards([
+    knards.Card(
+      question='What is a decorator?',
+      answer='A function that wraps another function.',
+      markers='python'
+    ),
+    knards.Card(
+      question='What is a closure?',
+      answer='A function with captured variables, e.g. inside a decorator.',
+      markers='python functional'
+    ),
+    knards.Card(
+      question='What is a generator?',
+      answer='An iterator defined by a function with yield.',
+      markers='javascript'
+    ),
+  ], init_db)
+  return init_db
+
+def test_query_must_be_str(search_db):
+  """
+  search_cards() raises TypeError if the query is not a string.
+  """
+  with pytest.raises(TypeError):
+    api.search_cards(['decorator'], db_path=search_db)
+
+def test_cards_are_found_by_question_and_answer_words(search_db):
+  """
+  search_cards() finds cards by words in either text, the best matches first,
+  and returns a snippet of the text with the matched words highlighted.
+  """
+  found = api.search_cards('decorator', db_path=search_db)
+
+  assert [card.id for card, snippet in found] == [1, 2]
+  assert found[0][0].markers == 'python'
+  assert '[decorator]' in found[0][1]
+
+def test_all_of_the_words_must_match(search_db):
+  """
+  Each card must contain all of the words of the query, a word ending with *
+  matches by prefix; FTS5 syntax characters are matched literally.
+  """
+  assert [card.id for card, snippet in api.search_cards(
+    'function yield',
+    db_path=search_db
+  )] == [3]
+  assert api.search_cards('gen* OR', db_path=search_db) == []
+  assert [card.id for card, snippet in api.search_cards(
+    'gen*',
+    db_path=search_db
+  )] == [3]
+  assert api.search_cards('"what? (NOT)', db_path=search_db) == []
+  assert api.search_cards('   ', db_path=search_db) == []
+
+def test_markers_and_limit_constrain_the_result(search_db):
+  """
+  search_cards() only returns the cards with the included markers and none of
+  the excluded ones, no more than limit of them.
+  """
+  assert [card.id for card, snippet in api.search_cards(
+    'function',
+    include_markers=['python'],
+    exclude_markers=['functional'],
+    db_path=search_db
+  )] == [1]
+  assert len(api.search_cards('what', limit=2, db_path=search_db)) == 2
+
+def test_index_follows_updates_and_deletions(search_db):
+  """
+  The index is kept in sync with the cards by the DB itself.
+  """
+  card = api.get_card_by_id(1, db_path=search_db)
+  api.update_card(
+    card._replace(question='What is a metaclass?'),
+    db_path=search_db
+  )
+  api.delete_cards([2], db_path=search_db)
+
+  assert api.search_cards('decorator', db_path=search_db) == []
+  assert [card.id for card, snippet in api.search_cards(
+    'metaclass',
+    db_path=search_db
+  )] == [1]
+
+def test_texts_are_scanned_without_fts5(mocker, tmpdir):
+  """
+  If sqlite has no FTS5, the DB is created without the index, the other
+  commands work as usual and search_cards() scans the texts instead.
+  """
+  mocker.patch('knards.migrations.fts5_available', return_value=False)
+  db_path = str(tmpdir) + '/no_fts.db'
+  api.bootstrap_db(db_path)
+  api.create_cards([
+    knards.Card(question='What is a decorator?', answer='A wrapper.'),
+    knards.Card(question='What is 50%?', answer='Half, e.g. of a decorator.'),
+  ], db_path)
+  api.delete_cards([2], db_path=db_path)
+  api.create_card(
+    knards.Card(question='What is 50%?', answer='Half, e.g. of a decorator.'),
+    db_path
+  )
+
+  found = api.search_cards('decor*', db_path=db_path)
+  assert [card.id for card, snippet in found] == [1, 2]
+  assert found[0][1] == 'What is a [decorator]?'
+  assert found[1][1] == 'Half, e.g. of a [decorator].'
+  assert [card.id for card, snippet in api.search_cards(
+    '50% half', db_path=db_path
+  )] == [2]
+  assert api.search_cards('5_%', db_path=db_path) == []
+  util.db_disconnect(db_path)
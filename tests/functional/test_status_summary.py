@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+from knards import knards, api
+
+
+def test_empty_DB_has_all_counts_zero(init_db):
+  """
+  status_summary() on an empty DB doesn't raise, all of the counts are 0.
+  """
+  assert api.status_summary(db_path=init_db) == {
+    'total': 0,
+    'revised_today': 0,
+    'revisable': 0,
+  }
+
+def test_counts_match_the_ones_of_get_card_set(init_db):
+  """
+  status_summary() counts exactly the same cards get_card_set() returns for
+  the respective constraints, with respect to the markers.
+  """
+  now = datetime.now()
+  api.create_cards([
+    knards.Card(markers='python', date_created=now),
+    knards.Card(
+      markers='python',
+      date_created=now,
+      date_updated=now,
+      score=2
+    ),
+    knards.Card(
+      markers='python test',
+      date_created=now,
+      date_updated=now - timedelta(days=3),
+      score=2
+    ),
+    knards.Card(markers='javascript', date_created=now, date_updated=now),
+  ], init_db)
+
+  for include_markers, exclude_markers in (
+    ([], []),
+    (['python'], []),
+    (['python'], ['test']),
+    ([], ['python']),
+  ):
+    assert api.status_summary(
+      include_markers=include_markers,
+      exclude_markers=exclude_markers,
+      db_path=init_db
+    ) == {
+      'total': len(api.get_card_set(
+        include_markers=include_markers,
+        exclude_markers=exclude_markers,
+        db_path=init_db
+      )),
+      'revised_today': len(api.get_card_set(
+        today=True,
+        include_markers=include_markers,
+        exclude_markers=exclude_markers,
+        db_path=init_db
+      )),
+      'revisable': len(api.get_card_set(
+        revisable_only=True,
+        include_markers=include_markers,
+        exclude_markers=exclude_markers,
+        db_path=init_db
+      )),
+    }
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from knards import knards, api
 
@@ -40,3 +40,39 @@ def test_card_obj_sent_to_update_card_gets_properly_updated(init_db):
   assert updated_card_obj.date_created == initial_card_obj.date_created
   assert updated_card_obj.date_updated == datetime.today().strftime('%Y-%m-%d')
   assert initial_card_obj.date_updated is None
+
+def test_markers_index_follows_updated_markers(init_db):
+  """
+  Changing the markers of a card with update_card() is reflected by the
+  marker constrained queries right away.
+  """
+  card_id = api.create_card(knards.Card(markers='python specific'), init_db)
+
+  stored_card_obj = api.get_card_by_id(card_id, init_db)
+  api.update_card(
+    stored_card_obj._replace(markers='python generic'),
+    db_path=init_db
+  )
+
+  assert api.get_card_set(include_markers=['specific'], db_path=init_db) == []
+  assert len(api.get_card_set(
+    include_markers=['python', 'generic'],
+    db_path=init_db
+  )) == 1
+
+def test_due_date_follows_the_score_of_the_card(init_db):
+  """
+  update_card() recalculates the due date of the card, so a card revised right
+  now is only revisable again once its score in days has passed.
+  """
+  card_id = api.create_card(knards.Card(date_created=datetime.now()), init_db)
+  assert len(api.get_card_set(revisable_only=True, db_path=init_db)) == 1
+
+  stored_card_obj = api.get_card_by_id(card_id, init_db)
+  api.update_card(stored_card_obj._replace(score=3), db_path=init_db)
+  assert api.get_card_set(revisable_only=True, db_path=init_db) == []
+  assert len(api.get_card_set(
+    revisable_only=True,
+    due_by=datetime.now() + timedelta(days=3),
+    db_path=init_db
+  )) == 1
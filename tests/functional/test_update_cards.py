@@ -0,0 +1,36 @@
+import pytest
+
+from knards import knards, api
+
+
+def test_input_args_must_be_card_objs(init_db):
+  """
+  update_cards() takes in an iterable of objects of type knards.Card and
+  updates none of them if any of the objects is of some other type.
+  """
+  card_id = api.create_card(knards.Card(question='initial'), init_db)
+  card_obj = api.get_card_by_id(card_id, init_db)
+
+  with pytest.raises(ValueError):
+    api.update_cards(
+      [card_obj._replace(question='updated'), 111],
+      db_path=init_db
+    )
+
+  assert api.get_card_by_id(card_id, init_db).question == 'initial'
+
+def test_all_cards_are_updated(init_db):
+  """
+  update_cards() updates all of the passed in cards and returns their ids.
+  """
+  card_ids = api.create_cards([knards.Card() for i in range(3)], init_db)
+  card_objs = [api.get_card_by_id(card_id, init_db) for card_id in card_ids]
+
+  assert api.update_cards([
+    card_obj._replace(markers='updated') for card_obj in card_objs
+  ], update_now=False, db_path=init_db) == card_ids
+
+  for card_id in card_ids:
+    card_obj = api.get_card_by_id(card_id, init_db)
+    assert card_obj.markers == 'updated'
+    assert card_obj.date_updated is None
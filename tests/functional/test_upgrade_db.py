@@ -0,0 +1,226 @@
+from datetime import datetime, timedelta
+import sqlite3
+
+from knards import knards, api, migrations, util
+
+
+def bootstrap_legacy_db(db_path):
+  """
+  Creates a DB the way older versions of knards did: the "cards" table only.
+  """
+  connection = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+  with connection:
+    connection.execute("""
+      CREATE TABLE cards (
+        id integer primary key,
+        pos_in_series number,
+        question text,
+        answer text,
+        markers text,
+        series text,
+        date_created timestamp,
+        date_updated timestamp,
+        score number
+      )
+    """)
+    connection.executemany("""
+      INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+      (1, 0, 'q', 'a', 'python specific', None, datetime.now(), None, 0),
+      (2, 0, 'q', 'a', 'javascript specific', None, datetime.now(), None, 0),
+      (3, 0, 'q', 'a', 'python', None, datetime.now(), None, 0),
+      (
+        4, 0, 'q', 'a', 'revised', None, datetime.now(),
+        datetime.now() - timedelta(days=2), 1
+      ),
+      (
+        5, 0, 'q', 'a', 'revised', None, datetime.now(),
+        datetime.now() - timedelta(days=2), 5
+      ),
+    ])
+  connection.close()
+
+def test_markers_index_is_built_from_the_markers_column(tmpdir):
+  """
+  upgrade_db() creates the markers tables of an older DB and fills them in
+  from the space separated "markers" column of the existing cards.
+  """
+  db_path = str(tmpdir) + '/legacy.db'
+  bootstrap_legacy_db(db_path)
+
+  assert api.upgrade_db(db_path) != []
+
+  assert [card.id for card in api.get_card_set(
+    include_markers=['python'],
+    db_path=db_path
+  )] == [1, 3]
+  assert [card.id for card in api.get_card_set(
+    include_markers=['specific'],
+    exclude_markers=['python'],
+    db_path=db_path
+  )] == [2]
+
+def test_upgrade_is_applied_only_once(tmpdir):
+  """
+  Running upgrade_db() on a DB that is already up to date changes nothing.
+  """
+  db_path = str(tmpdir) + '/legacy.db'
+  bootstrap_legacy_db(db_path)
+
+  assert api.upgrade_db(db_path) != []
+  assert api.upgrade_db(db_path) == []
+
+  api.bootstrap_db(str(tmpdir) + '/fresh.db')
+  assert api.upgrade_db(str(tmpdir) + '/fresh.db') == []
+
+def test_due_dates_are_calculated_for_existing_cards(tmpdir):
+  """
+  upgrade_db() adds the due_date column to an older DB and calculates it for
+  all of the existing cards, so that revisable_only works right away.
+  """
+  db_path = str(tmpdir) + '/legacy.db'
+  bootstrap_legacy_db(db_path)
+
+  assert api.upgrade_db(db_path) != []
+
+  assert [card.id for card in api.get_card_set(
+    revisable_only=True,
+    db_path=db_path
+  )] == [1, 2, 3, 4]
+
+def test_ids_of_deleted_cards_are_collected_for_reuse(tmpdir):
+  """
+  upgrade_db() collects the gaps in the ids of the existing cards, so that
+  create_card() keeps reusing them.
+  """
+  db_path = str(tmpdir) + '/legacy.db'
+  bootstrap_legacy_db(db_path)
+  connection = sqlite3.connect(db_path)
+  with connection:
+    connection.execute('DELETE FROM cards WHERE id IN (2, 3)')
+  connection.close()
+
+  assert api.upgrade_db(db_path) != []
+
+  assert api.create_card(knards.Card(), db_path) == 2
+  assert api.create_card(knards.Card(), db_path) == 3
+  assert api.create_card(knards.Card(), db_path) == 6
+
+def test_search_index_is_built_for_existing_cards(tmpdir):
+  """
+  upgrade_db() builds the full-text search index out of the texts of the
+  existing cards.
+  """
+  db_path = str(tmpdir) + '/legacy.db'
+  bootstrap_legacy_db(db_path)
+  connection = sqlite3.connect(db_path)
+  with connection:
+    connection.execute("""
+      UPDATE cards SET question = 'What is a decorator?' WHERE id = 3
+    """)
+  connection.close()
+
+  assert api.upgrade_db(db_path) != []
+
+  assert [card.id for card, snippet in api.search_cards(
+    'decorator',
+    db_path=db_path
+  )] == [3]
+
+
+def get_indexes(connection):
+  return [row[0] for row in connection.execute("""
+    SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'cards_%'
+  """)]
+
+def test_new_DB_is_at_the_latest_version(init_db):
+  """
+  bootstrap_db() creates a DB that needs no migrations.
+  """
+  connection = util.db_connect(init_db)
+
+  assert migrations.get_version(connection) == len(migrations.MIGRATIONS)
+  assert migrations.migrate(connection) == []
+
+def test_older_DB_is_migrated_upon_connecting(tmpdir):
+  """
+  Connecting to a DB created by an older version of knards applies all of the
+  migrations, the indexes are added in place.
+  """
+  db_path = str(tmpdir) + '/legacy.db'
+  bootstrap_legacy_db(db_path)
+
+  connection = util.db_connect(db_path)
+
+  assert migrations.get_version(connection) == len(migrations.MIGRATIONS)
+  assert sorted(get_indexes(connection)) == [
+    'cards_date_created',
+    'cards_date_updated',
+    'cards_due_date',
+    'cards_series',
+  ]
+  assert [card.id for card in api.get_card_set(
+    include_markers=['python'],
+    db_path=db_path
+  )] == [1, 3]
+  util.db_disconnect(db_path)
+
+def test_only_missing_migrations_are_applied(tmpdir):
+  """
+  migrate() starts off the version the DB is at.
+  """
+  db_path = str(tmpdir) + '/legacy.db'
+  bootstrap_legacy_db(db_path)
+  connection = sqlite3.connect(db_path)
+  connection.execute('PRAGMA user_version = 6')
+
+  assert migrations.migrate(connection) == [
+    description for description, migration in migrations.MIGRATIONS[6:]
+  ]
+  assert connection.execute("""
+    SELECT name FROM sqlite_master WHERE name = 'card_markers'
+  """).fetchone() is None
+  connection.close()
+
+def test_DB_without_cards_is_left_as_is(tmpdir):
+  """
+  migrate() doesn't touch a DB that isn't a knards DB.
+  """
+  db_path = str(tmpdir) + '/other.db'
+  connection = sqlite3.connect(db_path)
+  connection.execute('CREATE TABLE other (id integer primary key)')
+
+  assert migrations.migrate(connection) == []
+  assert migrations.get_version(connection) == 0
+  connection.close()
+
+def test_dates_are_stored_as_integer_numbers(tmpdir):
+  """
+  Text dates of an older DB are converted to integer numbers of microseconds
+  exactly, they're read back as the same datetime objects.
+  """
+  db_path = str(tmpdir) + '/legacy.db'
+  bootstrap_legacy_db(db_path)
+  connection = sqlite3.connect(db_path)
+  with connection:
+    connection.execute("""
+      UPDATE cards SET date_created = '2019-03-04 05:06:07.089', date_updated =
+        CASE id WHEN 4 THEN '2019-03-05' ELSE NULL END
+    """)
+  connection.close()
+
+  api.upgrade_db(db_path)
+
+  connection = sqlite3.connect(db_path)
+  assert connection.execute("""
+    SELECT DISTINCT typeof(date_created), typeof(due_date) FROM cards
+    WHERE id = 4
+  """).fetchall() == [('integer', 'integer')]
+  connection.close()
+  card = api.get_card_by_id(4, db_path=db_path)
+  assert card.date_created == datetime(2019, 3, 4, 5, 6, 7, 89000)
+  assert card.date_updated == datetime(2019, 3, 5)
+  assert [card.id for card in api.get_card_set(
+    revisable_only=True,
+    db_path=db_path
+  )] == [1, 2, 3, 4, 5]
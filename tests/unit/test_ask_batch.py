@@ -0,0 +1,135 @@
+from datetime import datetime
+
+from knards import knards, msg, util
+
+
+def batch():
+  return [
+    knards.Card(id=1, question='What is 2 + 2?', answer='4', score=3),
+    knards.Card(
+      id=2, question='Question\non two lines', answer='Answer', score=0,
+      series='s', pos_in_series=1, date_updated=datetime(2020, 1, 1)
+    ),
+  ]
+
+def test_fibonacci_sequence_goes_past_the_score():
+  """
+  The sequence goes up to the first number not less than the score, and one
+  number past it.
+  """
+  assert util.get_fibonacci_sequence(0) == [0, 1, 2]
+  assert util.get_fibonacci_sequence(2) == [0, 1, 1, 2, 3]
+  assert util.get_fibonacci_sequence(5) == [0, 1, 1, 2, 3, 5, 8]
+
+# score: (the score if it's known well, the score if minor mistakes were made)
+SCORES = {
+  0: (2, 0), 1: (2, 0), 2: (3, 1), 3: (5, 2), 4: (8, 3), 5: (8, 3),
+  6: (13, 5), 7: (13, 5), 8: (13, 5), 9: (21, 8), 12: (21, 8), 13: (21, 8),
+  14: (34, 13), 21: (34, 13), 22: (55, 21),
+}
+
+def test_score_depends_on_the_grade():
+  """
+  3 - the last number of the sequence, 2 - two numbers back from it, 1 and 0 -
+  the score becomes 1 and 0.
+  """
+  for score, (known, minor) in SCORES.items():
+    assert [util.grade_score(score, grade) for grade in (3, 2, 1, 0)] == \
+      [known, minor, 1, 0]
+
+def test_single_card_is_scored_the_same_way(mocker):
+  """
+  The options ask() offers, and the score it stores, are the ones of
+  grade_score().
+  """
+  mocker.patch('knards.api.update_card')
+  mocker.patch('click.confirm', return_value=True)
+  mocker.patch('click.clear')
+
+  for score, (known, minor) in SCORES.items():
+    buffers = []
+    def open_in_editor(buf):
+      buffers.append(buf)
+      if len(buffers) == 1:
+        return 'answer'
+      # only the option of minor mistakes is left
+      return [
+        line for line in buf.split('\n') if line.startswith('I\'ve made')
+      ][0]
+    mocker.patch('knards.util.open_in_editor', side_effect=open_in_editor)
+
+    card_obj = util.ask(knards.Card(id=1, score=score))
+    assert 'becomes equal {})'.format(known) in buffers[1]
+    assert 'becomes equal {})'.format(minor) in buffers[1]
+    assert card_obj.score == minor
+
+def test_answers_and_grades_are_read_back_from_the_buffers():
+  """
+  The answers typed in under the answer lines of the first buffer, and the
+  grades typed in on the grade lines of the second one are found by card ids.
+  """
+  card_objs = batch()
+
+  buffer = ''.join(util.render_batch(card_objs, {'s': 3}))
+  assert buffer.startswith(msg.BATCH_ANSWERS_PROMPT)
+  assert '1/3 in "s"' in buffer
+  assert msg.BATCH_CORRECT_ANSWER_LINE not in buffer
+  buffer = buffer.replace(
+    msg.BATCH_ANSWER_LINE + '\n\n', msg.BATCH_ANSWER_LINE + '\nfour\n', 1
+  )
+  answers = util.parse_batch(buffer)
+  assert answers == {
+    1: {'answer': 'four', 'grade': None},
+    2: {'answer': '', 'grade': None},
+  }
+
+  buffer = ''.join(util.render_batch(card_objs, {'s': 3}, {
+    card_id: card['answer'] for card_id, card in answers.items()
+  }))
+  assert buffer.startswith(msg.BATCH_GRADES_PROMPT)
+  assert 'four\n{}\n4\n'.format(msg.BATCH_CORRECT_ANSWER_LINE) in buffer
+  buffer = buffer.replace(
+    msg.BATCH_GRADE_LINE + '\n', msg.BATCH_GRADE_LINE + '3\n', 1
+  )
+  assert util.parse_batch(buffer) == {
+    1: {'answer': 'four', 'grade': '3'},
+    2: {'answer': '', 'grade': ''},
+  }
+
+def test_batch_is_graded_and_updated_in_one_go(mocker):
+  """
+  The cards are asked in two editor buffers, the graded ones are updated with a
+  single call of api.update_cards(), the ungraded ones are left out.
+  """
+  card_objs = batch()
+  mocker.patch('knards.api.load_texts')
+  mocker.patch('knards.api.update_cards')
+
+  def open_in_editor(buf):
+    buffer = ''.join(buf)
+    if msg.BATCH_CORRECT_ANSWER_LINE in buffer:
+      return buffer.replace(
+        msg.BATCH_GRADE_LINE + '\n', msg.BATCH_GRADE_LINE + '2\n', 1
+      )
+    return buffer
+  mocker.patch('knards.util.open_in_editor', side_effect=open_in_editor)
+
+  updated = util.ask_batch(card_objs, {'s': 1})
+  assert util.open_in_editor.call_count == 2
+  assert [(card_obj.id, card_obj.score) for card_obj in updated] == [(1, 2)]
+  assert updated[0].date_updated is not None
+  util.api.update_cards.assert_called_once_with(updated)
+
+def test_invalid_grades_are_reported(mocker, capsys):
+  """
+  The cards graded with anything but 0, 1, 2 or 3 aren't updated.
+  """
+  mocker.patch('knards.api.load_texts')
+  mocker.patch('knards.api.update_cards')
+  mocker.patch('knards.util.open_in_editor', side_effect=lambda buf: ''.join(
+    buf
+  ).replace(msg.BATCH_GRADE_LINE + '\n', msg.BATCH_GRADE_LINE + '5\n'))
+
+  assert util.ask_batch(batch()) == []
+  assert not util.api.update_cards.called
+  assert msg.BATCH_GRADES_INVALID.format('#1, #2') in capsys.readouterr().out
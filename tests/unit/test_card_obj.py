@@ -1,6 +1,7 @@
 from datetime import datetime
 
 from knards import knards
+from knards.card import from_timestamp, to_timestamp
 
 
 def test_card_object_defaults():
@@ -35,3 +36,41 @@ def test_card_object_member_access():
   assert card.date_created == datetime.today().strftime('%Y-%m-%d')
   assert card.date_updated is None
   assert card.score == 1
+
+def test_lazy_card_object_reads_texts_once():
+  """
+  LazyCard reads its texts with the loader upon the first access only, and
+  otherwise behaves like the Card object with the same data.
+  """
+  loaded = []
+  def texts_loader(card_ids):
+    loaded.extend(card_ids)
+    return {card_id: ('question', 'answer') for card_id in card_ids}
+
+  card = knards.LazyCard(id=7, score=2, texts_loader=texts_loader)
+  assert card.score == 2
+  assert loaded == []
+
+  assert card.question == 'question'
+  assert card.answer == 'answer'
+  assert loaded == [7]
+  assert card == knards.Card(id=7, question='question', answer='answer',
+    score=2)
+
+  replaced = card._replace(score=3)
+  assert type(replaced) is knards.Card
+  assert replaced.question == 'question'
+  assert replaced.score == 3
+
+def test_legacy_text_timestamps_are_parsed():
+  """
+  The dates older versions of knards stored as text are read back as they
+  were: datetimes with or without the microseconds, and dates.
+  """
+  assert from_timestamp(b'2019-08-30 12:01:02.345678') == \
+    datetime(2019, 8, 30, 12, 1, 2, 345678)
+  assert from_timestamp('2019-08-30 12:01:02') == \
+    datetime(2019, 8, 30, 12, 1, 2)
+  assert from_timestamp('2019-08-30') == datetime(2019, 8, 30)
+  assert from_timestamp(to_timestamp(datetime(2019, 8, 30))) == \
+    datetime(2019, 8, 30)
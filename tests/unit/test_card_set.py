@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+import sys
+
+from knards import knards
+
+
+def test_cards_come_out_as_they_were_put_in():
+  """
+  CardSet keeps the data in columns and gives back equal Card objects upon
+  iteration, indexing and slicing; None values survive the integer columns.
+  """
+  now = datetime.now()
+  card_objs = [
+    knards.Card(id=1, question='q', answer='a', markers='python',
+      date_created=now, date_updated=now + timedelta(microseconds=1),
+      score=3),
+    knards.Card(id=None, pos_in_series=None, series='series',
+      date_created=datetime(1900, 1, 1), score=None),
+  ]
+
+  card_set = knards.CardSet(card_objs)
+
+  assert len(card_set) == 2
+  assert list(card_set) == card_objs
+  assert card_set[1] == card_objs[1]
+  assert card_set[-1] == card_objs[1]
+  assert type(card_set[1:]) is knards.CardSet
+  assert list(card_set[1:]) == card_objs[1:]
+  assert list(card_set.ids) == [1, knards.CardSet.NONE]
+  assert card_set.markers == ['python', '']
+
+def test_lazy_cards_stay_lazy():
+  """
+  The texts of LazyCard objects aren't read by putting them in a CardSet.
+  """
+  loaded = []
+  def texts_loader(card_ids):
+    loaded.extend(card_ids)
+    return {card_id: ('question', 'answer') for card_id in card_ids}
+
+  card_set = knards.CardSet([
+    knards.LazyCard(id=1, texts_loader=texts_loader),
+    knards.LazyCard(id=2, texts_loader=texts_loader),
+  ])
+  assert loaded == []
+
+  assert isinstance(card_set[1], knards.LazyCard)
+  assert card_set[1].question == 'question'
+  assert loaded == [2]
+
+def test_columns_take_less_memory_than_card_objects():
+  """
+  The integer columns are arrays, not lists of objects.
+  """
+  now = datetime.now()
+  card_objs = [
+    knards.Card(id=i, date_created=now, date_updated=now, score=i)
+    for i in range(1000)
+  ]
+  card_set = knards.CardSet(card_objs)
+
+  assert sum(sys.getsizeof(getattr(card_set, column)) for column in (
+    'ids', 'positions', 'scores', 'dates_created', 'dates_updated'
+  )) < sum(sys.getsizeof(card_obj) for card_obj in card_objs)
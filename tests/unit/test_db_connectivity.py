@@ -26,3 +26,14 @@ def test_db_connect_with_uninitialized_db():
   assert connection is None
 
   assert not os.path.exists('test.db')
+
+def test_db_connect_reuses_the_connection(init_db):
+  """
+  db_connect() connects to the DB file only once, all of the following calls
+  return the same connection handler until db_disconnect() is called.
+  """
+  connection = util.db_connect(init_db)
+  assert util.db_connect(init_db) is connection
+
+  util.db_disconnect(init_db)
+  assert util.db_connect(init_db) is not connection
@@ -0,0 +1,68 @@
+import json
+
+from knards import knards, api, config, util
+
+
+def test_statements_are_counted_only_while_counting(init_db):
+  """
+  QueryCounter counts the statements executed between start() and stop().
+  """
+  util.db_connect(init_db)
+  api.count_cards(db_path=init_db)
+
+  queries = util.QueryCounter().start()
+  api.count_cards(db_path=init_db)
+  api.count_cards(db_path=init_db)
+  queries.stop()
+
+  api.count_cards(db_path=init_db)
+  assert queries.count == 2
+  assert len(queries.statements) == 2
+  assert queries.seconds >= 0
+
+def test_counters_can_be_nested(init_db):
+  """
+  Every active counter counts the statement.
+  """
+  util.db_connect(init_db)
+  with util.QueryCounter() as outer:
+    api.count_cards(db_path=init_db)
+    with util.QueryCounter() as inner:
+      api.count_cards(db_path=init_db)
+
+  assert outer.count == 2
+  assert inner.count == 1
+
+def test_statements_of_triggers_are_not_counted(init_db):
+  """
+  Writing a card fires the triggers of the full-text search index, the
+  statements they run don't count.
+  """
+  util.db_connect(init_db)
+  with util.QueryCounter() as queries:
+    api.create_card(knards.Card(), init_db)
+
+  assert not [
+    statement for statement in queries.statements
+    if statement.startswith('--')
+  ]
+
+def test_statements_are_logged_as_json_lines(init_db, tmpdir, mocker):
+  """
+  If the SQL log is set up, every statement is appended to it as a line of
+  JSON.
+  """
+  log_path = str(tmpdir) + '/sql.jsonl'
+  mocker.patch.object(config, 'SQL_LOG', log_path)
+
+  util.db_connect(init_db)
+  api.count_cards(db_path=init_db)
+  api.count_cards(revisable_only=True, db_path=init_db)
+  util.db_disconnect(init_db)
+
+  with open(log_path) as log:
+    records = [json.loads(line) for line in log]
+  assert len(records) == 2
+  assert records[0]['sql'].startswith('SELECT')
+  assert records[0]['db'] == init_db
+  assert records[0]['ms'] >= 0
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+from knards import knards, util
+
+
+def test_cards_are_yielded_in_the_order_of_priority():
+  """
+  Never revised cards go first (the earliest created first), then the revised
+  ones (the lowest score first, the earliest revised first).
+  """
+  now = datetime.now()
+  card_set = [
+    knards.Card(id=1, date_created=now, date_updated=now - timedelta(days=9),
+      score=3),
+    knards.Card(id=2, date_created=now),
+    knards.Card(id=3, date_created=now, date_updated=now - timedelta(days=5),
+      score=1),
+    knards.Card(id=4, date_created=now - timedelta(days=1)),
+    knards.Card(id=5, date_created=now, date_updated=now - timedelta(days=7),
+      score=1),
+  ]
+
+  assert [card.id for card in util.RevisionQueue(card_set)] == [4, 2, 5, 3, 1]
+
+def test_only_due_cards_are_yielded():
+  """
+  Cards revised less than .score days before the due_by moment are dropped.
+  """
+  now = datetime.now()
+  card_set = [
+    knards.Card(id=1, date_created=now, date_updated=now - timedelta(days=2),
+      score=3),
+    knards.Card(id=2, date_created=now, date_updated=now - timedelta(days=2),
+      score=2),
+    knards.Card(id=3, date_created=now),
+  ]
+
+  assert [card.id for card in util.RevisionQueue(card_set, now)] == [3, 2]
+  assert [card.id for card in util.RevisionQueue(
+    card_set, now + timedelta(days=1)
+  )] == [3, 2, 1]
+
+def test_cards_pushed_while_iterating_are_yielded_in_order():
+  """
+  A card pushed back in takes its place among the rest without re-sorting.
+  """
+  now = datetime.now()
+  revision_queue = util.RevisionQueue([
+    knards.Card(id=1, date_created=now, date_updated=now - timedelta(days=5),
+      score=0),
+    knards.Card(id=2, date_created=now, date_updated=now - timedelta(days=5),
+      score=1),
+  ], now)
+
+  yielded = []
+  for card in revision_queue:
+    yielded.append(card.id)
+    if card.id == 1 and yielded.count(1) == 1:
+      revision_queue.push(card._replace(date_updated=now))
+
+  assert yielded == [1, 1, 2]
+  assert len(revision_queue) == 0
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+import knards
+
+
+def _modules_loaded_by(code):
+  """
+  Run the code in a fresh interpreter and return the names of the modules
+  loaded by then.
+  """
+  env = dict(os.environ)
+  env['PYTHONPATH'] = os.pathsep.join(
+    [os.path.dirname(os.path.dirname(knards.__file__))] +
+    [path for path in [env.get('PYTHONPATH')] if path]
+  )
+  output = subprocess.check_output(
+    [sys.executable, '-c', code + '\nimport sys\nprint(" ".join(sys.modules))'],
+    env=env
+  )
+  return output.decode().split()
+
+def test_importing_the_entry_point_stays_light():
+  """
+  Importing knards.knards (which is what "kn" does before parsing any
+  arguments) doesn't load the api, the DB layer or the modules only some of the
+  subcommands need.
+  """
+  modules = _modules_loaded_by('import knards.knards')
+
+  for module in (
+    'knards.api', 'knards.util', 'sqlite3', 'readchar', 'subprocess',
+    'tempfile'
+  ):
+    assert module not in modules
+
+def test_card_objects_are_importable_from_the_entry_point():
+  """
+  The card objects live in knards.card and are still importable from
+  knards.knards.
+  """
+  from knards import card, knards
+
+  assert knards.Card is card.Card
+  assert knards.LazyCard is card.LazyCard
+  assert knards.CardSet is card.CardSet
@@ -0,0 +1,44 @@
+import time
+
+from knards import knards, api, profiling
+
+
+def test_items_of_returned_generators_are_timed(init_db, mocker):
+  """
+  The time it takes to produce the items of the generator an api call returns
+  counts, whether or not the api method is a generator function itself.
+  """
+  api.create_cards([knards.Card(), knards.Card()], init_db)
+  iter_cursor = api._iter_cursor
+
+  def slow_iter_cursor(*args, **kwargs):
+    for card_obj in iter_cursor(*args, **kwargs):
+      time.sleep(0.05)
+      yield card_obj
+  mocker.patch('knards.api._iter_cursor', side_effect=slow_iter_cursor)
+
+  profiling.start_timer()
+  try:
+    assert len(list(api.iter_card_set(db_path=init_db))) == 2
+  finally:
+    profiling.stop_timer()
+
+  calls, seconds = profiling._api_calls['iter_card_set']
+  assert calls == 1
+  assert seconds >= 0.1
+
+def test_only_the_outermost_api_calls_are_recorded(init_db):
+  """
+  The api calls made by another one are a part of its time rather than
+  recorded on their own.
+  """
+  api.create_cards([knards.Card(series='s', pos_in_series=1)], init_db)
+
+  profiling.start_timer()
+  try:
+    api.get_series_set('s', init_db)
+  finally:
+    profiling.stop_timer()
+
+  assert list(profiling._api_calls) == ['get_series_set']
+  assert profiling._api_calls['get_series_set'][0] == 1
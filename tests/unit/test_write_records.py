@@ -0,0 +1,67 @@
+from datetime import datetime
+import io
+import json
+
+from knards import output
+
+
+RECORDS = [
+  {'id': 1, 'markers': 'python', 'date': datetime(2019, 8, 30, 12, 0)},
+  {'id': 2, 'markers': 'english', 'date': None},
+]
+
+def write(records, output_format, fields, **kwargs):
+  stream = io.StringIO()
+  output.write_records(iter(records), output_format, fields, stream, **kwargs)
+  return stream.getvalue()
+
+def test_json_is_an_array_of_the_selected_fields():
+  """
+  "json" is an array of objects with only the selected fields, dates are output
+  in ISO format.
+  """
+  assert json.loads(write(RECORDS, 'json', ['id', 'date'])) == [
+    {'id': 1, 'date': '2019-08-30 12:00:00'},
+    {'id': 2, 'date': None},
+  ]
+  assert json.loads(write([], 'json', ['id'])) == []
+
+def test_single_record_is_output_as_an_object():
+  """
+  With single=True, "json" is the object of the only record.
+  """
+  assert json.loads(write(RECORDS[:1], 'json', ['id'], single=True)) == \
+    {'id': 1}
+
+def test_jsonl_is_an_object_per_line():
+  """
+  "jsonl" is an object per line.
+  """
+  lines = write(RECORDS, 'jsonl', ['markers', 'id']).splitlines()
+  assert [json.loads(line) for line in lines] == [
+    {'markers': 'python', 'id': 1},
+    {'markers': 'english', 'id': 2},
+  ]
+
+def test_csv_has_a_header_and_a_row_per_record():
+  """
+  "csv" is a header line and a row per record, lists are space separated.
+  """
+  output = write(
+    [{'group': 'IT', 'tags': ['python', 'linux']}], 'csv', ['group', 'tags']
+  )
+  assert output == 'group,tags\nIT,python linux\n'
+
+def test_records_are_written_as_they_come():
+  """
+  Every record is written to the stream before the next one is read.
+  """
+  stream = io.StringIO()
+
+  def records():
+    yield {'id': 1}
+    assert '1' in stream.getvalue()
+    yield {'id': 2}
+
+  output.write_records(records(), 'jsonl', ['id'], stream)
+  assert stream.getvalue() == '{"id": 1}\n{"id": 2}\n'